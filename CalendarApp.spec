@@ -1,12 +1,13 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
 
 a = Analysis(
     ['E:\\自建资料\\test\\calendar\\calendar_app.py'],
     pathex=[],
     binaries=[],
-    datas=[('lunar.js', '.'), ('calendar_data.db', '.'), ('calendar_app_update.py', '.'), ('download_lunar.py', '.'), ('lunar_js_integration.py', '.')],
-    hiddenimports=['PIL', 'PIL.Image', 'PIL.ImageDraw', 'pystray', 'requests', 'lunar_python', 'lunar_js_integration'],
+    datas=[('lunar.js', '.'), ('calendar_data.db', '.'), ('calendar_app_update.py', '.'), ('download_lunar.py', '.'), ('lunar_js_integration.py', '.')] + ([('almanac.db', '.')] if os.path.exists('almanac.db') else []),
+    hiddenimports=['PIL', 'PIL.Image', 'PIL.ImageDraw', 'pystray', 'requests', 'lunar_python', 'lunar_js_integration', 'lunar_table', 'lunar_table_data', 'lunar_index', 'almanac_cache', 'zeri_index', 'background_service', 'lunar_service', 'lunar_provider', 'calendar_canvas', 'month_model', 'year_overview', 'tag_heatmap', 'tag_list', 'db_connection', 'db_schema', 'text_search', 'calendar_store'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,267 @@
+# almanac_cache.py
+# 黄历详情缓存：内存LRU + calendar_data.db中的almanac_cache表
+# 同一天的黄历数据永远不变，首次计算后即可复用，不再启动node
+
+import os
+import json
+import zlib
+import sqlite3
+import db_connection
+import threading
+import calendar
+from collections import OrderedDict
+
+# precompute_almanac.py生成的预计算黄历文件，随程序一起发布
+PRECOMPUTED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "almanac.db")
+
+# 预计算文件的格式版本
+PRECOMPUTED_FORMAT = 1
+
+
+def encode_month(items):
+    """
+    将一个月的黄历按列存储并压缩：{"dates": [...], "columns": {字段: [每天的值, ...]}}
+    同一字段的取值集中在一起，压缩率明显高于逐天存储
+
+    Args:
+        items: [(date_str, data), ...]，按日期排序
+    """
+    dates = [date_str for date_str, data in items]
+    columns = {}
+    for date_str, data in items:
+        for field, value in data.items():
+            columns.setdefault(field, []).append(value)
+    payload = json.dumps({"dates": dates, "columns": columns}, ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(payload.encode("utf-8"), 9)
+
+
+def decode_month(blob):
+    """encode_month的逆过程，返回 [(date_str, data), ...]"""
+    payload = json.loads(zlib.decompress(blob).decode("utf-8"))
+    columns = payload["columns"]
+    return [
+        (date_str, {field: values[i] for field, values in columns.items()})
+        for i, date_str in enumerate(payload["dates"])
+    ]
+
+
+class PrecomputedAlmanac:
+    """只读访问预计算黄历文件（SQLite，按月列存储），通过mmap映射到内存"""
+
+    def __init__(self, path=PRECOMPUTED_PATH, mmap_size=64 * 1024 * 1024):
+        self.path = path
+        self.lock = threading.Lock()
+        # 只保留最近解压的几个月
+        self.months = OrderedDict()
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self.conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        self.available = set(row[0] for row in self.conn.execute("SELECT month FROM almanac_months"))
+
+    @classmethod
+    def open_default(cls):
+        """打开随程序发布的预计算文件，不存在或格式不符时返回None"""
+        if not os.path.exists(PRECOMPUTED_PATH):
+            return None
+        try:
+            store = cls(PRECOMPUTED_PATH)
+            row = store.conn.execute("SELECT value FROM almanac_meta WHERE key = 'format'").fetchone()
+            if row is None or int(row[0]) != PRECOMPUTED_FORMAT:
+                print("预计算黄历文件格式不匹配，已忽略")
+                store.close()
+                return None
+            return store
+        except sqlite3.Error as e:
+            print(f"打开预计算黄历文件时出错: {e}")
+            return None
+
+    def has_month(self, year, month):
+        return f"{year}-{month:02d}" in self.available
+
+    def get_month(self, year, month):
+        """获取整月黄历 [(date_str, data), ...]，文件中没有该月时返回None"""
+        key = f"{year}-{month:02d}"
+        if key not in self.available:
+            return None
+        with self.lock:
+            items = self.months.get(key)
+            if items is not None:
+                self.months.move_to_end(key)
+                return items
+            row = self.conn.execute("SELECT payload FROM almanac_months WHERE month = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            items = decode_month(row[0])
+            self.months[key] = items
+            while len(self.months) > 4:
+                self.months.popitem(last=False)
+            return items
+
+    def get(self, year, month, day):
+        items = self.get_month(year, month)
+        if not items or day > len(items):
+            return None
+        return items[day - 1][1]
+
+    def close(self):
+        self.conn.close()
+
+
+class AlmanacCache:
+    """按日期缓存lunar.js计算出的黄历详情"""
+
+    def __init__(self, db_path, bridge_getter, capacity=256, precomputed=None):
+        """
+        Args:
+            db_path: 数据库路径（需已由db_schema迁移，包含almanac_cache表）
+            bridge_getter: 返回LunarJSBridge实例的函数，只在缓存未命中时调用
+            capacity: 内存LRU最多保存的天数
+            precomputed: PrecomputedAlmanac实例，覆盖的月份直接读取预计算文件
+        """
+        self.db_path = db_path
+        self.bridge_getter = bridge_getter
+        self.precomputed = precomputed
+        self.capacity = capacity
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.prefill_threads = {}
+
+    def _remember(self, date_str, data):
+        """放入内存LRU"""
+        with self.lock:
+            self.memory[date_str] = data
+            self.memory.move_to_end(date_str)
+            while len(self.memory) > self.capacity:
+                self.memory.popitem(last=False)
+
+    def _lookup_memory(self, date_str):
+        with self.lock:
+            data = self.memory.get(date_str)
+            if data is not None:
+                self.memory.move_to_end(date_str)
+            return data
+
+    def _lookup_db(self, date_str):
+        conn = db_connection.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT payload FROM almanac_cache WHERE date = ?", (date_str,))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else None
+
+    def _store_db(self, items):
+        """批量写入数据库，items为 [(date_str, data), ...]"""
+        conn = db_connection.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT OR REPLACE INTO almanac_cache (date, payload) VALUES (?, ?)",
+                [(date_str, json.dumps(data, ensure_ascii=False)) for date_str, data in items]
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self, year, month, day):
+        """获取指定日期的黄历详情，依次查询内存、数据库，最后才调用lunar.js计算"""
+        date_str = f"{year}-{month:02d}-{day:02d}"
+
+        data = self._lookup_memory(date_str)
+        if data is not None:
+            return data
+
+        if self.precomputed is not None:
+            data = self.precomputed.get(year, month, day)
+
+        if data is None:
+            try:
+                data = self._lookup_db(date_str)
+            except sqlite3.Error as e:
+                print(f"读取黄历缓存时出错: {e}")
+
+        if data is None:
+            data = self.bridge_getter().get_almanac(year, month, day)
+            if data is None:
+                return None
+            try:
+                self._store_db([(date_str, data)])
+            except sqlite3.Error as e:
+                print(f"写入黄历缓存时出错: {e}")
+
+        self._remember(date_str, data)
+        return data
+
+    def cached_dates(self, year):
+        """数据库中已缓存的某年日期集合"""
+        conn = db_connection.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT date FROM almanac_cache WHERE date BETWEEN ? AND ?",
+                           (f"{year}-01-01", f"{year}-12-31"))
+            return {row[0] for row in cursor.fetchall()}
+        finally:
+            conn.close()
+
+    def prefill_year(self, year):
+        """预先计算并缓存一整年的黄历，每个月只调用一次lunar.js"""
+        try:
+            cached = self.cached_dates(year)
+            for month in range(1, 13):
+                if self.precomputed is not None and self.precomputed.has_month(year, month):
+                    continue
+                days = calendar.monthrange(year, month)[1]
+                if all(f"{year}-{month:02d}-{day:02d}" in cached for day in range(1, days + 1)):
+                    continue
+
+                items = self.bridge_getter().get_almanac_month(year, month)
+                if not items:
+                    continue
+                self._store_db([(item["date"], item["data"]) for item in items if item["date"] not in cached])
+            print(f"{year}年黄历缓存预填充完成")
+        except Exception as e:
+            print(f"预填充{year}年黄历缓存时出错: {e}")
+        finally:
+            with self.lock:
+                self.prefill_threads.pop(year, None)
+
+    def year_items(self, year):
+        """
+        获取一整年的黄历 [(date_str, data), ...]（按日期排序）
+        预计算文件中没有的月份先预填充到数据库缓存再读取
+        """
+        missing = [month for month in range(1, 13)
+                   if self.precomputed is None or not self.precomputed.has_month(year, month)]
+        if missing:
+            self.prefill_year(year)
+
+        items = []
+        cached = {}
+        if missing:
+            conn = db_connection.connect(self.db_path)
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT date, payload FROM almanac_cache WHERE date BETWEEN ? AND ?",
+                               (f"{year}-01-01", f"{year}-12-31"))
+                cached = {date_str: payload for date_str, payload in cursor.fetchall()}
+            finally:
+                conn.close()
+
+        for month in range(1, 13):
+            if month not in missing:
+                items.extend(self.precomputed.get_month(year, month))
+                continue
+            for day in range(1, calendar.monthrange(year, month)[1] + 1):
+                date_str = f"{year}-{month:02d}-{day:02d}"
+                if date_str in cached:
+                    items.append((date_str, json.loads(cached[date_str])))
+        return items
+
+    def prefill_year_async(self, year):
+        """在后台线程中预填充一整年的黄历缓存"""
+        with self.lock:
+            if year in self.prefill_threads:
+                return
+            thread = threading.Thread(target=self.prefill_year, args=(year,), daemon=True)
+            self.prefill_threads[year] = thread
+        thread.start()
@@ -0,0 +1,120 @@
+# background_service.py
+# 后台任务服务：在单个后台线程中执行耗时的查询（农历/黄历、数据库搜索等），
+# 完成的任务放入队列，由Tk主线程定时取出并回调，界面不会因查询而卡住。
+# 工作线程不直接调用root.after：mainloop启动前从其他线程调用会阻塞约1秒后抛出RuntimeError，结果被丢弃
+
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+# 主线程检查完成队列的间隔（毫秒）
+POLL_INTERVAL_MS = 20
+
+
+class BackgroundService:
+    """在后台线程中按提交顺序执行任务，并在Tk主线程中回调结果"""
+
+    # 没有提供errback时打印的错误前缀
+    error_message = "后台任务出错"
+
+    def __init__(self, root, thread_name_prefix="background-service"):
+        """
+        Args:
+            root: Tk主窗口
+            thread_name_prefix: 工作线程名称前缀，每个实例使用独立的工作线程
+        """
+        self.root = root
+        # 单个工作线程：任务按提交顺序执行，同一实例中的任务不会并发
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name_prefix)
+        # 每个通道只保留最新的请求，例如切换月份或修改搜索关键词后取消上一次的请求
+        self.pending = {}
+        self.closed = False
+        # 已完成待交付的任务，由工作线程放入、主线程取出
+        self.done = queue.Queue()
+        self.poll_job = self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def submit(self, func, *args, callback=None, errback=None, channel=None):
+        """
+        提交任务
+
+        Args:
+            func: 在后台线程中执行的函数
+            callback: 成功时在主线程中调用 callback(result)
+            errback: 出错时在主线程中调用 errback(exception)，为None时只打印错误
+            channel: 通道名称，同一通道的新请求会取消尚未交付的旧请求
+
+        Returns:
+            concurrent.futures.Future
+        """
+        if channel is not None:
+            self.cancel(channel)
+
+        future = self.executor.submit(func, *args)
+        if channel is not None:
+            self.pending[channel] = future
+
+        def on_done(done_future):
+            if done_future.cancelled() or self.closed:
+                return
+            self.done.put((done_future, callback, errback, channel))
+
+        future.add_done_callback(on_done)
+        return future
+
+    def _poll(self):
+        """在主线程中交付队列中已完成的任务，然后安排下一次检查"""
+        self.poll_job = None
+        while not self.closed:
+            try:
+                item = self.done.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._deliver(*item)
+            except Exception as e:
+                print(f"后台任务回调出错: {e}")
+        if self.closed:
+            return
+        try:
+            self.poll_job = self.root.after(POLL_INTERVAL_MS, self._poll)
+        except tk.TclError:
+            # 主窗口已销毁
+            pass
+
+    def _deliver(self, future, callback, errback, channel):
+        """在主线程中交付结果，已被新请求取代的结果直接丢弃"""
+        if channel is not None:
+            if self.pending.get(channel) is not future:
+                return
+            del self.pending[channel]
+
+        try:
+            result = future.result()
+        except Exception as e:
+            if errback:
+                errback(e)
+            else:
+                print(f"{self.error_message}: {e}")
+            return
+
+        if callback:
+            callback(result)
+
+    def cancel(self, channel):
+        """取消某个通道中尚未交付的请求"""
+        future = self.pending.pop(channel, None)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self):
+        self.closed = True
+        for channel in list(self.pending):
+            self.cancel(channel)
+        if self.poll_job is not None:
+            try:
+                self.root.after_cancel(self.poll_job)
+            except (tk.TclError, RuntimeError):
+                # 主窗口已销毁，或从托盘线程退出时主循环不再响应
+                pass
+            self.poll_job = None
+        self.executor.shutdown(wait=False)
@@ -7,6 +7,7 @@ PyInstaller打包脚本
 
 import os
 import sys
+import subprocess
 import PyInstaller.__main__
 import shutil
 from pathlib import Path
@@ -27,12 +28,6 @@ def build_exe():
         "lunar_js_integration.py",
     ]
     
-    # 数据文件
-    data_files = [
-        ("lunar.js", "."),
-        ("calendar_data.db", "."),
-    ]
-    
     # 检查并创建数据文件
     lunar_js_path = os.path.join(current_dir, "lunar.js")
     if not os.path.exists(lunar_js_path):
@@ -42,6 +37,12 @@ def build_exe():
         if os.path.exists(download_script):
             print(f"或者先运行: python {download_script}")
     
+    # 预计算黄历文件（1900-2100年），不存在时先生成
+    almanac_path = os.path.join(current_dir, "almanac.db")
+    if not os.path.exists(almanac_path):
+        print("almanac.db 不存在，正在预计算1900-2100年黄历...")
+        subprocess.run([sys.executable, os.path.join(current_dir, "precompute_almanac.py")], check=False)
+    
     # 构建PyInstaller命令参数
     args = [
         main_script,
@@ -68,6 +69,23 @@ def build_exe():
         '--hidden-import=requests',
         '--hidden-import=lunar_python',
         '--hidden-import=lunar_js_integration',
+        '--hidden-import=lunar_table',
+        '--hidden-import=lunar_table_data',
+        '--hidden-import=lunar_index',
+        '--hidden-import=almanac_cache',
+        '--hidden-import=zeri_index',
+        '--hidden-import=background_service',
+        '--hidden-import=lunar_service',
+        '--hidden-import=lunar_provider',
+        '--hidden-import=calendar_canvas',
+        '--hidden-import=month_model',
+        '--hidden-import=year_overview',
+        '--hidden-import=tag_heatmap',
+        '--hidden-import=tag_list',
+        '--hidden-import=db_connection',
+        '--hidden-import=db_schema',
+        '--hidden-import=text_search',
+        '--hidden-import=calendar_store',
         
         # 图标
         '--icon=NONE',
@@ -81,6 +99,11 @@ def build_exe():
         '--specpath=./',
     ]
     
+    if os.path.exists(almanac_path):
+        args.append('--add-data=almanac.db;.')
+    else:
+        print("警告: almanac.db 生成失败，黄历详情将在运行时通过lunar.js计算")
+    
     # 打印打包信息
     print("开始打包日历应用...")
     print(f"主程序: {main_script}")
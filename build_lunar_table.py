@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+农历数据表生成脚本
+调用一次Node.js，从lunar.js导出1900-2100年的农历月份、闰月和节气数据，
+压缩打包后写入lunar_table_data.py，供lunar_table.py在启动时直接加载
+"""
+
+import os
+import sys
+import json
+import base64
+import struct
+import datetime
+import subprocess
+
+# 与日历应用年份选择范围一致
+START_YEAR = 1900
+END_YEAR = 2100
+
+# 儒略日与Python日期序号的换算差值（2000-01-01 = JD 2451545 = 序号730120）
+JULIAN_DAY_OFFSET = 1721425
+
+# 一个公历年内节气的顺序（小寒在前，冬至在后）
+JIE_QI_ORDER = [
+    "小寒", "大寒", "立春", "雨水", "惊蛰", "春分", "清明", "谷雨",
+    "立夏", "小满", "芒种", "夏至", "小暑", "大暑", "立秋", "处暑",
+    "白露", "秋分", "寒露", "霜降", "立冬", "小雪", "大雪", "DONG_ZHI"
+]
+
+EXPORT_SCRIPT = """
+const lunar = require(%(js_path)s);
+const out = {years: [], jieqi: []};
+// 1900-01-01是农历1899年腊月，因此从前一年开始导出
+for (let y = %(start)d - 1; y <= %(end)d; y++) {
+  const ly = lunar.LunarYear.fromYear(y);
+  out.years.push({
+    year: y,
+    leap: ly.getLeapMonth(),
+    months: ly.getMonthsInYear().map(m => [m.getMonth(), m.getDayCount(), m.getFirstJulianDay()])
+  });
+}
+const names = %(jie_qi_order)s;
+for (let y = %(start)d; y <= %(end)d; y++) {
+  // 公历年中间的农历年节气表包含该公历年全部24个节气
+  const table = lunar.Solar.fromYmd(y, 7, 1).getLunar().getJieQiTable();
+  out.jieqi.push(names.map(n => table[n].toYmdHms()));
+}
+out.jie_qi_names = lunar.LunarUtil.JIE_QI;
+out.month_names = lunar.LunarUtil.MONTH;
+out.day_names = lunar.LunarUtil.DAY;
+out.lunar_festivals = lunar.LunarUtil.FESTIVAL;
+out.solar_festivals = lunar.SolarUtil.FESTIVAL;
+out.solar_week_festivals = lunar.SolarUtil.WEEK_FESTIVAL;
+out.chu_xi = lunar.I18n.getMessage('jr.chuXi');
+out.jia_zi = lunar.LunarUtil.JIA_ZI;
+// 起始日的日干支，之后每天顺延一位
+out.first_day_gan_zhi = lunar.LunarUtil.getJiaZiIndex(lunar.Solar.fromYmd(%(start)d, 1, 1).getLunar().getDayInGanZhi());
+console.log(JSON.stringify(out));
+"""
+
+
+def export_from_lunar_js(js_path):
+    """运行一次node，导出全部原始数据"""
+    script = EXPORT_SCRIPT % {
+        "js_path": json.dumps(js_path),
+        "start": START_YEAR,
+        "end": END_YEAR,
+        "jie_qi_order": json.dumps(JIE_QI_ORDER, ensure_ascii=False),
+    }
+    output = subprocess.check_output(["node", "-e", script], text=True, encoding="utf-8")
+    return json.loads(output)
+
+
+def pack_years(years):
+    """
+    每个农历年打包为一个32位整数:
+    低13位为各月大小（按月份出现顺序，1表示30天），第13-16位为闰月月份（0表示无闰月）
+    """
+    packed = []
+    for index, year in enumerate(years):
+        months = year["months"]
+        if not 12 <= len(months) <= 13:
+            raise ValueError(f"农历{year['year']}年月份数量异常: {len(months)}")
+
+        bits = 0
+        for i, (month, day_count, first_jd) in enumerate(months):
+            if day_count not in (29, 30):
+                raise ValueError(f"农历{year['year']}年{month}月天数异常: {day_count}")
+            if day_count == 30:
+                bits |= 1 << i
+
+        # 校验相邻年份首尾相接，保证只需基准日即可累加出全部日期
+        if index + 1 < len(years):
+            year_end = months[-1][2] + months[-1][1]
+            if year_end != years[index + 1]["months"][0][2]:
+                raise ValueError(f"农历{year['year']}年与下一年不连续")
+
+        packed.append(bits | (year["leap"] << 13))
+    return packed
+
+
+def pack_jie_qi(jieqi_years, base):
+    """
+    节气时刻以距基准日0点的分钟数表示，先按平均间隔做线性预测，
+    只保存16位的预测残差
+    """
+    minutes = []
+    for terms in jieqi_years:
+        for ymd_hms in terms:
+            moment = datetime.datetime.strptime(ymd_hms, "%Y-%m-%d %H:%M:%S")
+            minutes.append(int((moment - base).total_seconds() // 60))
+
+    first = minutes[0]
+    step = (minutes[-1] - first) / (len(minutes) - 1)
+    residuals = [m - first - round(i * step) for i, m in enumerate(minutes)]
+    if max(abs(r) for r in residuals) > 32767:
+        raise ValueError("节气残差超出16位范围")
+    return first, step, residuals
+
+
+def encode(fmt, values):
+    """按小端序打包并编码为base64文本，每行76个字符"""
+    raw = struct.pack(f"<{len(values)}{fmt}", *values)
+    return base64.encodebytes(raw).decode("ascii")
+
+
+def write_data_module(data, path):
+    """生成lunar_table_data.py"""
+    years = data["years"]
+    base = datetime.datetime(START_YEAR, 1, 1)
+
+    packed_years = pack_years(years)
+    jie_qi_first, jie_qi_step, jie_qi_residuals = pack_jie_qi(data["jieqi"], base)
+
+    first_new_year = years[0]["months"][0][2] - JULIAN_DAY_OFFSET
+
+    # 将节气顺序中的DONG_ZHI还原为中文名称
+    jie_qi_order = [name if name != "DONG_ZHI" else "冬至" for name in JIE_QI_ORDER]
+
+    lines = [
+        "# lunar_table_data.py",
+        "# 此文件由build_lunar_table.py根据lunar.js自动生成，请勿手动修改",
+        "",
+        f"START_YEAR = {START_YEAR}",
+        f"END_YEAR = {END_YEAR}",
+        "",
+        "# 第一个农历年（含1900-01-01）正月初一的日期序号",
+        f"FIRST_LUNAR_YEAR = {years[0]['year']}",
+        f"FIRST_NEW_YEAR_ORDINAL = {first_new_year}",
+        "",
+        "# 每个农历年的月份大小和闰月（小端序uint32）",
+        f"YEAR_INFO = '''\n{encode('I', packed_years)}'''",
+        "",
+        "# 节气时刻 = 基准分钟 + round(序号 * 平均间隔) + 残差（小端序int16）",
+        f"JIE_QI_FIRST_MINUTE = {jie_qi_first}",
+        f"JIE_QI_STEP = {jie_qi_step!r}",
+        f"JIE_QI_RESIDUALS = '''\n{encode('h', jie_qi_residuals)}'''",
+        "",
+        f"JIE_QI_ORDER = {json.dumps(jie_qi_order, ensure_ascii=False)}",
+        f"MONTH_NAMES = {json.dumps(data['month_names'], ensure_ascii=False)}",
+        f"DAY_NAMES = {json.dumps(data['day_names'], ensure_ascii=False)}",
+        "",
+        f"LUNAR_FESTIVALS = {json.dumps(data['lunar_festivals'], ensure_ascii=False)}",
+        f"SOLAR_FESTIVALS = {json.dumps(data['solar_festivals'], ensure_ascii=False)}",
+        f"SOLAR_WEEK_FESTIVALS = {json.dumps(data['solar_week_festivals'], ensure_ascii=False)}",
+        f"CHU_XI = {json.dumps(data['chu_xi'], ensure_ascii=False)}",
+        "",
+        "# 六十甲子及起始日的日干支序号",
+        f"JIA_ZI = {json.dumps(data['jia_zi'], ensure_ascii=False)}",
+        f"FIRST_DAY_GAN_ZHI = {data['first_day_gan_zhi']}",
+        "",
+    ]
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def main():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    js_path = os.path.join(current_dir, "lunar.js")
+    if not os.path.exists(js_path):
+        print("找不到lunar.js文件，请先运行download_lunar.py下载")
+        return 1
+
+    print(f"正在从lunar.js导出{START_YEAR}-{END_YEAR}年农历数据...")
+    data = export_from_lunar_js(js_path)
+
+    output_path = os.path.join(current_dir, "lunar_table_data.py")
+    write_data_module(data, output_path)
+    print(f"已生成: {output_path} ({os.path.getsize(output_path)} 字节)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -35,6 +35,75 @@ except ImportError:
     LUNAR_JS_INTEGRATION_AVAILABLE = False
     LunarJSBridge = None  # 为basedpyright提供类型提示
 
+# 导入黄历详情缓存
+from almanac_cache import AlmanacCache, PrecomputedAlmanac
+
+# 导入择日倒排索引
+from zeri_index import ZeRiIndex, WEEKEND
+
+# 边输入边搜索的防抖时间（毫秒）
+TAG_SEARCH_DELAY_MS = 250
+# 聊天记录搜索最多显示的结果数
+CHAT_SEARCH_LIMIT = 100
+
+# 合并渲染请求的时间窗口（毫秒，约一帧）
+RENDER_DELAY_MS = 16
+
+# 月份数据缓存最多保存的月数
+MONTH_CACHE_SIZE = 24
+
+# 显示某月后在后台预取的相邻月份（相对月数）：前后一个月、前后一年，其次是前后两个月
+PREFETCH_OFFSETS = (-1, 1, -12, 12, -2, 2)
+
+# 会写入日历数据库的MCP工具（AI助手消息中的关键词）
+MCP_WRITE_PATTERNS = ("查询数据库", "添加提醒", "添加标签")
+# 标签和聊天记录全文搜索的对话命令（"搜索记录：关键词"）
+CALENDAR_SEARCH_COMMAND = "搜索记录"
+
+# 导入共享SQLite连接（每个线程一个长期连接，WAL模式）
+import db_connection
+
+# 导入数据库结构迁移
+from db_schema import migrate
+
+# 导入数据访问层（标签、提醒、聊天记录、LLM配置）
+from calendar_store import TagRepo, ReminderRepo, ChatRepo, LlmConfigRepo
+
+# 导入标签和聊天记录全文搜索
+from text_search import fts_available, search_chat_messages
+
+# 导入月视图数据模型
+from month_model import MonthModelCache, build_month_model, lunar_cells_from_provider
+
+# 导入年视图
+from year_overview import YearOverviewCanvas, load_year_tag_counts, load_year_festivals
+
+# 导入标签热力图
+from tag_heatmap import DailyCounts, HeatmapCanvas
+
+# 导入标签列表分页查询
+from tag_list import TagPager, tag_filter
+
+# 导入单画布月视图
+from calendar_canvas import CalendarCanvas, VIEW_ENV
+
+# 导入后台任务服务（农历查询和数据库搜索各用一个后台线程）
+from background_service import BackgroundService
+from lunar_service import LunarService
+
+# 导入农历后端接口（数据表 / lunar-python / Node.js，启动时自动选择最快的后端）
+from lunar_provider import (LunarProviderManager, TableLunarProvider, PythonLunarProvider,
+                            default_factories, BACKEND_ENV)
+
+# 导入预计算农历数据表（1900-2100年，不依赖lunar-python和Node.js）
+try:
+    from lunar_table import lunar_table
+    from lunar_index import get_lunar_index
+    LUNAR_TABLE_AVAILABLE = True
+except ImportError:
+    LUNAR_TABLE_AVAILABLE = False
+    lunar_table = None
+
 # 尝试导入lunar-python库，如果不可用则尝试使用lunar-javascript或降级模式
 try:
     from lunar_python import Lunar, Solar
@@ -42,7 +111,7 @@ try:
     LUNAR_AVAILABLE = True
 except ImportError:
     LUNAR_PYTHON_AVAILABLE = False
-    LUNAR_AVAILABLE = LUNAR_JS_AVAILABLE and LUNAR_JS_INTEGRATION_AVAILABLE
+    LUNAR_AVAILABLE = LUNAR_TABLE_AVAILABLE or (LUNAR_JS_AVAILABLE and LUNAR_JS_INTEGRATION_AVAILABLE)
     if not LUNAR_AVAILABLE:
         print("警告: lunar-python库和lunar-javascript都未安装，将只显示公历日期")
         print("请运行: pip install lunar-python 以启用农历功能")
@@ -108,6 +177,44 @@ class CalendarApp:
         # 创建数据库连接
         self.db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calendar_data.db")
         self.create_database()
+        self.tag_repo = TagRepo(self.db_path)
+        self.reminder_repo = ReminderRepo(self.db_path)
+        self.chat_repo = ChatRepo(self.db_path)
+        self.llm_config_repo = LlmConfigRepo(self.db_path)
+        
+        # 黄历详情缓存（内存LRU + 预计算文件almanac.db + 数据库），命中后无需再启动node
+        self.almanac_cache = AlmanacCache(self.db_path, self.get_lunar_bridge,
+                                          precomputed=PrecomputedAlmanac.open_default())
+        
+        # 择日索引（宜/忌事项 → 日期），按年从黄历缓存批量构建
+        self.zeri_index = ZeRiIndex(self.db_path, self.almanac_cache)
+        
+        # 异步农历服务：耗时的农历/黄历查询在后台线程执行，结果回到主线程更新界面
+        self.lunar_service = LunarService(self.root)
+        # 标签搜索、分页等数据库查询使用单独的后台线程，不会排在农历查询后面
+        self.search_service = BackgroundService(self.root, thread_name_prefix="search-service")
+        self.lunar_labels = {}
+        
+        # 月份数据模型缓存，按 (年, 月, 数据版本) 索引，最近使用的保留；
+        # 标签等数据写入后版本号加一，旧模型不再命中。显示某月后在后台预取相邻月份，翻页时直接从内存显示
+        self.month_models = MonthModelCache(MONTH_CACHE_SIZE)
+        self.data_version = 0
+        # 每天的标签/提醒数量（热力图用），保存或删除时按日期增量更新
+        self.daily_counts = DailyCounts(self.db_path)
+        
+        # 日历中当前显示的 (年, 月)
+        self.displayed_month = None
+        # 合并连续翻页的渲染请求（root.after任务id）
+        self.render_job = None
+        
+        # 月视图: "grid"为ttk格子，"canvas"为单画布绘制
+        self.calendar_view = "canvas" if os.environ.get(VIEW_ENV, "").strip().lower() == "canvas" else "grid"
+        self.calendar_canvas = None
+        
+        # 农历后端：先用数据表（或lunar-python）立即显示，后台完成自检和基准测试后切换到最快的后端
+        self.lunar_providers = None
+        self.initial_lunar_provider = self.create_initial_lunar_provider()
+        self.lunar_service.submit(self.select_lunar_providers, callback=self.on_lunar_providers_selected)
         
         # 创建UI组件
         self.create_widgets()
@@ -115,6 +222,10 @@ class CalendarApp:
         # 显示日历
         self.update_calendar()
         
+        # 后台预填充当年的黄历缓存（预计算文件已覆盖的月份会直接跳过）
+        if LUNAR_JS_AVAILABLE and LUNAR_JS_INTEGRATION_AVAILABLE:
+            self.almanac_cache.prefill_year_async(self.selected_year)
+        
         # 检查今日提醒
         self.check_reminders()
         
@@ -204,68 +315,68 @@ class CalendarApp:
         
         return formatted.strip()
     
+    def get_lunar_bridge(self):
+        """获取（必要时创建）lunar.js桥接实例"""
+        if not hasattr(self, 'lunar_bridge'):
+            self.lunar_bridge = LunarJSBridge()
+        return self.lunar_bridge
+    
+    def create_initial_lunar_provider(self):
+        """启动时立即可用的农历后端（不需要启动node），指定了其他后端时返回None"""
+        override = os.environ.get(BACKEND_ENV, "").strip().lower()
+        candidates = []
+        if LUNAR_TABLE_AVAILABLE:
+            candidates.append(("table", TableLunarProvider))
+        if LUNAR_PYTHON_AVAILABLE:
+            candidates.append(("python", PythonLunarProvider))
+        for name, factory in candidates:
+            if override and name != override:
+                continue
+            try:
+                return factory()
+            except Exception as e:
+                print(f"初始化农历后端{name}时出错: {e}")
+        return None
+    
+    def select_lunar_providers(self):
+        """自检并测速全部农历后端（在后台线程中执行）"""
+        factories = default_factories(self.get_lunar_bridge)
+        if not (LUNAR_JS_AVAILABLE and LUNAR_JS_INTEGRATION_AVAILABLE):
+            factories = [(name, factory) for name, factory in factories if name != "node"]
+        self.lunar_providers = LunarProviderManager(factories)
+        return self.lunar_providers
+    
+    def on_lunar_providers_selected(self, manager):
+        """后端选择完成：输出报告，必要时用新后端重新显示农历"""
+        print(manager.summary())
+        initial = self.initial_lunar_provider
+        if manager.chosen is None or (initial is not None and manager.chosen.name == initial.name):
+            return
+        self.month_models.clear()
+        self.update_calendar()
+    
+    def get_lunar_provider(self, year):
+        """获取支持该年份的农历后端，没有可用后端时返回None"""
+        if self.lunar_providers is not None:
+            return self.lunar_providers.for_year(year)
+        provider = self.initial_lunar_provider
+        if provider is not None and provider.supports(year):
+            return provider
+        return None
+    
+    def almanac_available(self):
+        """黄历详情是否可用（有lunar.js或预计算黄历文件）"""
+        return (LUNAR_JS_AVAILABLE and LUNAR_JS_INTEGRATION_AVAILABLE) or self.almanac_cache.precomputed is not None
+    
     def create_database(self):
-        """创建SQLite数据库和表"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tags (
-            id INTEGER PRIMARY KEY,
-            date TEXT,
-            tag TEXT,
-            color TEXT DEFAULT '#1E90FF'
-        )
-        ''')
-        
-        # 添加提醒功能表，支持复杂的重复模式
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS reminders (
-            id INTEGER PRIMARY KEY,
-            date TEXT,
-            time TEXT,
-            message TEXT,
-            is_active INTEGER DEFAULT 1,
-            repeat_type TEXT DEFAULT 'none',
-            repeat_value TEXT DEFAULT NULL
-        )
-        ''')
-        
-        # 添加LLM配置表
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS llm_configs (
-                id INTEGER PRIMARY KEY,
-                name TEXT UNIQUE,
-                base_uri TEXT,
-                model_name TEXT,
-                api_key TEXT,
-                temperature REAL DEFAULT 0.7,
-                is_default INTEGER DEFAULT 0
-            )
-        ''')
-        
-        # 添加聊天历史表
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS chat_sessions (
-            id INTEGER PRIMARY KEY,
-            title TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS chat_messages (
-            id INTEGER PRIMARY KEY,
-            session_id INTEGER,
-            role TEXT,
-            content TEXT,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (session_id) REFERENCES chat_sessions (id) ON DELETE CASCADE
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        """创建SQLite数据库和表，旧数据库按版本依次迁移到当前结构"""
+        conn = db_connection.connect(self.db_path)
+        try:
+            migrate(conn)
+            # 标签内容和聊天记录是否可以使用全文索引（SQLite不支持FTS5时退回LIKE）
+            self.full_text_search = fts_available(conn)
+        finally:
+            conn.close()
     
     def create_widgets(self):
         """创建UI组件"""
@@ -280,7 +391,8 @@ class CalendarApp:
         # 年份选择
         ttk.Label(control_frame, text="年份:").pack(side=tk.LEFT, padx=5)
         self.year_var = tk.StringVar(value=str(self.selected_year))
-        year_spin = ttk.Spinbox(control_frame, from_=1900, to=2100, textvariable=self.year_var, width=6)
+        year_spin = ttk.Spinbox(control_frame, from_=1900, to=2100, textvariable=self.year_var, width=6,
+                                command=self.change_year)
         year_spin.pack(side=tk.LEFT, padx=5)
         year_spin.bind("<Return>", lambda e: self.change_year())
         
@@ -291,7 +403,8 @@ class CalendarApp:
         # 月份选择
         ttk.Label(control_frame, text="月份:").pack(side=tk.LEFT, padx=5)
         self.month_var = tk.StringVar(value=str(self.selected_month))
-        month_spin = ttk.Spinbox(control_frame, from_=1, to=12, textvariable=self.month_var, width=4)
+        month_spin = ttk.Spinbox(control_frame, from_=1, to=12, textvariable=self.month_var, width=4,
+                                 command=self.change_month)
         month_spin.pack(side=tk.LEFT, padx=5)
         month_spin.bind("<Return>", lambda e: self.change_month())
         
@@ -311,9 +424,32 @@ class CalendarApp:
         # LLM按钮
         ttk.Button(control_frame, text="AI助手", command=self.show_llm_dialog).pack(side=tk.RIGHT, padx=5)
         
-        # 日历区域
-        self.calendar_frame = ttk.Frame(main_frame)
-        self.calendar_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+        # 择日按钮
+        ttk.Button(control_frame, text="择日", command=self.show_zeri_dialog).pack(side=tk.RIGHT, padx=5)
+        
+        # 年视图按钮
+        ttk.Button(control_frame, text="年视图", command=self.show_year_overview).pack(side=tk.RIGHT, padx=5)
+        
+        # 热力图按钮
+        ttk.Button(control_frame, text="热力图", command=self.show_tag_heatmap).pack(side=tk.RIGHT, padx=5)
+        
+        # 视图切换按钮
+        self.view_button = ttk.Button(control_frame, command=self.toggle_calendar_view)
+        self.view_button.pack(side=tk.RIGHT, padx=5)
+        
+        # 日历区域（格子视图和画布视图共用）
+        self.calendar_area = ttk.Frame(main_frame)
+        self.calendar_area.pack(fill=tk.BOTH, expand=True, pady=10)
+        
+        self.calendar_frame = ttk.Frame(self.calendar_area)
+        self.build_calendar_grid()
+        self.calendar_canvas = CalendarCanvas(
+            self.calendar_area,
+            on_select=self.select_day,
+            on_tag_click=self.show_tag_popup,
+            on_right_click=self.on_canvas_right_click
+        )
+        self.apply_calendar_view()
         
         # 颜色映射：中文名称到十六进制代码
         self.color_map = {
@@ -328,219 +464,350 @@ class CalendarApp:
         # 反向映射：十六进制代码到中文名称
         self.reverse_color_map = {v: k for k, v in self.color_map.items()}
     
-    def update_calendar(self):
-        """更新日历显示"""
-        # 清除现有日历
-        for widget in self.calendar_frame.winfo_children():
-            widget.destroy()
-        
-        # 创建星期标题
+    def build_calendar_grid(self):
+        """创建固定的6×7日期格子（只创建一次，之后每次刷新只更新文字、颜色和显示状态）"""
+        # 星期标题
         weekdays = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
         for i, day in enumerate(weekdays):
             label = ttk.Label(self.calendar_frame, text=day, anchor="center", width=10)
             label.grid(row=0, column=i, sticky="nsew", padx=1, pady=1)
             if i >= 5:  # 周末使用不同颜色
                 label.configure(foreground="red")
+            self.calendar_frame.grid_columnconfigure(i, weight=1)
+        
+        # 每个格子当前显示的日期（0表示该格子不属于本月）
+        self.cell_days = [0] * 42
+        self.day_cells = []
+        for index in range(42):
+            day_frame = ttk.Frame(self.calendar_frame, borderwidth=1, relief="solid")
+            day_frame.grid(row=index // 7 + 1, column=index % 7, sticky="nsew", padx=1, pady=1)
+            
+            date_label = ttk.Label(day_frame, text="", anchor="center")
+            date_label.pack(fill=tk.X)
+            
+            lunar_label = ttk.Label(day_frame, text="", anchor="center", font=("SimSun", 9))
+            lunar_label.pack(fill=tk.X)
+            
+            # 标签标记，有标签时才显示
+            tag_marker = ttk.Label(day_frame, text="●", anchor="center", font=("SimSun", 12))
+            
+            # 事件只绑定一次，按格子下标查找日期
+            for widget in (day_frame, date_label, lunar_label):
+                widget.bind("<Button-1>", lambda e, i=index: self.on_day_cell_click(i))
+                widget.bind("<Button-3>", lambda e, i=index: self.on_day_cell_right_click(i))
+            tag_marker.bind("<Button-1>", lambda e, i=index: self.on_tag_marker_click(i))
+            
+            self.day_cells.append({
+                "frame": day_frame,
+                "date_label": date_label,
+                "lunar_label": lunar_label,
+                "tag_marker": tag_marker,
+                "tag_color": None,
+            })
+    
+    def apply_calendar_view(self):
+        """显示当前选择的月视图"""
+        if self.calendar_view == "canvas":
+            self.calendar_frame.pack_forget()
+            self.calendar_canvas.pack(fill=tk.BOTH, expand=True)
+            self.view_button.configure(text="格子视图")
+        else:
+            self.calendar_canvas.pack_forget()
+            self.calendar_frame.pack(fill=tk.BOTH, expand=True)
+            self.view_button.configure(text="画布视图")
+    
+    def toggle_calendar_view(self):
+        """在格子视图和画布视图之间切换"""
+        self.calendar_view = "grid" if self.calendar_view == "canvas" else "canvas"
+        self.apply_calendar_view()
+        self.update_calendar()
+    
+    def on_canvas_right_click(self, day):
+        """画布视图中右键点击日期，显示农历详细信息"""
+        if self.almanac_available():
+            self.show_yi_ji_info(day)
+    
+    def on_day_cell_click(self, index):
+        """左键点击日期格子"""
+        day = self.cell_days[index]
+        if day:
+            self.select_day(day)
+    
+    def on_day_cell_right_click(self, index):
+        """右键点击日期格子，显示农历详细信息"""
+        day = self.cell_days[index]
+        if day and self.almanac_available():
+            self.show_yi_ji_info(day)
+    
+    def on_tag_marker_click(self, index):
+        """点击标签标记，显示标签内容"""
+        day = self.cell_days[index]
+        color = self.day_cells[index]["tag_color"]
+        if day and color:
+            self.show_tag_popup(day, color)
+    
+    def schedule_render(self):
+        """
+        请求在下一帧渲染当前选择的月份：连续翻页时一帧内的多次请求只渲染最后一个月，
+        跳过的月份的农历查询和预取随即取消
+        """
+        self.lunar_service.cancel("month")
+        self.cancel_prefetch()
+        if self.render_job is None:
+            self.render_job = self.root.after(RENDER_DELAY_MS, self.update_calendar)
+    
+    def update_calendar(self):
+        """更新日历显示（只更新已有格子的内容，不重建控件）"""
+        # 直接调用时一并完成尚未执行的合并渲染
+        if self.render_job is not None:
+            self.root.after_cancel(self.render_job)
+            self.render_job = None
+        
+        year, month = self.selected_year, self.selected_month
+        model = self.get_month_model(year, month)
+        self.displayed_month = (year, month)
+        
+        # 数据表等快速后端在构建模型时已同步填入农历；其他后端在后台线程中查询，先显示公历日期，农历随后填入
+        provider = self.get_lunar_provider(year)
+        # 后端选择尚未完成时也排队，任务会在选择完成后执行
+        lunar_pending = not model.lunar_ready and (provider is not None or self.lunar_providers is None)
+        self.lunar_labels = {}
+        
+        if self.calendar_view == "canvas":
+            highlight = (self.selected_month == self.current_date.month and
+                         self.selected_year == self.current_date.year)
+            self.calendar_canvas.show(year, month, model.grid, model.lunar_texts(), model.tags(),
+                                      self.selected_day, highlight)
+        else:
+            self.update_calendar_grid(model)
+        
+        # 后台查询农历；切换到其他月份后，同一通道的旧请求会被取消
+        if lunar_pending:
+            self.lunar_service.submit(
+                self.get_month_lunar_cells, year, month,
+                callback=lambda lunar_cells, y=year, m=month: self.fill_lunar_labels(y, m, lunar_cells),
+                channel="month"
+            )
+        else:
+            self.lunar_service.cancel("month")
         
-        # 获取当月的日历
-        cal = calendar.monthcalendar(self.selected_year, self.selected_month)
+        self.prefetch_adjacent_months(year, month)
+    
+    def get_month_model(self, year, month):
+        """
+        获取当前数据版本的MonthModel：命中缓存时不查询数据库和农历；
+        数据版本变化后重新读取标签，但沿用之前查好的农历
+        """
+        model = self.month_models.get(year, month, self.data_version)
+        if model is not None:
+            return model
+        
+        tags = self.get_month_tags(year, month)
+        previous = self.month_models.latest(year, month)
+        if previous is not None and previous.lunar_ready:
+            model = previous.with_version(self.data_version, tags)
+        else:
+            provider = self.get_lunar_provider(year)
+            if provider is not None and provider.fast:
+                lunar_cells = self.get_month_lunar_cells(year, month)
+            elif provider is None and self.lunar_providers is not None:
+                # 没有支持该年份的后端，只显示公历
+                lunar_cells = {}
+            else:
+                lunar_cells = None
+            model = build_month_model(year, month, self.data_version, lunar_cells, tags)
+        self.month_models.put(model)
+        return model
+    
+    def bump_data_version(self):
+        """标签、提醒等数据写入后调用，使缓存的MonthModel失效"""
+        self.data_version += 1
+    
+    def on_external_data_change(self):
+        """MCP工具等在界面之外写入数据后，使缓存失效并刷新日历"""
+        self.bump_data_version()
+        self.daily_counts.invalidate()
+        self.update_calendar()
+    
+    def prefetch_adjacent_months(self, year, month):
+        """在后台预取相邻月份的农历和标签"""
+        for offset in PREFETCH_OFFSETS:
+            index = year * 12 + month - 1 + offset
+            target_year, target_month = divmod(index, 12)
+            target_month += 1
+            if not 1900 <= target_year <= 2100:
+                continue
+            model = self.month_models.get(target_year, target_month, self.data_version)
+            if model is not None and model.lunar_ready:
+                continue
+            # 已查好的农历直接复用，只重新读取标签
+            previous = self.month_models.latest(target_year, target_month)
+            lunar_cells = previous.lunar_cells() if previous is not None and previous.lunar_ready else None
+            # 每个偏移一个通道，再次翻页时尚未执行的旧预取会被取消
+            self.lunar_service.submit(
+                self.load_month_model, target_year, target_month, self.data_version, lunar_cells,
+                callback=self.store_prefetched_model,
+                channel=("prefetch", offset)
+            )
+    
+    def load_month_model(self, year, month, version, lunar_cells):
+        """在后台线程中构建一个月的MonthModel"""
+        if lunar_cells is None:
+            lunar_cells = self.get_month_lunar_cells(year, month)
+        return build_month_model(year, month, version, lunar_cells, self.get_month_tags(year, month))
+    
+    def store_prefetched_model(self, model):
+        """预取结果存入缓存；预取期间数据已被修改时，该版本的模型不会再被使用，由LRU淘汰"""
+        existing = self.month_models.get(model.year, model.month, model.version)
+        if existing is None or not existing.lunar_ready:
+            self.month_models.put(model)
+    
+    def cancel_prefetch(self):
+        """远距离跳转时取消尚未执行的预取"""
+        for offset in PREFETCH_OFFSETS:
+            self.lunar_service.cancel(("prefetch", offset))
+    
+    def update_calendar_grid(self, model):
+        """把一个月的内容填入格子视图"""
+        # 只有本月用到的行参与拉伸
+        for row in range(6):
+            self.calendar_frame.grid_rowconfigure(row + 1, weight=1 if row < model.rows else 0)
         
-        # 获取当月所有标签
-        month_tags = self.get_month_tags()
+        highlight = (self.selected_month == self.current_date.month and
+                     self.selected_year == self.current_date.year)
         
         # 填充日历
-        for week_idx, week in enumerate(cal):
-            for day_idx, day in enumerate(week):
-                if day != 0:
-                    # 创建日期框架
-                    day_frame = ttk.Frame(self.calendar_frame, borderwidth=1, relief="solid")
-                    day_frame.grid(row=week_idx+1, column=day_idx, sticky="nsew", padx=1, pady=1)
-                    self.calendar_frame.grid_columnconfigure(day_idx, weight=1)
-                    self.calendar_frame.grid_rowconfigure(week_idx+1, weight=1)
-                    
-                    # 日期字符串 (YYYY-MM-DD)
-                    date_str = f"{self.selected_year}-{self.selected_month:02d}-{day:02d}"
-                    
-                    # 获取农历（如果可用）
-                    if LUNAR_AVAILABLE:
-                        try:
-                            if LUNAR_PYTHON_AVAILABLE:
-                                solar = Solar.fromYmd(self.selected_year, self.selected_month, day)
-                                lunar = Lunar.fromSolar(solar)
-                                lunar_day = lunar.getDayInChinese()
-                                
-                                # 始终显示农历月份和日期
-                                lunar_month = lunar.getMonthInChinese()
-                                lunar_text = f"{lunar_month}月{lunar_day}"
-                            elif LUNAR_JS_AVAILABLE and LUNAR_JS_INTEGRATION_AVAILABLE:
-                                # 使用lunar-javascript获取农历信息
-                                try:
-                                    if not hasattr(self, 'lunar_bridge'):
-                                        self.lunar_bridge = LunarJSBridge()
-                                    
-                                    lunar_month = self.lunar_bridge.get_lunar_month(self.selected_year, self.selected_month, day)
-                                    lunar_day = self.lunar_bridge.get_lunar_day(self.selected_year, self.selected_month, day)
-                                    lunar_text = f"{lunar_month}月{lunar_day}"
-                                    
-                                    # 获取节日、节气等信息
-                                    festivals = []
-                                    lunar_festivals = self.lunar_bridge.get_lunar_festivals(self.selected_year, self.selected_month, day)
-                                    if lunar_festivals and isinstance(lunar_festivals, list) and len(lunar_festivals) > 0:
-                                        festivals.extend(lunar_festivals)
-                                    
-                                    solar_festivals = self.lunar_bridge.get_solar_festivals(self.selected_year, self.selected_month, day)
-                                    if solar_festivals and isinstance(solar_festivals, list) and len(solar_festivals) > 0:
-                                        festivals.extend(solar_festivals)
-                                    
-                                    jie_qi = self.lunar_bridge.get_jie_qi(self.selected_year, self.selected_month, day)
-                                    if jie_qi and jie_qi != "":
-                                        festivals.append(jie_qi)
-                                    
-                                    # 如果有节日或节气，添加到日期框中
-                                    if festivals:
-                                        lunar_text += " " + ",".join(festivals)
-                                except Exception as e:
-                                    print(f"lunar-javascript转换错误: {e}")
-                        except Exception as e:
-                            lunar_text = ""
-                            print(f"农历转换错误: {e}")
-                    else:
-                        lunar_text = ""
-                    
-                    # 日期标签
-                    date_label = ttk.Label(day_frame, text=str(day), anchor="center")
-                    date_label.pack(fill=tk.X)
-                    
-                    # 农历标签
-                    lunar_label = ttk.Label(day_frame, text=lunar_text, anchor="center", font=("SimSun", 9))
-                    lunar_label.pack(fill=tk.X)
-                    
-                    # 检查是否有标签，如果有则显示标记
-                    if date_str in month_tags:
-                        tag_color = month_tags[date_str]["color"]
-                        tag_marker = ttk.Label(day_frame, text="●", anchor="center", 
-                                             foreground=tag_color, font=("SimSun", 12))
-                        tag_marker.pack(fill=tk.X)
-                        
-                        # 为标记添加点击事件，显示标签内容
-                        tag_marker.bind("<Button-1>", lambda e, d=day, c=tag_color: self.show_tag_popup(d, c))
-                    
-                    # 设置点击事件
-                    day_frame.bind("<Button-1>", lambda e, d=day: self.select_day(d))
-                    date_label.bind("<Button-1>", lambda e, d=day: self.select_day(d))
-                    lunar_label.bind("<Button-1>", lambda e, d=day: self.select_day(d))
-                    
-                    # 添加右键菜单，显示农历详细信息
-                    if LUNAR_JS_AVAILABLE:
-                        day_frame.bind("<Button-3>", lambda e, d=day: self.show_yi_ji_info(d))
-                        date_label.bind("<Button-3>", lambda e, d=day: self.show_yi_ji_info(d))
-                        lunar_label.bind("<Button-3>", lambda e, d=day: self.show_yi_ji_info(d))
-                    
-                    # 添加右键菜单，显示农历详细信息
-                    if LUNAR_JS_AVAILABLE and LUNAR_JS_INTEGRATION_AVAILABLE:
-                        day_frame.bind("<Button-3>", lambda e, d=day: self.show_yi_ji_info(d))
-                        date_label.bind("<Button-3>", lambda e, d=day: self.show_yi_ji_info(d))
-                        lunar_label.bind("<Button-3>", lambda e, d=day: self.show_yi_ji_info(d))
-                    
-                    # 高亮当前选中的日期
-                    if (day == self.selected_day and 
-                        self.selected_month == self.current_date.month and 
-                        self.selected_year == self.current_date.year):
-                        day_frame.configure(style="Selected.TFrame")
+        for index, day in enumerate(model.grid):
+            cell = self.day_cells[index]
+            self.cell_days[index] = day
+            if day == 0:
+                cell["frame"].grid_remove()
+                continue
+            cell["frame"].grid()
+            day_cell = model.cell(day)
+            
+            cell["date_label"].configure(text=str(day))
+            # 农历（后台查询时先留空）
+            cell["lunar_label"].configure(text=model.lunar_text(day))
+            self.lunar_labels[day] = cell["lunar_label"]
+            
+            # 检查是否有标签，如果有则显示标记
+            if day_cell.tag_color:
+                cell["tag_color"] = day_cell.tag_color
+                cell["tag_marker"].configure(foreground=cell["tag_color"])
+                cell["tag_marker"].pack(fill=tk.X)
+            else:
+                cell["tag_color"] = None
+                cell["tag_marker"].pack_forget()
+            
+            # 高亮当前选中的日期
+            if highlight and day == self.selected_day:
+                cell["frame"].configure(style="Selected.TFrame")
+            else:
+                cell["frame"].configure(style="TFrame")
     
-    def get_month_tags(self):
-        """获取当月所有标签"""
-        month_tags = {}
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+    def get_month_lunar_cells(self, year, month):
+        """
+        获取整月每一天的农历和节日节气 {day: ("X月Y", (节日, 节气, ...))}
+        可能调用lunar.js，除数据表外应在后台线程中执行
+        """
+        provider = self.get_lunar_provider(year)
+        if provider is None:
+            return {}
+        try:
+            return lunar_cells_from_provider(provider.get_month_cells(year, month))
+        except Exception as e:
+            print(f"农历转换错误({provider.name}): {e}")
+            return {}
+    
+    def fill_lunar_labels(self, year, month, lunar_cells):
+        """后台农历查询完成后更新缓存的模型并填入日历格子"""
+        model = self.month_models.get(year, month, self.data_version) or self.get_month_model(year, month)
+        model = model.with_lunar(lunar_cells)
+        self.month_models.put(model)
+        if (year, month) != (self.selected_year, self.selected_month):
+            return
+        if self.calendar_view == "canvas":
+            self.calendar_canvas.set_lunar_texts(year, month, model.lunar_texts())
+            return
+        for day, label in self.lunar_labels.items():
+            if label.winfo_exists():
+                label.configure(text=model.lunar_text(day))
+    
+    def get_month_tags(self, year=None, month=None):
+        """获取某月（默认当前显示的月份）所有标签"""
+        if year is None:
+            year, month = self.selected_year, self.selected_month
         # 查询当月的所有标签
-        month_start = f"{self.selected_year}-{self.selected_month:02d}-01"
-        month_end = f"{self.selected_year}-{self.selected_month:02d}-31"
-        cursor.execute("SELECT date, tag, color FROM tags WHERE date BETWEEN ? AND ?", 
-                      (month_start, month_end))
-        
-        for row in cursor.fetchall():
-            month_tags[row[0]] = {"tag": row[1], "color": row[2]}
-        
-        conn.close()
+        month_tags = {}
+        for tag in self.tag_repo.between(f"{year}-{month:02d}-01", f"{year}-{month:02d}-31"):
+            month_tags[tag.date] = {"tag": tag.tag, "color": tag.color}
         return month_tags
     
     def select_day(self, day):
         """选择日期"""
+        previous_day = self.selected_day
         self.selected_day = day
         date_str = f"{self.selected_year}-{self.selected_month:02d}-{day:02d}"
         
-        # 高亮选中的日期并更新日历
-        self.update_calendar()
+        # 高亮选中的日期：当前月份已显示时只改新旧两个格子，否则完整更新日历
+        if self.displayed_month == (self.selected_year, self.selected_month):
+            self.update_selection(previous_day, day)
+        else:
+            self.update_calendar()
         
-        # 检查是否有标签，如果有则显示标签编辑弹窗
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT tag, color FROM tags WHERE date = ?", (date_str,))
-        result = cursor.fetchone()
+        # 检查是否有标签，如果有则显示标签编辑弹窗（从内存中的月份数据查找）
+        model = self.month_models.get(self.selected_year, self.selected_month, self.data_version)
+        if model is not None:
+            tag_color = model.cell(day).tag_color
+        else:
+            tag = self.tag_repo.for_date(date_str)
+            tag_color = tag.color if tag else None
         
-        if result:
-            self.show_tag_popup(day, result[1])
+        if tag_color:
+            self.show_tag_popup(day, tag_color)
         else:
             # 如果没有标签，询问是否添加
             if messagebox.askyesno("添加标签", f"是否要为 {date_str} 添加标签？"):
                 self.add_tag_dialog(date_str)
-        
-        conn.close()
+    
+    def update_selection(self, previous_day, day):
+        """只更新选中高亮，不重新填充整个月"""
+        highlight = (self.selected_month == self.current_date.month and
+                     self.selected_year == self.current_date.year)
+        if self.calendar_view == "canvas":
+            self.calendar_canvas.set_selected(day, highlight)
+            return
+        for index in (self.cell_days.index(previous_day) if previous_day in self.cell_days else None,
+                      self.cell_days.index(day)):
+            if index is None:
+                continue
+            cell_day = self.cell_days[index]
+            style = "Selected.TFrame" if highlight and cell_day == day else "TFrame"
+            self.day_cells[index]["frame"].configure(style=style)
     
     def show_yi_ji_info(self, day):
-        """显示宜忌信息弹窗"""
-        if not (LUNAR_JS_AVAILABLE and LUNAR_JS_INTEGRATION_AVAILABLE):
+        """显示宜忌信息弹窗（黄历数据在后台获取，完成后再弹出）"""
+        if not self.almanac_available():
             messagebox.showinfo("提示", "此功能需要lunar-javascript支持，请运行download_lunar.py下载")
             return
         
-        date_str = f"{self.selected_year}-{self.selected_month:02d}-{day:02d}"
+        year, month = self.selected_year, self.selected_month
+        # 从黄历缓存获取（首次查询该日期时才会调用lunar.js计算）
+        self.lunar_service.submit(
+            self.almanac_cache.get, year, month, day,
+            callback=lambda data: self.display_yi_ji_info(year, month, day, data),
+            errback=lambda e: messagebox.showerror("错误", f"获取农历信息失败: {e}"),
+            channel="yi_ji"
+        )
+    
+    def display_yi_ji_info(self, year, month, day, data):
+        """根据黄历数据显示宜忌信息弹窗"""
+        date_str = f"{year}-{month:02d}-{day:02d}"
         
         try:
-            # 创建一个临时JS文件，一次性获取所有需要的农历信息
-            temp_js = os.path.join(os.path.dirname(os.path.abspath(__file__)), "temp_lunar_exec.js")
-            with open(temp_js, "w", encoding="utf-8") as f:
-                f.write("const lunar = require('./lunar.js');\n")
-                f.write(f"const solar = lunar.Solar.fromYmd({self.selected_year}, {self.selected_month}, {day});\n")
-                f.write("const lunarObj = solar.getLunar();\n")
-                f.write("const result = {\n")
-                f.write("  lunar_info: lunarObj.toFullString(),\n")
-                f.write("  yi_ji: {\n")
-                f.write("    yi: lunarObj.getDayYi(),\n")
-                f.write("    ji: lunarObj.getDayJi()\n")
-                f.write("  },\n")
-                f.write("  animal: lunarObj.getAnimal(),\n")
-                f.write("  xiu: lunarObj.getXiu(),\n")
-                f.write("  zheng: lunarObj.getZheng(),\n")
-                f.write("  xiu_luck: lunarObj.getXiuLuck(),\n")
-                f.write("  peng_zu_gan: lunarObj.getPengZuGan(),\n")
-                f.write("  peng_zu_zhi: lunarObj.getPengZuZhi(),\n")
-                f.write("  day_position_xi: lunarObj.getDayPositionXi(),\n")
-                f.write("  day_position_xi_desc: lunarObj.getDayPositionXiDesc(),\n")
-                f.write("  day_position_yang_gui: lunarObj.getDayPositionYangGui(),\n")
-                f.write("  day_position_yang_gui_desc: lunarObj.getDayPositionYangGuiDesc(),\n")
-                f.write("  day_position_yin_gui: lunarObj.getDayPositionYinGui(),\n")
-                f.write("  day_position_yin_gui_desc: lunarObj.getDayPositionYinGuiDesc(),\n")
-                f.write("  day_position_fu: lunarObj.getDayPositionFu(),\n")
-                f.write("  day_position_fu_desc: lunarObj.getDayPositionFuDesc(),\n")
-                f.write("  day_position_cai: lunarObj.getDayPositionCai(),\n")
-                f.write("  day_position_cai_desc: lunarObj.getDayPositionCaiDesc(),\n")
-                f.write("  day_chong_desc: lunarObj.getDayChongDesc(),\n")
-                f.write("  day_sha: lunarObj.getDaySha(),\n")
-                f.write("  gong: lunarObj.getGong(),\n")
-                f.write("  shou: lunarObj.getShou()\n")
-                f.write("};\n")
-                f.write("console.log(JSON.stringify(result));")
-            
-            # 执行JS文件
-            result = subprocess.check_output(["node", temp_js], text=True, encoding="utf-8")
-            
-            # 删除临时文件
-            os.remove(temp_js)
-            
-            # 解析JSON结果
-            data = json.loads(result.strip())
+            if data is None:
+                raise RuntimeError("lunar.js未返回结果")
             
             # 获取解析后的数据
             lunar_info = data["lunar_info"]
@@ -1101,34 +1368,14 @@ class CalendarApp:
         self.selected_day = day
         
         # 获取标签内容
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT tag, color FROM tags WHERE date = ?", (date_str,))
-        result = cursor.fetchone()
-        
-        # 检查reminders表中是否有repeat_type和repeat_value列
-        cursor.execute("PRAGMA table_info(reminders)")
-        columns = [column[1] for column in cursor.fetchall()]
-        has_repeat_columns = 'repeat_type' in columns and 'repeat_value' in columns
-        
-        # 获取提醒信息，根据列是否存在构建不同的查询
-        if has_repeat_columns:
-            cursor.execute("SELECT time, message, repeat_type, repeat_value FROM reminders WHERE date = ? AND is_active = 1", (date_str,))
-            reminder_result = cursor.fetchone()
-        else:
-            cursor.execute("SELECT time, message FROM reminders WHERE date = ? AND is_active = 1", (date_str,))
-            # 如果查询结果不为空，添加默认的repeat_type和repeat_value值
-            reminder_temp = cursor.fetchone()
-            if reminder_temp:
-                reminder_result = reminder_temp + ('none', None)
-            else:
-                reminder_result = None
+        tag = self.tag_repo.for_date(date_str)
         
-        conn.close()
+        # 获取提醒信息
+        reminder = self.reminder_repo.active_for_date(date_str)
         
-        if result:
-            tag_text = result[0]
-            tag_color = result[1]
+        if tag:
+            tag_text = tag.tag
+            tag_color = tag.color
             
             # 创建弹窗
             popup = tk.Toplevel(self.root)
@@ -1207,12 +1454,12 @@ class CalendarApp:
             reminder_frame = ttk.Frame(content_frame, style='Dark.TFrame')
             reminder_frame.grid(row=3, column=1, sticky=tk.W, padx=5, pady=5)
             
-            reminder_var = tk.BooleanVar(value=bool(reminder_result))
+            reminder_var = tk.BooleanVar(value=bool(reminder))
             reminder_check = ttk.Checkbutton(reminder_frame, text="启用提醒", variable=reminder_var)
             reminder_check.pack(side=tk.LEFT, padx=5)
             
             ttk.Label(reminder_frame, text="时间:").pack(side=tk.LEFT, padx=5)
-            time_var = tk.StringVar(value=reminder_result[0] if reminder_result else "08:00")
+            time_var = tk.StringVar(value=reminder.time if reminder else "08:00")
             time_entry = ttk.Entry(reminder_frame, textvariable=time_var, width=8)
             time_entry.pack(side=tk.LEFT, padx=5)
             
@@ -1226,7 +1473,7 @@ class CalendarApp:
             repeat_type_var = tk.StringVar()
             
             # 设置默认值
-            if reminder_result and reminder_result[2]:
+            if reminder and reminder.repeat_type:
                 repeat_type_map = {
                     "none": "不重复",
                     "daily": "每天",
@@ -1235,7 +1482,7 @@ class CalendarApp:
                     "yearly": "每年(公历)",
                     "lunar_yearly": "每年(农历)"
                 }
-                repeat_type_var.set(repeat_type_map.get(reminder_result[2], "不重复"))
+                repeat_type_var.set(repeat_type_map.get(reminder.repeat_type, "不重复"))
             else:
                 repeat_type_var.set("不重复")
             
@@ -1249,8 +1496,8 @@ class CalendarApp:
             
             # 重复值变量
             repeat_value_var = tk.StringVar()
-            if reminder_result and reminder_result[3]:
-                repeat_value_var.set(reminder_result[3])
+            if reminder and reminder.repeat_value:
+                repeat_value_var.set(reminder.repeat_value)
             
             # 重复值标签和控件
             repeat_value_label = ttk.Label(repeat_value_frame, text="", style='Dark.TLabel')
@@ -1285,17 +1532,17 @@ class CalendarApp:
                     repeat_value_label.config(text="选择星期几:")
                     weekday_frame.pack(side=tk.LEFT)
                     # 如果有已保存的值，设置为已保存的值
-                    if reminder_result and reminder_result[2] == "weekly" and reminder_result[3]:
+                    if reminder and reminder.repeat_type == "weekly" and reminder.repeat_value:
                         for day_name, day_value in weekday_values:
-                            if day_value == reminder_result[3]:
+                            if day_value == reminder.repeat_value:
                                 weekday_var.set(day_name)
                                 break
                 elif repeat_type == "每月":
                     repeat_value_label.config(text="选择日期:")
                     monthday_frame.pack(side=tk.LEFT)
                     # 如果有已保存的值，设置为已保存的值
-                    if reminder_result and reminder_result[2] == "monthly" and reminder_result[3]:
-                        monthday_var.set(reminder_result[3])
+                    if reminder and reminder.repeat_type == "monthly" and reminder.repeat_value:
+                        monthday_var.set(reminder.repeat_value)
                 else:
                     repeat_value_label.config(text="")
             
@@ -1571,25 +1818,11 @@ class CalendarApp:
             # 如果直接输入了十六进制代码，则直接使用
             tag_color = color_name
         
-        conn = None
         try:
-            conn = sqlite3.connect(self.db_path, timeout=10)  # 添加超时设置
-            cursor = conn.cursor()
-            
-            # 检查是否已存在标签
-            cursor.execute("SELECT id FROM tags WHERE date = ?", (date_str,))
-            result = cursor.fetchone()
-            
-            if result:
-                # 更新现有标签
-                cursor.execute("UPDATE tags SET tag = ?, color = ? WHERE date = ?", 
-                              (tag_text, tag_color, date_str))
-            else:
-                # 创建新标签
-                cursor.execute("INSERT INTO tags (date, tag, color) VALUES (?, ?, ?)", 
-                              (date_str, tag_text, tag_color))
-            
-            conn.commit()
+            # 已存在标签时更新，否则创建新标签
+            self.tag_repo.save(date_str, tag_text, tag_color)
+            self.bump_data_version()
+            self.daily_counts.refresh_date(date_str)
             
             # 成功保存后再显示消息和销毁窗口
             messagebox.showinfo("成功", "标签已保存！")
@@ -1599,25 +1832,15 @@ class CalendarApp:
             
         except sqlite3.Error as e:
             messagebox.showerror("数据库错误", f"保存标签时出错: {e}")
-            if conn:
-                conn.rollback()
-        finally:
-            if conn:
-                conn.close()
     
     def delete_tag_from_popup(self, popup, date_str, tree_view=None):
         """从弹窗删除标签"""
         if messagebox.askyesno("确认", "确定要删除此标签吗？"):
-            conn = None
             try:
-                conn = sqlite3.connect(self.db_path, timeout=10)  # 添加超时设置
-                cursor = conn.cursor()
-                
                 # 删除标签和相关提醒
-                cursor.execute("DELETE FROM tags WHERE date = ?", (date_str,))
-                cursor.execute("DELETE FROM reminders WHERE date = ?", (date_str,))
-                
-                conn.commit()
+                self.tag_repo.delete_date(date_str)
+                self.bump_data_version()
+                self.daily_counts.refresh_date(date_str)
                 
                 messagebox.showinfo("成功", "标签已删除！")
                 if popup and popup.winfo_exists():
@@ -1630,11 +1853,6 @@ class CalendarApp:
                 
             except sqlite3.Error as e:
                 messagebox.showerror("数据库错误", f"删除标签时出错: {e}")
-                if conn:
-                    conn.rollback()
-            finally:
-                if conn:
-                    conn.close()
     
     def save_tag_and_reminder(self, popup, date_str, tag_text_widget, color_name, has_reminder, reminder_time, repeat_type=None, repeat_value=None, tree_view=None):
         """保存标签和提醒"""
@@ -1657,48 +1875,35 @@ class CalendarApp:
             messagebox.showerror("错误", f"保存标签时出错: {e}")
             return
         
-        # 处理提醒
-        conn = None
+        # 处理提醒：先删除现有提醒，启用了提醒时再添加新提醒
+        new_reminder_time = None
+        if has_reminder:
+            # 验证时间格式
+            try:
+                # 尝试解析时间格式
+                hour, minute = map(int, reminder_time.split(':'))
+                if not (0 <= hour <= 23 and 0 <= minute <= 59):
+                    raise ValueError("时间格式不正确")
+                new_reminder_time = reminder_time
+                
+                # 如果没有指定重复类型，默认为不重复
+                if repeat_type is None:
+                    repeat_type = "none"
+                    repeat_value = None
+            except ValueError:
+                messagebox.showwarning("警告", "提醒时间格式不正确，应为HH:MM格式！")
+        
         try:
-            conn = sqlite3.connect(self.db_path, timeout=10)  # 添加超时设置
-            cursor = conn.cursor()
-            
-            # 先删除现有提醒
-            cursor.execute("DELETE FROM reminders WHERE date = ?", (date_str,))
-            
-            # 如果启用了提醒，则添加新提醒
-            if has_reminder:
-                # 验证时间格式
-                try:
-                    # 尝试解析时间格式
-                    hour, minute = map(int, reminder_time.split(':'))
-                    if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                        raise ValueError("时间格式不正确")
-                    
-                    # 如果没有指定重复类型，默认为不重复
-                    if repeat_type is None:
-                        repeat_type = "none"
-                        repeat_value = None
-                    
-                    # 添加提醒，包含重复类型和值
-                    cursor.execute("INSERT INTO reminders (date, time, message, is_active, repeat_type, repeat_value) VALUES (?, ?, ?, 1, ?, ?)", 
-                                  (date_str, reminder_time, reminder_message, repeat_type, repeat_value))
-                    
-                except ValueError:
-                    messagebox.showwarning("警告", "提醒时间格式不正确，应为HH:MM格式！")
-            
-            conn.commit()
+            # 添加提醒，包含重复类型和值
+            self.reminder_repo.replace_for_date(date_str, new_reminder_time, reminder_message, repeat_type, repeat_value)
+            self.bump_data_version()
+            self.daily_counts.refresh_date(date_str)
             
             # 如果提供了树视图控件，刷新标签列表
             if tree_view is not None:
                 self.load_all_tags(tree_view)
         except sqlite3.Error as e:
             messagebox.showerror("数据库错误", f"保存提醒时出错: {e}")
-            if conn:
-                conn.rollback()
-        finally:
-            if conn:
-                conn.close()
     
     def show_all_tags(self):
         """显示所有标签"""
@@ -1734,6 +1939,11 @@ class CalendarApp:
                   command=lambda: self.search_tags(tree, search_var.get(), search_type_var.get())
                   ).pack(side=tk.LEFT, padx=5)
         
+        # 边输入边搜索
+        search_var.trace_add("write", lambda *args: self.schedule_tag_search(tree, search_var, search_type_var))
+        search_type_combo.bind("<<ComboboxSelected>>",
+                               lambda e: self.schedule_tag_search(tree, search_var, search_type_var))
+        
         ttk.Button(search_frame, text="重置", style='Dark.TButton',
                   command=lambda: self.reset_tag_search(tree, search_var)
                   ).pack(side=tk.LEFT, padx=5)
@@ -1750,15 +1960,20 @@ class CalendarApp:
         # 设置列宽
         tree.column("标签内容", width=400)
         
-        # 添加滚动条
+        # 按日期分页加载，点击日期列标题切换升序/降序
+        tree.tag_pager = TagPager(self.db_path)
+        tree.tag_page_pending = False
+        tree.heading("日期", text="日期 ▼", command=lambda: self.sort_tag_list(tree))
+        
+        # 添加滚动条，滚动到底部时加载下一页
         scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=tree.yview)
-        tree.configure(yscrollcommand=scrollbar.set)
+        tree.configure(yscrollcommand=lambda first, last: self.on_tag_list_scroll(tree, scrollbar, first, last))
         
         # 布局
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        # 加载所有标签
+        # 加载第一页
         self.load_all_tags(tree)
         
         # 添加双击事件，打开标签编辑
@@ -1770,42 +1985,338 @@ class CalendarApp:
         
         ttk.Button(button_frame, text="关闭", command=popup.destroy, style='Dark.TButton').pack(side=tk.RIGHT, padx=10)
     
-    def load_all_tags(self, tree):
-        """加载所有标签到树视图"""
-        # 清空现有数据
-        for item in tree.get_children():
-            tree.delete(item)
-        
-        # 获取所有标签
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 检查reminders表中是否有repeat_type和repeat_value列
-        cursor.execute("PRAGMA table_info(reminders)")
-        columns = [column[1] for column in cursor.fetchall()]
-        has_repeat_columns = 'repeat_type' in columns and 'repeat_value' in columns
-        
-        # 根据列是否存在构建不同的SQL查询
-        if has_repeat_columns:
-            # 获取标签和提醒信息，包括重复类型
-            cursor.execute("""
-            SELECT t.date, t.tag, t.color, 
-                   CASE WHEN r.id IS NULL THEN '无' ELSE r.time END as reminder_time,
-                   r.repeat_type, r.repeat_value
-            FROM tags t
-            LEFT JOIN reminders r ON t.date = r.date AND r.is_active = 1
-            ORDER BY t.date DESC
-            """)
-        else:
-            # 如果没有重复列，使用简化的查询
-            cursor.execute("""
-            SELECT t.date, t.tag, t.color, 
-                   CASE WHEN r.id IS NULL THEN '无' ELSE r.time END as reminder_time,
-                   'none' as repeat_type, NULL as repeat_value
-            FROM tags t
-            LEFT JOIN reminders r ON t.date = r.date AND r.is_active = 1
-            ORDER BY t.date DESC
-            """)
+    def jump_to_date(self, date):
+        """跳转到该日所在月份并高亮该日（不经过select_day，不弹出标签窗口）"""
+        self.selected_year = date.year
+        self.selected_month = date.month
+        self.selected_day = date.day
+        self.year_var.set(str(self.selected_year))
+        self.month_var.set(str(self.selected_month))
+        self.update_calendar()
+    
+    def show_zeri_dialog(self):
+        """择日弹窗：按宜/忌事项检索吉日"""
+        if not self.almanac_available():
+            messagebox.showinfo("提示", "此功能需要lunar-javascript支持，请运行download_lunar.py下载")
+            return
+        
+        popup = tk.Toplevel(self.root)
+        popup.geometry("700x500")
+        popup.title("择日")
+        
+        # 应用深色主题样式（但保留系统标准标题栏）
+        self.configure_popup_style(popup)
+        
+        main_frame = ttk.Frame(popup, padding=10, style='Dark.TFrame')
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # 条件框架
+        query_frame = ttk.Frame(main_frame, style='Dark.TFrame')
+        query_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(query_frame, text="宜:", style='Dark.TLabel').grid(row=0, column=0, sticky=tk.W, padx=5, pady=2)
+        yi_var = tk.StringVar(value="嫁娶")
+        ttk.Entry(query_frame, textvariable=yi_var, width=25).grid(row=0, column=1, sticky=tk.W, padx=5, pady=2)
+        
+        ttk.Label(query_frame, text="忌不含:", style='Dark.TLabel').grid(row=0, column=2, sticky=tk.W, padx=5, pady=2)
+        avoid_var = tk.StringVar()
+        ttk.Entry(query_frame, textvariable=avoid_var, width=25).grid(row=0, column=3, sticky=tk.W, padx=5, pady=2)
+        
+        ttk.Label(query_frame, text="范围:", style='Dark.TLabel').grid(row=1, column=0, sticky=tk.W, padx=5, pady=2)
+        range_var = tk.StringVar(value="6个月")
+        ttk.Combobox(query_frame, textvariable=range_var, values=["1个月", "3个月", "6个月", "12个月"],
+                     width=8, state="readonly").grid(row=1, column=1, sticky=tk.W, padx=5, pady=2)
+        
+        weekend_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(query_frame, text="仅周末", variable=weekend_var).grid(row=1, column=2, sticky=tk.W, padx=5, pady=2)
+        
+        status_var = tk.StringVar(value="多个事项用空格或逗号分隔")
+        
+        def parse_activities(text):
+            return [item for item in text.replace("，", " ").replace(",", " ").split() if item]
+        
+        weekday_names = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
+        
+        def result_rows(days):
+            """结果列表的行（在后台线程中计算农历，node后端每次查询都要跨进程通信）"""
+            rows = []
+            for day in days:
+                lunar_text = ""
+                provider = self.get_lunar_provider(day.year)
+                if provider is not None:
+                    lunar = provider.get_lunar_day(day.year, day.month, day.day)
+                    lunar_text = f"{lunar.month_in_chinese}月{lunar.day_in_chinese}"
+                rows.append((day.isoformat(), weekday_names[day.weekday()], lunar_text))
+            return rows
+        
+        def show_results(rows, elapsed):
+            if not popup.winfo_exists():
+                return
+            for item in tree.get_children():
+                tree.delete(item)
+            for row in rows:
+                tree.insert("", tk.END, values=row)
+            status_var.set(f"共找到{len(rows)}天（{elapsed:.0f}毫秒）")
+        
+        def do_search():
+            yi = parse_activities(yi_var.get())
+            avoid_ji = parse_activities(avoid_var.get())
+            months = int(range_var.get().replace("个月", ""))
+            weekdays = WEEKEND if weekend_var.get() else None
+            start = datetime.date.today()
+            end = start + datetime.timedelta(days=months * 31)
+            status_var.set("正在检索（首次查询某年时需要建立索引）...")
+            
+            def worker():
+                try:
+                    begin = datetime.datetime.now()
+                    days = self.zeri_index.search(start, end, yi=yi, avoid_ji=avoid_ji, weekdays=weekdays)
+                    elapsed = (datetime.datetime.now() - begin).total_seconds() * 1000
+                    rows = result_rows(days)
+                    self.root.after(0, lambda: show_results(rows, elapsed))
+                except Exception as e:
+                    print(f"择日检索出错: {e}")
+                    self.root.after(0, lambda: status_var.set(f"检索出错: {e}"))
+            
+            threading.Thread(target=worker, daemon=True).start()
+        
+        ttk.Button(query_frame, text="检索", style='Dark.TButton', command=do_search).grid(row=1, column=3, sticky=tk.W, padx=5, pady=2)
+        
+        ttk.Label(main_frame, textvariable=status_var, style='Dark.TLabel').pack(fill=tk.X, pady=5)
+        
+        # 结果列表
+        columns = ("日期", "星期", "农历")
+        tree = ttk.Treeview(main_frame, columns=columns, show="headings")
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=150)
+        
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        def open_selected(event=None):
+            selection = tree.selection()
+            if not selection:
+                return
+            day = datetime.date.fromisoformat(tree.item(selection[0], "values")[0])
+            self.jump_to_date(day)
+            self.show_yi_ji_info(day.day)
+        
+        # 双击查看该日宜忌详情
+        tree.bind("<Double-1>", open_selected)
+        
+        button_frame = ttk.Frame(popup, style='Dark.TFrame')
+        button_frame.pack(fill=tk.X, pady=10)
+        ttk.Button(button_frame, text="关闭", command=popup.destroy, style='Dark.TButton').pack(side=tk.RIGHT, padx=10)
+    
+    def show_year_overview(self):
+        """年视图弹窗：全年12个月的标签密度和节日节气"""
+        popup = tk.Toplevel(self.root)
+        popup.geometry("900x650")
+        popup.title("年视图")
+        
+        # 应用深色主题样式（但保留系统标准标题栏）
+        self.configure_popup_style(popup)
+        
+        main_frame = ttk.Frame(popup, padding=10, style='Dark.TFrame')
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # 年份导航
+        nav_frame = ttk.Frame(main_frame, style='Dark.TFrame')
+        nav_frame.pack(fill=tk.X, pady=5)
+        year_var = tk.IntVar(value=self.selected_year)
+        status_var = tk.StringVar(value="")
+        
+        # 当前显示年份的数据，用于悬停提示
+        shown = {"tag_counts": {}, "festivals": {}}
+        
+        def show_data(year, data):
+            if not popup.winfo_exists() or year != year_var.get():
+                return
+            tag_counts, festivals, elapsed = data
+            shown["tag_counts"], shown["festivals"] = tag_counts, festivals
+            overview.show(year, tag_counts, festivals)
+            status_var.set(f"{year}年: {len(tag_counts)}天有标签，共{sum(tag_counts.values())}个（{elapsed:.0f}毫秒）")
+        
+        def load(year):
+            year_var.set(year)
+            status_var.set("正在加载...")
+            self.lunar_service.submit(
+                self.load_year_overview_data, year,
+                callback=lambda data, y=year: show_data(y, data),
+                errback=lambda e: status_var.set(f"加载失败: {e}"),
+                channel="year_overview"
+            )
+        
+        def on_hover(date):
+            if date is None:
+                return
+            date_str = date.isoformat()
+            parts = [date_str]
+            count = shown["tag_counts"].get(date_str, 0)
+            if count:
+                parts.append(f"{count}个标签")
+            if date_str in shown["festivals"]:
+                parts.append(",".join(shown["festivals"][date_str]))
+            status_var.set("  ".join(parts))
+        
+        ttk.Button(nav_frame, text="◀", width=2, style='Dark.TButton',
+                   command=lambda: load(max(year_var.get() - 1, 1900))).pack(side=tk.LEFT)
+        ttk.Label(nav_frame, textvariable=year_var, style='Dark.TLabel', width=6, anchor="center").pack(side=tk.LEFT)
+        ttk.Button(nav_frame, text="▶", width=2, style='Dark.TButton',
+                   command=lambda: load(min(year_var.get() + 1, 2100))).pack(side=tk.LEFT)
+        ttk.Label(nav_frame, textvariable=status_var, style='Dark.TLabel').pack(side=tk.LEFT, padx=15)
+        
+        overview = YearOverviewCanvas(main_frame, on_hover=on_hover, on_open=self.jump_to_date)
+        overview.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Button(main_frame, text="关闭", command=popup.destroy, style='Dark.TButton').pack(side=tk.RIGHT, pady=5)
+        
+        load(self.selected_year)
+    
+    def load_year_overview_data(self, year):
+        """在后台线程中读取年视图数据：一次分组查询标签数量，一次查出全年节日节气"""
+        begin = datetime.datetime.now()
+        tag_counts = load_year_tag_counts(self.db_path, year)
+        lunar_index = get_lunar_index() if LUNAR_TABLE_AVAILABLE else None
+        try:
+            festivals = load_year_festivals(year, lunar_index, self.get_lunar_provider(year))
+        except Exception as e:
+            print(f"获取节日出错: {e}")
+            festivals = {}
+        elapsed = (datetime.datetime.now() - begin).total_seconds() * 1000
+        return tag_counts, festivals, elapsed
+    
+    def show_tag_heatmap(self):
+        """热力图弹窗：最近几年每天的标签和提醒数量"""
+        popup = tk.Toplevel(self.root)
+        popup.geometry("900x500")
+        popup.title("标签热力图")
+        
+        # 应用深色主题样式（但保留系统标准标题栏）
+        self.configure_popup_style(popup)
+        
+        main_frame = ttk.Frame(popup, padding=10, style='Dark.TFrame')
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        option_frame = ttk.Frame(main_frame, style='Dark.TFrame')
+        option_frame.pack(fill=tk.X, pady=5)
+        
+        ttk.Label(option_frame, text="年数:", style='Dark.TLabel').pack(side=tk.LEFT, padx=5)
+        years_var = tk.StringVar(value="3")
+        years_box = ttk.Combobox(option_frame, textvariable=years_var, values=["1", "2", "3", "5"],
+                                 width=4, state="readonly")
+        years_box.pack(side=tk.LEFT, padx=5)
+        
+        status_var = tk.StringVar(value="")
+        ttk.Label(option_frame, textvariable=status_var, style='Dark.TLabel').pack(side=tk.LEFT, padx=15)
+        
+        # 当前显示的数据，用于悬停提示
+        shown = {"counts": {}}
+        
+        def show_data(years, data):
+            if not popup.winfo_exists():
+                return
+            counts, elapsed = data
+            shown["counts"] = counts
+            heatmap.show(years, counts)
+            total_tags = sum(tags for tags, reminders in counts.values())
+            total_reminders = sum(reminders for tags, reminders in counts.values())
+            status_var.set(f"{years[0]}-{years[-1]}年: {total_tags}个标签，{total_reminders}个提醒（{elapsed:.0f}毫秒）")
+        
+        def load(event=None):
+            end_year = datetime.date.today().year
+            years = list(range(end_year - int(years_var.get()) + 1, end_year + 1))
+            status_var.set("正在统计...")
+            self.lunar_service.submit(
+                self.load_heatmap_counts, years[0], years[-1],
+                callback=lambda data, y=years: show_data(y, data),
+                errback=lambda e: status_var.set(f"统计失败: {e}"),
+                channel="heatmap"
+            )
+        
+        def on_hover(date):
+            if date is None:
+                return
+            tags, reminders = shown["counts"].get(date.isoformat(), (0, 0))
+            status_var.set(f"{date.isoformat()}  {tags}个标签，{reminders}个提醒")
+        
+        years_box.bind("<<ComboboxSelected>>", load)
+        ttk.Button(option_frame, text="刷新", style='Dark.TButton', command=load).pack(side=tk.RIGHT, padx=5)
+        
+        heatmap = HeatmapCanvas(main_frame, on_hover=on_hover, on_open=self.jump_to_date)
+        heatmap.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Button(main_frame, text="关闭", command=popup.destroy, style='Dark.TButton').pack(side=tk.RIGHT, pady=5)
+        
+        load()
+    
+    def load_heatmap_counts(self, start_year, end_year):
+        """在后台线程中取出热力图数据（首次使用时各一次分组查询，之后直接读内存）"""
+        begin = datetime.datetime.now()
+        counts = self.daily_counts.between(datetime.date(start_year, 1, 1), datetime.date(end_year, 12, 31))
+        elapsed = (datetime.datetime.now() - begin).total_seconds() * 1000
+        return counts, elapsed
+    
+    def load_all_tags(self, tree, pager=None):
+        """
+        按当前的搜索条件和排序重新加载标签列表（第一页在后台线程中查询）
+        
+        Args:
+            pager: 新的分页器，为None时沿用当前的条件和排序
+        """
+        old_pager = tree.tag_pager
+        # 中断上一次尚未完成的查询，其结果也不会再显示
+        old_pager.interrupt()
+        tree.tag_pager = pager if pager is not None else old_pager.copy()
+        tree.tag_page_pending = False
+        tree.delete(*tree.get_children())
+        self.load_more_tags(tree)
+    
+    def load_more_tags(self, tree):
+        """在后台线程中查询下一页，完成后追加到列表"""
+        pager = tree.tag_pager
+        if pager.exhausted or tree.tag_page_pending:
+            return
+        tree.tag_page_pending = True
+        
+        def show_page(rows):
+            # 列表已关闭或条件已改变时丢弃
+            if not tree.winfo_exists() or tree.tag_pager is not pager:
+                return
+            tree.tag_page_pending = False
+            # 不足一屏时，列表的滚动回调会继续请求下一页
+            for row in rows:
+                tree.insert("", tk.END, values=self.format_tag_row(row))
+        
+        def on_error(e):
+            if not tree.winfo_exists() or tree.tag_pager is not pager:
+                return
+            tree.tag_page_pending = False
+            print(f"加载标签出错: {e}")
+        
+        self.search_service.submit(pager.next_page, callback=show_page, errback=on_error)
+    
+    def on_tag_list_scroll(self, tree, scrollbar, first, last):
+        """滚动到接近底部时加载下一页"""
+        scrollbar.set(first, last)
+        if float(last) > 0.9:
+            self.load_more_tags(tree)
+    
+    def sort_tag_list(self, tree):
+        """切换按日期升序/降序"""
+        pager = tree.tag_pager.copy()
+        pager.set_order(not pager.descending)
+        tree.heading("日期", text="日期 ▼" if pager.descending else "日期 ▲")
+        self.load_all_tags(tree, pager)
+    
+    def format_tag_row(self, row):
+        """把分页查询的一行转换为列表中显示的值"""
+        tag_id, date_str, tag_text, tag_color, reminder_time, repeat_type, repeat_value = row
+        repeat_type = repeat_type or "none"
+        tag_text = tag_text or ""
         
         # 重复类型映射
         repeat_type_map = {
@@ -1817,188 +2328,70 @@ class CalendarApp:
             "lunar_yearly": "每年(农历)"
         }
         
-        # 填充数据
-        for row in cursor.fetchall():
-            date_str = row[0]
-            tag_text = row[1]
-            tag_color = row[2]
-            reminder_time = row[3]
-            repeat_type = row[4] if row[4] else "none"
-            repeat_value = row[5]
-            
-            # 如果标签内容有多行，只显示第一行
-            # 如果第一行内容太长，截断显示
-            first_line = tag_text.split('\n')[0] if '\n' in tag_text else tag_text
-            if len(first_line) > 50:
-                display_text = first_line[:50] + "..."
-            else:
-                display_text = first_line
-            
-            # 如果存在对应的中文名称，则显示中文名称
-            if tag_color in self.reverse_color_map:
-                color_name = self.reverse_color_map[tag_color]
-            else:
-                color_name = tag_color
-            
-            # 格式化提醒信息
-            reminder_info = "无"
-            if reminder_time != "无":
-                reminder_info = f"{reminder_time} ({repeat_type_map.get(repeat_type, '不重复')})"
-                
-                # 添加重复值信息
-                if repeat_type == "weekly" and repeat_value:
-                    weekday_names = {"0": "周日", "1": "周一", "2": "周二", "3": "周三", 
-                                    "4": "周四", "5": "周五", "6": "周六"}
-                    reminder_info += f" {weekday_names.get(repeat_value, '')}"
-                elif repeat_type == "monthly" and repeat_value:
-                    reminder_info += f" {repeat_value}日"
-                elif repeat_type in ["yearly", "lunar_yearly"] and repeat_value:
-                    try:
-                        month, day = repeat_value.split("-")
-                        reminder_info += f" {month}月{day}日"
-                    except:
-                        pass
-            
-            tree.insert("", tk.END, values=(date_str, display_text, color_name, reminder_info))
-        
-        conn.close()
-    
-    def search_tags(self, tree, search_text, search_type):
-        """搜索标签"""
-        # 清空现有数据
-        for item in tree.get_children():
-            tree.delete(item)
-        
-        if not search_text.strip():
-            self.load_all_tags(tree)
-            return
+        # 如果标签内容有多行，只显示第一行
+        # 如果第一行内容太长，截断显示
+        first_line = tag_text.split('\n')[0] if '\n' in tag_text else tag_text
+        if len(first_line) > 50:
+            display_text = first_line[:50] + "..."
+        else:
+            display_text = first_line
         
-        # 获取所有标签
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 检查reminders表中是否有repeat_type和repeat_value列
-        cursor.execute("PRAGMA table_info(reminders)")
-        columns = [column[1] for column in cursor.fetchall()]
-        has_repeat_columns = 'repeat_type' in columns and 'repeat_value' in columns
-        
-        # 根据搜索类型构建查询
-        if search_type == "内容":
-            if has_repeat_columns:
-                query = """
-                SELECT t.date, t.tag, t.color, 
-                       CASE WHEN r.id IS NULL THEN '无' ELSE r.time END as reminder_time,
-                       r.repeat_type, r.repeat_value
-                FROM tags t
-                LEFT JOIN reminders r ON t.date = r.date AND r.is_active = 1
-                WHERE t.tag LIKE ?
-                ORDER BY t.date DESC
-                """
-            else:
-                query = """
-                SELECT t.date, t.tag, t.color, 
-                       CASE WHEN r.id IS NULL THEN '无' ELSE r.time END as reminder_time,
-                       'none' as repeat_type, NULL as repeat_value
-                FROM tags t
-                LEFT JOIN reminders r ON t.date = r.date AND r.is_active = 1
-                WHERE t.tag LIKE ?
-                ORDER BY t.date DESC
-                """
-            cursor.execute(query, (f"%{search_text}%",))
-        elif search_type == "日期":
-            if has_repeat_columns:
-                query = """
-                SELECT t.date, t.tag, t.color, 
-                       CASE WHEN r.id IS NULL THEN '无' ELSE r.time END as reminder_time,
-                       r.repeat_type, r.repeat_value
-                FROM tags t
-                LEFT JOIN reminders r ON t.date = r.date AND r.is_active = 1
-                WHERE t.date LIKE ?
-                ORDER BY t.date DESC
-                """
-            else:
-                query = """
-                SELECT t.date, t.tag, t.color, 
-                       CASE WHEN r.id IS NULL THEN '无' ELSE r.time END as reminder_time,
-                       'none' as repeat_type, NULL as repeat_value
-                FROM tags t
-                LEFT JOIN reminders r ON t.date = r.date AND r.is_active = 1
-                WHERE t.date LIKE ?
-                ORDER BY t.date DESC
-                """
-            cursor.execute(query, (f"%{search_text}%",))
-        elif search_type == "颜色":
-            # 先尝试查找颜色名称
-            color_code = None
-            for name, code in self.color_map.items():
-                if search_text.lower() in name.lower():
-                    color_code = code
-                    break
-            
-            if not color_code:
-                # 如果不是颜色名称，则直接使用输入的颜色代码
-                color_code = search_text
-            
-            if has_repeat_columns:
-                query = """
-                SELECT t.date, t.tag, t.color, 
-                       CASE WHEN r.id IS NULL THEN '无' ELSE r.time END as reminder_time,
-                       r.repeat_type, r.repeat_value
-                FROM tags t
-                LEFT JOIN reminders r ON t.date = r.date AND r.is_active = 1
-                WHERE t.color = ?
-                ORDER BY t.date DESC
-                """
-            else:
-                query = """
-                SELECT t.date, t.tag, t.color, 
-                       CASE WHEN r.id IS NULL THEN '无' ELSE r.time END as reminder_time,
-                       'none' as repeat_type, NULL as repeat_value
-                FROM tags t
-                LEFT JOIN reminders r ON t.date = r.date AND r.is_active = 1
-                WHERE t.color = ?
-                ORDER BY t.date DESC
-                """
-            cursor.execute(query, (color_code,))
+        # 如果存在对应的中文名称，则显示中文名称
+        if tag_color in self.reverse_color_map:
+            color_name = self.reverse_color_map[tag_color]
         else:
-            # 如果没有找到颜色名称，尝试直接匹配颜色代码
-            query = """
-            SELECT t.date, t.tag, t.color, 
-                   CASE WHEN r.id IS NULL THEN '无' ELSE r.time END as reminder_time
-            FROM tags t
-            LEFT JOIN reminders r ON t.date = r.date AND r.is_active = 1
-            WHERE t.color LIKE ?
-            ORDER BY t.date DESC
-            """
-            cursor.execute(query, (f"%{search_text}%",))
-        
-        # 填充数据
-        for row in cursor.fetchall():
-            date_str = row[0]
-            tag_text = row[1]
-            tag_color = row[2]
-            reminder_time = row[3]
-            
-            # 如果标签内容太长，截断显示
-            if len(tag_text) > 50:
-                display_text = tag_text[:50] + "..."
-            else:
-                display_text = tag_text
-            
-            # 如果存在对应的中文名称，则显示中文名称
-            if tag_color in self.reverse_color_map:
-                color_name = self.reverse_color_map[tag_color]
-            else:
-                color_name = tag_color
-            
-            tree.insert("", tk.END, values=(date_str, display_text, color_name, reminder_time))
+            color_name = tag_color
+        
+        # 格式化提醒信息
+        reminder_info = "无"
+        if reminder_time is not None:
+            reminder_info = f"{reminder_time} ({repeat_type_map.get(repeat_type, '不重复')})"
+            
+            # 添加重复值信息
+            if repeat_type == "weekly" and repeat_value:
+                weekday_names = {"0": "周日", "1": "周一", "2": "周二", "3": "周三", 
+                                "4": "周四", "5": "周五", "6": "周六"}
+                reminder_info += f" {weekday_names.get(repeat_value, '')}"
+            elif repeat_type == "monthly" and repeat_value:
+                reminder_info += f" {repeat_value}日"
+            elif repeat_type in ["yearly", "lunar_yearly"] and repeat_value:
+                try:
+                    month, day = repeat_value.split("-")
+                    reminder_info += f" {month}月{day}日"
+                except:
+                    pass
         
-        conn.close()
+        return (date_str, display_text, color_name, reminder_info)
+    
+    def search_tags(self, tree, search_text, search_type):
+        """搜索标签（条件在SQL中过滤，在后台线程中分页加载）"""
+        # 直接搜索时取消尚未执行的防抖搜索
+        job = getattr(tree, "search_job", None)
+        if job is not None:
+            self.root.after_cancel(job)
+            tree.search_job = None
+        
+        pager = tree.tag_pager.copy()
+        pager.set_filter(*tag_filter(search_type, search_text, self.color_map, self.full_text_search))
+        self.load_all_tags(tree, pager)
+    
+    def schedule_tag_search(self, tree, search_var, search_type_var):
+        """边输入边搜索：停止输入一段时间后才执行，期间的每次按键只会重新计时"""
+        job = getattr(tree, "search_job", None)
+        if job is not None:
+            self.root.after_cancel(job)
+        
+        def run():
+            tree.search_job = None
+            if tree.winfo_exists():
+                self.search_tags(tree, search_var.get(), search_type_var.get())
+        
+        tree.search_job = self.root.after(TAG_SEARCH_DELAY_MS, run)
     
     def reset_tag_search(self, tree, search_var):
         """重置标签搜索"""
         search_var.set("")
-        self.load_all_tags(tree)
+        self.search_tags(tree, "", "内容")
     
     def edit_tag_from_list(self, tree):
         """从列表编辑标签"""
@@ -2030,7 +2423,7 @@ class CalendarApp:
             year = int(self.year_var.get())
             if 1900 <= year <= 2100:
                 self.selected_year = year
-                self.update_calendar()
+                self.schedule_render()
             else:
                 messagebox.showwarning("警告", "年份必须在1900-2100之间！")
                 self.year_var.set(str(self.selected_year))
@@ -2044,7 +2437,7 @@ class CalendarApp:
             month = int(self.month_var.get())
             if 1 <= month <= 12:
                 self.selected_month = month
-                self.update_calendar()
+                self.schedule_render()
             else:
                 messagebox.showwarning("警告", "月份必须在1-12之间！")
                 self.month_var.set(str(self.selected_month))
@@ -2056,13 +2449,13 @@ class CalendarApp:
         """上一年"""
         self.selected_year -= 1
         self.year_var.set(str(self.selected_year))
-        self.update_calendar()
+        self.schedule_render()
     
     def next_year(self):
         """下一年"""
         self.selected_year += 1
         self.year_var.set(str(self.selected_year))
-        self.update_calendar()
+        self.schedule_render()
     
     def prev_month(self):
         """上一月"""
@@ -2074,7 +2467,7 @@ class CalendarApp:
             self.selected_month -= 1
         
         self.month_var.set(str(self.selected_month))
-        self.update_calendar()
+        self.schedule_render()
     
     def next_month(self):
         """下一月"""
@@ -2086,11 +2479,12 @@ class CalendarApp:
             self.selected_month += 1
         
         self.month_var.set(str(self.selected_month))
-        self.update_calendar()
+        self.schedule_render()
     
     def go_to_today(self):
         """返回今天"""
         today = datetime.datetime.now()
+        self.cancel_prefetch()
         self.selected_year = today.year
         self.selected_month = today.month
         self.selected_day = today.day
@@ -2165,6 +2559,15 @@ class CalendarApp:
         """完全退出应用程序"""
         if TRAY_AVAILABLE and hasattr(self, 'icon'):
             self.icon.stop()
+        # 停止异步农历服务并关闭常驻的lunar.js工作进程
+        self.lunar_service.shutdown()
+        self.search_service.shutdown()
+        if self.lunar_providers is not None:
+            self.lunar_providers.close()
+        if hasattr(self, 'lunar_bridge'):
+            self.lunar_bridge.close()
+        # 关闭本线程的长期数据库连接，WAL内容写回主数据库文件
+        db_connection.close_thread_connections()
         self.root.destroy()
         sys.exit(0)
         
@@ -2211,35 +2614,22 @@ class CalendarApp:
         
         # 如果支持农历，获取今天的农历月-日
         lunar_month_day_str = ""
-        if LUNAR_AVAILABLE:
+        provider = self.get_lunar_provider(today.year)
+        if provider is not None:
             try:
-                # 将datetime.date转换为datetime.datetime，提供默认时间
-                today_datetime = datetime.datetime(today.year, today.month, today.day)
-                solar = Solar.fromDate(today_datetime)
-                lunar = Lunar.fromSolar(solar)
-                lunar_month = lunar.getMonth()
-                lunar_day = lunar.getDay()
-                lunar_month_day_str = f"{lunar_month:02d}-{lunar_day:02d}"
+                lunar = provider.get_lunar_day(today.year, today.month, today.day)
+                # 闰月使用负数月份
+                lunar_month = -lunar.month if lunar.is_leap else lunar.month
+                lunar_month_day_str = f"{lunar_month:02d}-{lunar.day:02d}"
             except Exception as e:
                 print(f"农历转换错误: {e}")
         
-        # 连接数据库查询提醒
-        conn = None
+        # 查询提醒
         try:
-            conn = sqlite3.connect(self.db_path, timeout=10)  # 添加超时设置
-            cursor = conn.cursor()
-            
-            # 查询所有活跃的提醒
-            cursor.execute("""
-            SELECT id, date, time, message, repeat_type, repeat_value 
-            FROM reminders 
-            WHERE is_active = 1
-            """)
-            
             reminders_to_show = []
             
-            for row in cursor.fetchall():
-                reminder_id, date_str, time_str, message, repeat_type, repeat_value = row
+            # 查询所有活跃的提醒
+            for reminder_id, date_str, time_str, message, _, repeat_type, repeat_value in self.reminder_repo.active():
                 
                 should_remind = False
                 date_to_display_in_reminder = date_str # 默认为原始提醒日期
@@ -2305,9 +2695,6 @@ class CalendarApp:
                 
         except sqlite3.Error as e:
             print(f"检查提醒时出错: {e}")
-        finally:
-            if conn:
-                conn.close()
     
     def show_reminders(self, reminders):
         """显示提醒对话框，并更新一次性提醒的状态"""
@@ -2341,21 +2728,13 @@ class CalendarApp:
         scrollbar.config(command=reminder_list.yview)
         
         # 添加提醒项并处理一次性提醒
-        conn = None
+        for reminder in reminders:
+            reminder_list.insert(tk.END, f"{reminder['time']} - {reminder['message']} ({reminder['date']})")
         try:
-            conn = sqlite3.connect(self.db_path, timeout=10)
-            cursor = conn.cursor()
-            for reminder in reminders:
-                reminder_list.insert(tk.END, f"{reminder['time']} - {reminder['message']} ({reminder['date']})")
-                # 如果是一次性提醒，则将其标记为非活动
-                if reminder['repeat_type'] == 'none':
-                    cursor.execute("UPDATE reminders SET is_active = 0 WHERE id = ?", (reminder['id'],))
-            conn.commit()
+            # 一次性提醒标记为非活动
+            self.reminder_repo.deactivate([reminder['id'] for reminder in reminders if reminder['repeat_type'] == 'none'])
         except sqlite3.Error as e:
             print(f"更新提醒状态时出错: {e}")
-        finally:
-            if conn:
-                conn.close()
         
         # 添加关闭按钮
         ttk.Button(frame, text="关闭", command=reminder_window.destroy, style='Dark.TButton').pack(pady=10)
@@ -2474,6 +2853,16 @@ class CalendarApp:
         ttk.Button(history_btn_frame, text="清空", command=self.clear_all_sessions, 
                   style='Dark.TButton').pack(side=tk.LEFT, padx=2)
         
+        # 聊天记录搜索（边输入边搜索，结果按相关度排序）
+        chat_search_frame = ttk.Frame(history_frame, style='Dark.TFrame')
+        chat_search_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        ttk.Label(chat_search_frame, text="搜索:", style='Dark.TLabel').pack(side=tk.LEFT)
+        self.chat_search_var = tk.StringVar()
+        ttk.Entry(chat_search_frame, textvariable=self.chat_search_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.chat_search_job = None
+        self.chat_search_var.trace_add("write", lambda *args: self.schedule_chat_search())
+        
         # 历史对话列表
         self.session_tree = ttk.Treeview(history_frame, columns=("时间",), show="tree headings", height=8, selectmode="extended")
         self.session_tree.heading("#0", text="对话标题")
@@ -2596,17 +2985,11 @@ class CalendarApp:
             self.config_tree.delete(item)
 
         # 从数据库加载配置
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT name, base_uri, model_name, temperature, is_default FROM llm_configs ORDER BY is_default DESC, name")
-
-        for row in cursor.fetchall():
-            name, base_uri, model_name, temperature, is_default = row
+        for config in self.llm_config_repo.all():
             # 如果是默认配置，在名称前添加标记
-            display_name = f"★ {name}" if is_default else name
-            self.config_tree.insert("", tk.END, values=(display_name, base_uri, model_name, temperature, "标准"))
-
-        conn.close()
+            display_name = f"★ {config.name}" if config.is_default else config.name
+            self.config_tree.insert("", tk.END, values=(display_name, config.base_uri, config.model_name,
+                                                        config.temperature, "标准"))
     
     def add_llm_config(self):
         """添加LLM配置"""
@@ -2684,21 +3067,9 @@ class CalendarApp:
                 messagebox.showwarning("警告", "请填写所有必填字段！")
                 return
             
-            # 保存到数据库
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
+            # 保存到数据库（设为默认时会清除其他默认配置）
             try:
-                if is_default:
-                    # 如果设为默认，先清除其他默认配置
-                    cursor.execute("UPDATE llm_configs SET is_default = 0")
-                
-                cursor.execute("""
-                INSERT INTO llm_configs (name, base_uri, model_name, api_key, temperature, is_default)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """, (name, uri, model, key, temp, 1 if is_default else 0))
-                
-                conn.commit()
+                self.llm_config_repo.add(name, uri, model, key, temp, is_default)
                 messagebox.showinfo("成功", "配置已保存！")
                 config_dialog.destroy()
                 self.load_llm_configs()
@@ -2707,8 +3078,6 @@ class CalendarApp:
                 messagebox.showerror("错误", "配置名称已存在！")
             except Exception as e:
                 messagebox.showerror("错误", f"保存配置时出错: {e}")
-            finally:
-                conn.close()
         
         ttk.Button(button_frame, text="保存", command=save_config, style='Dark.TButton').pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="取消", command=config_dialog.destroy, style='Dark.TButton').pack(side=tk.LEFT, padx=5)
@@ -2725,17 +3094,13 @@ class CalendarApp:
         config_name = values[0].replace("★ ", "")
         
         # 从数据库获取配置详情
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT base_uri, model_name, api_key, temperature, is_default FROM llm_configs WHERE name = ?", (config_name,))
-        result = cursor.fetchone()
-        conn.close()
-        
-        if not result:
+        config = self.llm_config_repo.get(config_name)
+        if not config:
             messagebox.showerror("错误", "配置不存在！")
             return
         
-        base_uri, model_name, api_key, temperature, is_default = result
+        base_uri, model_name, api_key = config.base_uri, config.model_name, config.api_key
+        temperature, is_default = config.temperature, config.is_default
         
         # 创建编辑对话框
         edit_dialog = tk.Toplevel(self.root)
@@ -2805,29 +3170,15 @@ class CalendarApp:
                 messagebox.showwarning("警告", "请填写所有必填字段！")
                 return
             
-            # 保存到数据库
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
+            # 保存到数据库（设为默认时会清除其他默认配置）
             try:
-                if is_default:
-                    # 如果设为默认，先清除其他默认配置
-                    cursor.execute("UPDATE llm_configs SET is_default = 0")
-                
-                cursor.execute("""
-                UPDATE llm_configs SET base_uri = ?, model_name = ?, api_key = ?, temperature = ?, is_default = ?
-                WHERE name = ?
-                """, (uri, model, key, temp, 1 if is_default else 0, config_name))
-                
-                conn.commit()
+                self.llm_config_repo.update(config_name, uri, model, key, temp, is_default)
                 messagebox.showinfo("成功", "配置已更新！")
                 edit_dialog.destroy()
                 self.load_llm_configs()
                 
             except Exception as e:
                 messagebox.showerror("错误", f"更新配置时出错: {e}")
-            finally:
-                conn.close()
         
         ttk.Button(button_frame, text="保存", command=save_config, style='Dark.TButton').pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="取消", command=edit_dialog.destroy, style='Dark.TButton').pack(side=tk.LEFT, padx=5)
@@ -2844,18 +3195,12 @@ class CalendarApp:
         config_name = values[0].replace("★ ", "")
         
         if messagebox.askyesno("确认", f"确定要删除配置 '{config_name}' 吗？"):
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             try:
-                cursor.execute("DELETE FROM llm_configs WHERE name = ?", (config_name,))
-                conn.commit()
+                self.llm_config_repo.delete(config_name)
                 messagebox.showinfo("成功", "配置已删除！")
                 self.load_llm_configs()
             except Exception as e:
                 messagebox.showerror("错误", f"删除配置时出错: {e}")
-            finally:
-                conn.close()
     
     def set_default_llm_config(self):
         """设置默认LLM配置"""
@@ -2868,37 +3213,24 @@ class CalendarApp:
         values = self.config_tree.item(selected_item[0], "values")
         config_name = values[0].replace("★ ", "")
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            # 清除所有默认配置
-            cursor.execute("UPDATE llm_configs SET is_default = 0")
-            # 设置选中的配置为默认
-            cursor.execute("UPDATE llm_configs SET is_default = 1 WHERE name = ?", (config_name,))
-            conn.commit()
+            # 清除所有默认配置，设置选中的配置为默认
+            self.llm_config_repo.set_default(config_name)
             messagebox.showinfo("成功", f"已设置 '{config_name}' 为默认配置！")
             self.load_llm_configs()
         except Exception as e:
             messagebox.showerror("错误", f"设置默认配置时出错: {e}")
-        finally:
-            conn.close()
     
     def get_default_llm_config(self):
         """获取默认LLM配置"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT name, base_uri, model_name, api_key, temperature FROM llm_configs WHERE is_default = 1")
-        result = cursor.fetchone()
-        conn.close()
-        
-        if result:
+        config = self.llm_config_repo.default()
+        if config:
             return {
-                'name': result[0],
-                'base_uri': result[1],
-                'model_name': result[2],
-                'api_key': result[3],
-                'temperature': result[4]
+                'name': config.name,
+                'base_uri': config.base_uri,
+                'model_name': config.model_name,
+                'api_key': config.api_key,
+                'temperature': config.temperature
             }
         return None
     
@@ -2933,30 +3265,6 @@ class CalendarApp:
         current_time = now.strftime("%H:%M:%S")
         current_weekday = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"][now.weekday()]
         
-        # 获取农历信息（如果可用）
-        lunar_info = ""
-        if LUNAR_AVAILABLE:
-            try:
-                if LUNAR_PYTHON_AVAILABLE:
-                    from lunar_python import Lunar, Solar
-                    solar = Solar.fromYmd(now.year, now.month, now.day)
-                    lunar = Lunar.fromSolar(solar)
-                    lunar_month = lunar.getMonthInChinese()
-                    lunar_day = lunar.getDayInChinese()
-                    lunar_info = f"农历{lunar_month}月{lunar_day}"
-                elif LUNAR_JS_AVAILABLE and LUNAR_JS_INTEGRATION_AVAILABLE:
-                    if hasattr(self, 'lunar_bridge'):
-                        lunar_month = self.lunar_bridge.get_lunar_month(now.year, now.month, now.day)
-                        lunar_day = self.lunar_bridge.get_lunar_day(now.year, now.month, now.day)
-                        lunar_info = f"农历{lunar_month}月{lunar_day}"
-            except Exception:
-                lunar_info = ""
-        
-        # 构建包含时间信息的系统提示
-        time_context = f"当前时间是：{current_date} {current_weekday} {current_time}"
-        if lunar_info:
-            time_context += f"，{lunar_info}"
-        
         # 保存用户消息到数据库
         self.save_chat_message("user", message)
         
@@ -2975,9 +3283,34 @@ class CalendarApp:
         self.chat_text.configure(state="disabled")
         self.chat_text.see(tk.END)
         
-        # 在新线程中发送请求，包含时间上下文和MCP工具
-        threading.Thread(target=self.call_llm_api_stream_with_time_and_mcp, 
-                        args=(message, config, time_context), daemon=True).start()
+        def start_request(lunar_info):
+            # 构建包含时间信息的系统提示
+            time_context = f"当前时间是：{current_date} {current_weekday} {current_time}"
+            if lunar_info:
+                time_context += f"，{lunar_info}"
+            upcoming_info = self.get_upcoming_markers_text(now.date())
+            if upcoming_info:
+                time_context += f"，{upcoming_info}"
+            
+            # 在新线程中发送请求，包含时间上下文和MCP工具
+            threading.Thread(target=self.call_llm_api_stream_with_time_and_mcp, 
+                            args=(message, config, time_context), daemon=True).start()
+        
+        # 农历信息可能需要调用lunar.js，在后台获取后再发送请求
+        self.lunar_service.submit(self.get_lunar_date_text, now, callback=start_request,
+                                  errback=lambda e: start_request(""))
+    
+    def get_lunar_date_text(self, now):
+        """获取“农历X月Y”文本（不可用时返回空字符串），可能调用lunar.js"""
+        lunar_info = ""
+        provider = self.get_lunar_provider(now.year)
+        if provider is not None:
+            try:
+                lunar = provider.get_lunar_day(now.year, now.month, now.day)
+                lunar_info = f"农历{lunar.month_in_chinese}月{lunar.day_in_chinese}"
+            except Exception:
+                lunar_info = ""
+        return lunar_info
     
     def call_llm_api_stream(self, message, config):
         """调用LLM API（流式）"""
@@ -2988,51 +3321,43 @@ class CalendarApp:
         current_weekday = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"][now.weekday()]
         
         # 获取农历信息（如果可用）
-        lunar_info = ""
-        if LUNAR_AVAILABLE:
-            try:
-                if LUNAR_PYTHON_AVAILABLE:
-                    from lunar_python import Lunar, Solar
-                    solar = Solar.fromYmd(now.year, now.month, now.day)
-                    lunar = Lunar.fromSolar(solar)
-                    lunar_month = lunar.getMonthInChinese()
-                    lunar_day = lunar.getDayInChinese()
-                    lunar_info = f"农历{lunar_month}月{lunar_day}"
-                elif LUNAR_JS_AVAILABLE and LUNAR_JS_INTEGRATION_AVAILABLE:
-                    if hasattr(self, 'lunar_bridge'):
-                        lunar_month = self.lunar_bridge.get_lunar_month(now.year, now.month, now.day)
-                        lunar_day = self.lunar_bridge.get_lunar_day(now.year, now.month, now.day)
-                        lunar_info = f"农历{lunar_month}月{lunar_day}"
-            except Exception:
-                lunar_info = ""
+        lunar_info = self.get_lunar_date_text(now)
         
         # 构建包含时间信息的系统提示
         time_context = f"当前时间是：{current_date} {current_weekday} {current_time}"
         if lunar_info:
             time_context += f"，{lunar_info}"
+        upcoming_info = self.get_upcoming_markers_text(now.date())
+        if upcoming_info:
+            time_context += f"，{upcoming_info}"
         
         self.call_llm_api_stream_with_time(message, config, time_context)
     
+    def parse_web_search_query(self, message):
+        """
+        联网搜索请求的关键词，不是联网搜索时返回None
+        
+        "搜索记录：关键词"是标签和聊天记录的全文搜索，交给MCP工具处理，不走联网搜索
+        """
+        if message.startswith(CALENDAR_SEARCH_COMMAND):
+            return None
+        # 支持多种搜索前缀格式
+        if message.startswith("搜索:"):
+            return message[3:].strip()
+        if message.startswith("搜索") and len(message) > 2:
+            return message[2:].strip()
+        if message.startswith("search:"):
+            return message[7:].strip()
+        if message.startswith("search") and len(message) > 5:
+            return message[5:].strip()
+        return None
+    
     def call_llm_api_stream_with_time_and_mcp(self, message, config, time_context):
         """调用LLM API（流式，包含时间信息和MCP工具）"""
         try:
             # 检查是否是搜索请求 - 支持多种格式
-            is_search_request = False
-            search_query = None
-            
-            # 支持多种搜索前缀格式
-            if message.startswith("搜索:"):
-                is_search_request = True
-                search_query = message[3:].strip()
-            elif message.startswith("搜索") and len(message) > 2:
-                is_search_request = True
-                search_query = message[2:].strip()
-            elif message.startswith("search:"):
-                is_search_request = True
-                search_query = message[7:].strip()
-            elif message.startswith("search") and len(message) > 5:
-                is_search_request = True
-                search_query = message[5:].strip()
+            search_query = self.parse_web_search_query(message)
+            is_search_request = search_query is not None
             
             print(f"原始消息: {message}")
             print(f"是否为搜索请求: {is_search_request}")
@@ -3144,6 +3469,8 @@ class CalendarApp:
         try:
             # 定义MCP工具调用的关键词和对应函数
             mcp_patterns = {
+                # 放在最前面：关键词中含有其他命令名称时也按全文搜索处理
+                CALENDAR_SEARCH_COMMAND: lambda query: mcp_manager.search_calendar_text(query) if query else "请提供搜索关键词",
                 "列出目录": lambda path: mcp_manager.list_directory(path or "."),
                 "查看文件": lambda path: mcp_manager.read_file(path) if path else "请提供文件路径",
                 "读取文件": lambda path: mcp_manager.read_file(path) if path else "请提供文件路径",
@@ -3162,7 +3489,7 @@ class CalendarApp:
                 if pattern in message:
                     try:
                         # 提取参数（简单实现）
-                        if pattern in ["列出目录", "查看文件", "读取文件", "搜索文件", "搜索"]:
+                        if pattern in ["列出目录", "查看文件", "读取文件", CALENDAR_SEARCH_COMMAND, "搜索文件", "搜索"]:
                             # 尝试从消息中提取路径或模式
                             import re
                             match = re.search(f"{pattern}[:：]\s*(.+)", message)
@@ -3180,6 +3507,10 @@ class CalendarApp:
                         else:
                             result = func()
                         
+                        # 可能修改数据库的工具：回到主线程使缓存的月份数据失效
+                        if pattern in MCP_WRITE_PATTERNS:
+                            self.root.after(0, self.on_external_data_change)
+                        
                         return f"使用MCP工具{pattern}的结果:\n{result}"
                     except Exception as e:
                         return f"使用MCP工具{pattern}时出错: {str(e)}"
@@ -3358,10 +3689,29 @@ class CalendarApp:
         self.chat_text.configure(state="disabled")
         self.chat_text.see(tk.END)
     
+    def get_upcoming_markers_text(self, date):
+        """生成“距下一个节气/节日还有N天”的提示文本"""
+        if not (LUNAR_TABLE_AVAILABLE and lunar_table.is_supported(date.year)):
+            return ""
+        try:
+            index = get_lunar_index()
+            parts = []
+            jie_qi = index.find_next(date, kinds=("jie_qi",), inclusive=True)
+            festival = index.find_next(date, kinds=("lunar_festival", "solar_festival"), inclusive=True)
+            for marker in (jie_qi, festival):
+                if marker is None:
+                    continue
+                days = (marker.date - date).days
+                parts.append(f"今天是{marker.name}" if days == 0 else f"距{marker.name}还有{days}天")
+            return "，".join(parts)
+        except Exception as e:
+            print(f"获取节气节日信息时出错: {e}")
+            return ""
+
     def get_detailed_lunar_context(self):
         """获取详细的农历信息上下文"""
         try:
-            if not (LUNAR_JS_AVAILABLE and LUNAR_JS_INTEGRATION_AVAILABLE):
+            if not self.almanac_available():
                 return ""
             
             # 获取当前日期
@@ -3371,49 +3721,10 @@ class CalendarApp:
             month = now.month
             day = now.day
             
-            # 创建临时JS文件获取完整农历信息
-            temp_js = os.path.join(os.path.dirname(os.path.abspath(__file__)), "temp_lunar_context.js")
-            with open(temp_js, "w", encoding="utf-8") as f:
-                f.write("const lunar = require('./lunar.js');\n")
-                f.write(f"const solar = lunar.Solar.fromYmd({year}, {month}, {day});\n")
-                f.write("const lunarObj = solar.getLunar();\n")
-                f.write("const result = {\n")
-                f.write("  lunar_info: lunarObj.toFullString(),\n")
-                f.write("  yi_ji: {\n")
-                f.write("    yi: lunarObj.getDayYi(),\n")
-                f.write("    ji: lunarObj.getDayJi()\n")
-                f.write("  },\n")
-                f.write("  animal: lunarObj.getAnimal(),\n")
-                f.write("  xiu: lunarObj.getXiu(),\n")
-                f.write("  zheng: lunarObj.getZheng(),\n")
-                f.write("  xiu_luck: lunarObj.getXiuLuck(),\n")
-                f.write("  peng_zu_gan: lunarObj.getPengZuGan(),\n")
-                f.write("  peng_zu_zhi: lunarObj.getPengZuZhi(),\n")
-                f.write("  day_position_xi: lunarObj.getDayPositionXi(),\n")
-                f.write("  day_position_xi_desc: lunarObj.getDayPositionXiDesc(),\n")
-                f.write("  day_position_yang_gui: lunarObj.getDayPositionYangGui(),\n")
-                f.write("  day_position_yang_gui_desc: lunarObj.getDayPositionYangGuiDesc(),\n")
-                f.write("  day_position_yin_gui: lunarObj.getDayPositionYinGui(),\n")
-                f.write("  day_position_yin_gui_desc: lunarObj.getDayPositionYinGuiDesc(),\n")
-                f.write("  day_position_fu: lunarObj.getDayPositionFu(),\n")
-                f.write("  day_position_fu_desc: lunarObj.getDayPositionFuDesc(),\n")
-                f.write("  day_position_cai: lunarObj.getDayPositionCai(),\n")
-                f.write("  day_position_cai_desc: lunarObj.getDayPositionCaiDesc(),\n")
-                f.write("  day_chong_desc: lunarObj.getDayChongDesc(),\n")
-                f.write("  day_sha: lunarObj.getDaySha(),\n")
-                f.write("  gong: lunarObj.getGong(),\n")
-                f.write("  shou: lunarObj.getShou()\n")
-                f.write("};\n")
-                f.write("console.log(JSON.stringify(result));")
-            
-            # 执行JS文件
-            result = subprocess.check_output(["node", temp_js], text=True, encoding="utf-8")
-            
-            # 删除临时文件
-            os.remove(temp_js)
-            
-            # 解析JSON结果
-            data = json.loads(result.strip())
+            # 从黄历缓存获取完整农历信息
+            data = self.almanac_cache.get(year, month, day)
+            if data is None:
+                return ""
             
             # 使用现有的generate_lunar_info_text方法格式生成文本
             date_str = f"{year}-{month:02d}-{day:02d}"
@@ -3742,31 +4053,70 @@ class CalendarApp:
 
     def load_chat_sessions(self):
         """加载历史对话列表"""
+        # 正在搜索时刷新搜索结果
+        if self.chat_search_var.get().strip():
+            self.search_chat_history()
+            return
+        
         # 清空现有数据
         for item in self.session_tree.get_children():
             self.session_tree.delete(item)
         
         # 从数据库加载会话
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, title, updated_at 
-            FROM chat_sessions 
-            ORDER BY updated_at DESC
-        """)
-        
-        for row in cursor.fetchall():
-            session_id, title, updated_at = row
-            # 格式化时间
+        for session in self.chat_repo.sessions():
+            self.session_tree.insert("", tk.END, text=session.title, values=(self.format_chat_time(session.updated_at),),
+                                     tags=(session.id,))
+    
+    def format_chat_time(self, value):
+        """会话列表中显示的时间"""
+        value = value or ""
+        try:
+            dt = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+            return dt.strftime("%m-%d %H:%M")
+        except ValueError:
+            return value[:16] if len(value) > 16 else value
+    
+    def schedule_chat_search(self):
+        """边输入边搜索聊天记录：停止输入一段时间后才执行"""
+        if self.chat_search_job is not None:
+            self.root.after_cancel(self.chat_search_job)
+        
+        def run():
+            self.chat_search_job = None
+            if self.session_tree.winfo_exists():
+                self.search_chat_history()
+        
+        self.chat_search_job = self.root.after(TAG_SEARCH_DELAY_MS, run)
+    
+    def search_chat_history(self):
+        """在后台线程中搜索聊天记录，结果显示在历史对话列表中（双击打开对应会话）"""
+        text = self.chat_search_var.get().strip()
+        if not text:
+            self.search_service.cancel("chat_search")
+            self.load_chat_sessions()
+            return
+        
+        def query():
+            conn = db_connection.connect(self.db_path)
             try:
-                dt = datetime.datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
-                formatted_time = dt.strftime("%m-%d %H:%M")
-            except:
-                formatted_time = updated_at[:16] if len(updated_at) > 16 else updated_at
-            
-            self.session_tree.insert("", tk.END, text=title, values=(formatted_time,), tags=(session_id,))
+                return search_chat_messages(conn, text, CHAT_SEARCH_LIMIT, self.full_text_search)
+            finally:
+                conn.close()
         
-        conn.close()
+        def show_results(rows):
+            # 对话框已关闭或关键词已改变时丢弃
+            if not self.session_tree.winfo_exists() or self.chat_search_var.get().strip() != text:
+                return
+            for item in self.session_tree.get_children():
+                self.session_tree.delete(item)
+            for message_id, session_id, title, role, timestamp, snippet in rows:
+                speaker = "您" if role == "user" else "AI"
+                label = f"{title or '未命名对话'} | {speaker}: {' '.join(snippet.split())}"
+                self.session_tree.insert("", tk.END, text=label, values=(self.format_chat_time(timestamp),),
+                                         tags=(session_id,))
+        
+        self.search_service.submit(query, callback=show_results,
+                                   errback=lambda e: print(f"搜索聊天记录出错: {e}"), channel="chat_search")
     
     def load_chat_session(self, event):
         """加载选中的聊天会话"""
@@ -3778,32 +4128,21 @@ class CalendarApp:
         session_id = self.session_tree.item(item, "tags")[0]
         
         # 从数据库加载会话消息
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT role, content 
-            FROM chat_messages 
-            WHERE session_id = ? 
-            ORDER BY timestamp
-        """, (session_id,))
-        
-        messages = cursor.fetchall()
-        conn.close()
+        messages = self.chat_repo.messages(session_id)
         
         # 更新当前会话
         self.current_session_id = session_id
-        self.current_messages = [{"role": role, "content": content} for role, content in messages]
+        self.current_messages = [{"role": msg.role, "content": msg.content} for msg in messages]
         
         # 显示消息
         self.chat_text.configure(state="normal")
         self.chat_text.delete("1.0", tk.END)
         
         for msg in messages:
-            role, content = msg
-            if role == "user":
-                self.chat_text.insert(tk.END, f"您: {content}\n", "user")
-            elif role == "assistant":
-                self.chat_text.insert(tk.END, f"AI助手: {content}\n", "ai")
+            if msg.role == "user":
+                self.chat_text.insert(tk.END, f"您: {msg.content}\n", "user")
+            elif msg.role == "assistant":
+                self.chat_text.insert(tk.END, f"AI助手: {msg.content}\n", "ai")
         
         self.chat_text.configure(state="disabled")
         self.chat_text.see(tk.END)
@@ -3813,36 +4152,13 @@ class CalendarApp:
         if not self.current_session_id:
             # 创建新会话
             title = content[:20] + "..." if len(content) > 20 else content
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO chat_sessions (title, created_at, updated_at) 
-                VALUES (?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-            """, (title,))
-            self.current_session_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            self.current_session_id = self.chat_repo.create_session(title)
             
             # 刷新会话列表
             self.load_chat_sessions()
         
-        # 保存消息
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO chat_messages (session_id, role, content) 
-            VALUES (?, ?, ?)
-        """, (self.current_session_id, role, content))
-        
-        # 更新会话时间
-        cursor.execute("""
-            UPDATE chat_sessions 
-            SET updated_at = CURRENT_TIMESTAMP 
-            WHERE id = ?
-        """, (self.current_session_id,))
-        
-        conn.commit()
-        conn.close()
+        # 保存消息并更新会话时间
+        self.chat_repo.add_message(self.current_session_id, role, content)
         
         # 更新当前消息列表
         self.current_messages.append({"role": role, "content": content})
@@ -3855,20 +4171,13 @@ class CalendarApp:
             return
         
         if messagebox.askyesno("确认删除", f"确定要删除选中的 {len(selection)} 个对话吗？"):
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            for item in selection:
-                session_id = self.session_tree.item(item, "tags")[0]
-                cursor.execute("DELETE FROM chat_sessions WHERE id = ?", (session_id,))
-                
-                # 如果删除的是当前会话，清空当前会话
-                if session_id == self.current_session_id:
-                    self.current_session_id = None
-                    self.current_messages = []
+            session_ids = [self.session_tree.item(item, "tags")[0] for item in selection]
+            self.chat_repo.delete_sessions(session_ids)
             
-            conn.commit()
-            conn.close()
+            # 如果删除的是当前会话，清空当前会话
+            if self.current_session_id in session_ids:
+                self.current_session_id = None
+                self.current_messages = []
             
             # 刷新会话列表
             self.load_chat_sessions()
@@ -3883,11 +4192,7 @@ class CalendarApp:
     def clear_all_sessions(self):
         """清空所有会话"""
         if messagebox.askyesno("确认清空", "确定要清空所有历史对话吗？此操作不可恢复！"):
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM chat_sessions")
-            conn.commit()
-            conn.close()
+            self.chat_repo.clear()
             
             # 清空当前会话
             self.current_session_id = None
@@ -3982,11 +4287,7 @@ class CalendarApp:
         def save_title():
             new_title = title_var.get().strip()
             if new_title:
-                conn = sqlite3.connect(self.db_path)
-                cursor = conn.cursor()
-                cursor.execute("UPDATE chat_sessions SET title = ? WHERE id = ?", (new_title, session_id))
-                conn.commit()
-                conn.close()
+                self.chat_repo.rename_session(session_id, new_title)
                 
                 # 刷新会话列表
                 self.load_chat_sessions()
@@ -4004,18 +4305,13 @@ class CalendarApp:
         session_id = self.session_tree.item(selected_item, "tags")[0]
         
         if messagebox.askyesno("确认删除", "确定要删除这个对话吗？"):
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM chat_sessions WHERE id = ?", (session_id,))
+            self.chat_repo.delete_sessions([session_id])
             
             # 如果删除的是当前会话，清空当前会话
             if session_id == self.current_session_id:
                 self.current_session_id = None
                 self.current_messages = []
             
-            conn.commit()
-            conn.close()
-            
             # 刷新会话列表
             self.load_chat_sessions()
             
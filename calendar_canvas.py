@@ -0,0 +1,253 @@
+# calendar_canvas.py
+# 单画布月视图：星期标题、日期格子、公历日期、农历、节日节气和标签标记全部画在一个tk.Canvas上，
+# 点击位置按几何坐标换算成日期，不再为每个格子创建控件和绑定事件
+
+import tkinter as tk
+
+# 默认使用画布视图的环境变量：CALENDAR_VIEW=canvas
+VIEW_ENV = "CALENDAR_VIEW"
+
+WEEKDAY_NAMES = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
+
+# 颜色与主窗口的ttk深色主题保持一致
+BACKGROUND = "#2b2b2b"
+SELECTED_BACKGROUND = "#4f4f4f"
+GRID_COLOR = "#808080"
+TEXT_COLOR = "white"
+WEEKEND_COLOR = "red"
+LUNAR_COLOR = "#cccccc"
+FESTIVAL_COLOR = "#FFA500"
+
+HEADER_HEIGHT = 24
+CELL_PADDING = 1
+TAG_RADIUS = 5
+
+# 切换月份时的滑动动画：帧数和每帧间隔（毫秒）
+TRANSITION_FRAMES = 8
+TRANSITION_INTERVAL = 15
+
+
+class CalendarCanvas:
+    """在单个Canvas上绘制的月视图"""
+
+    def __init__(self, parent, on_select, on_tag_click, on_right_click):
+        """
+        Args:
+            parent: 父容器
+            on_select: 左键点击日期时调用 on_select(day)
+            on_tag_click: 点击标签标记时调用 on_tag_click(day, color)
+            on_right_click: 右键点击日期时调用 on_right_click(day)
+        """
+        self.on_select = on_select
+        self.on_tag_click = on_tag_click
+        self.on_right_click = on_right_click
+
+        self.canvas = tk.Canvas(parent, bg=BACKGROUND, highlightthickness=0)
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Button-3>", self.on_right_button)
+
+        # 当前显示的内容
+        self.year = None
+        self.month = None
+        self.days = [0] * 42
+        self.lunar_texts = {}
+        self.month_tags = {}
+        self.selected_day = None
+        self.highlight = False
+        # 当前月份每天的格子矩形 {day: item_id}，用于只改选中高亮
+        self.cell_rects = {}
+
+        self.transition_job = None
+        # 动画中新月份的当前水平偏移
+        self.transition_offset = 0
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def pack_forget(self):
+        self.canvas.pack_forget()
+
+    def show(self, year, month, days, lunar_texts, month_tags, selected_day, highlight):
+        """
+        显示一个月
+
+        Args:
+            days: 42个格子对应的日期，0表示该格子不属于本月
+            lunar_texts: {day: "X月Y 节日,节气"}，后台查询未完成时可以为空
+            month_tags: {"YYYY-MM-DD": {"tag", "color"}}
+            selected_day: 选中的日期
+            highlight: 是否高亮选中的日期
+        """
+        previous = (self.year, self.month)
+        self.year, self.month = year, month
+        self.days = list(days)
+        self.lunar_texts = dict(lunar_texts)
+        self.month_tags = month_tags
+        self.selected_day = selected_day
+        self.highlight = highlight
+
+        # 切换到其他月份时滑入新的月份，同一月份内的刷新直接重绘
+        direction = 0
+        if previous[0] is not None and previous != (year, month):
+            direction = 1 if (year, month) > previous else -1
+        if direction and self.canvas.winfo_viewable():
+            self.slide(direction)
+        else:
+            self.redraw()
+
+    def set_selected(self, day, highlight):
+        """只修改新旧两个格子的背景来移动选中高亮"""
+        old = self.selected_day if self.highlight else None
+        self.selected_day = day
+        self.highlight = highlight
+        new = day if highlight else None
+        if old == new:
+            return
+        if old in self.cell_rects:
+            self.canvas.itemconfigure(self.cell_rects[old], fill=BACKGROUND)
+        if new in self.cell_rects:
+            self.canvas.itemconfigure(self.cell_rects[new], fill=SELECTED_BACKGROUND)
+
+    def set_lunar_texts(self, year, month, texts):
+        """后台农历查询完成后填入"""
+        if (year, month) != (self.year, self.month):
+            return
+        self.lunar_texts = dict(texts)
+        self.redraw()
+
+    def geometry(self):
+        """返回 (宽度, 高度, 格子宽度, 格子高度, 行数)"""
+        width = max(self.canvas.winfo_width(), 7)
+        height = max(self.canvas.winfo_height(), HEADER_HEIGHT + 6)
+        # 只按本月实际用到的行数划分高度
+        used = [index for index, day in enumerate(self.days) if day]
+        rows = used[-1] // 7 + 1 if used else 6
+        return width, height, width / 7, (height - HEADER_HEIGHT) / rows, rows
+
+    def redraw(self):
+        """按当前尺寸重绘全部内容"""
+        self.finish_transition()
+        self.canvas.delete("all")
+        self.draw_header()
+        self.draw_month(0, "month")
+
+    def draw_header(self):
+        width, height, cell_width, cell_height, rows = self.geometry()
+        for column, name in enumerate(WEEKDAY_NAMES):
+            self.canvas.create_text(
+                (column + 0.5) * cell_width, HEADER_HEIGHT / 2, text=name,
+                fill=WEEKEND_COLOR if column >= 5 else TEXT_COLOR, tags="header"
+            )
+
+    def draw_month(self, offset_x, tag):
+        """绘制日期格子，offset_x为水平偏移（用于滑动动画）"""
+        width, height, cell_width, cell_height, rows = self.geometry()
+        canvas = self.canvas
+        self.cell_rects = {}
+        for index, day in enumerate(self.days[:rows * 7]):
+            if not day:
+                continue
+            row, column = divmod(index, 7)
+            x0 = offset_x + column * cell_width + CELL_PADDING
+            y0 = HEADER_HEIGHT + row * cell_height + CELL_PADDING
+            x1 = offset_x + (column + 1) * cell_width - CELL_PADDING
+            y1 = HEADER_HEIGHT + (row + 1) * cell_height - CELL_PADDING
+            center_x = (x0 + x1) / 2
+
+            selected = self.highlight and day == self.selected_day
+            self.cell_rects[day] = canvas.create_rectangle(
+                x0, y0, x1, y1, outline=GRID_COLOR,
+                fill=SELECTED_BACKGROUND if selected else BACKGROUND, tags=tag
+            )
+            canvas.create_text(center_x, y0 + cell_height * 0.18, text=str(day), fill=TEXT_COLOR, tags=tag)
+
+            # 农历和节日节气分两行显示
+            lunar_text = self.lunar_texts.get(day, "")
+            lunar, _, festivals = lunar_text.partition(" ")
+            if lunar:
+                canvas.create_text(center_x, y0 + cell_height * 0.42, text=lunar, fill=LUNAR_COLOR,
+                                   font=("SimSun", 9), tags=tag)
+            if festivals:
+                canvas.create_text(center_x, y0 + cell_height * 0.62, text=festivals, fill=FESTIVAL_COLOR,
+                                   font=("SimSun", 8), width=max(cell_width - 4, 1), tags=tag)
+
+            tag_info = self.month_tags.get(f"{self.year}-{self.month:02d}-{day:02d}")
+            if tag_info:
+                dot_y = y0 + cell_height * 0.84
+                canvas.create_oval(center_x - TAG_RADIUS, dot_y - TAG_RADIUS,
+                                   center_x + TAG_RADIUS, dot_y + TAG_RADIUS,
+                                   fill=tag_info["color"], outline="", tags=tag)
+
+    def slide(self, direction):
+        """把旧月份滑出、新月份滑入"""
+        self.finish_transition()
+        width = self.geometry()[0]
+        self.canvas.itemconfigure("month", tags="outgoing")
+        self.canvas.delete("header")
+        self.draw_header()
+        self.draw_month(direction * width, "month")
+        self.transition_offset = direction * width
+        step = -direction * width / TRANSITION_FRAMES
+
+        def advance(frame):
+            self.canvas.move("month", step, 0)
+            self.canvas.move("outgoing", step, 0)
+            self.transition_offset += step
+            if frame < TRANSITION_FRAMES:
+                self.transition_job = self.canvas.after(TRANSITION_INTERVAL, advance, frame + 1)
+            else:
+                self.transition_job = None
+                self.canvas.delete("outgoing")
+
+        self.transition_job = self.canvas.after(TRANSITION_INTERVAL, advance, 1)
+
+    def finish_transition(self):
+        """立即结束正在进行的动画，新月份直接归位"""
+        if self.transition_job is not None:
+            self.canvas.after_cancel(self.transition_job)
+            self.transition_job = None
+            self.canvas.move("month", -self.transition_offset, 0)
+        self.transition_offset = 0
+        self.canvas.delete("outgoing")
+
+    def hit_test(self, x, y):
+        """
+        把坐标换算成日期
+
+        Returns:
+            (day, 是否点在标签标记上)，不在日期格子上时day为0
+        """
+        width, height, cell_width, cell_height, rows = self.geometry()
+        if y < HEADER_HEIGHT:
+            return 0, False
+        column = min(int(x // cell_width), 6)
+        row = int((y - HEADER_HEIGHT) // cell_height)
+        if row >= rows:
+            return 0, False
+        day = self.days[row * 7 + column]
+        if not day:
+            return 0, False
+
+        on_tag = False
+        if f"{self.year}-{self.month:02d}-{day:02d}" in self.month_tags:
+            dot_x = (column + 0.5) * cell_width
+            dot_y = HEADER_HEIGHT + row * cell_height + CELL_PADDING + cell_height * 0.84
+            on_tag = abs(x - dot_x) <= TAG_RADIUS + 3 and abs(y - dot_y) <= TAG_RADIUS + 3
+        return day, on_tag
+
+    def on_click(self, event):
+        self.finish_transition()
+        day, on_tag = self.hit_test(event.x, event.y)
+        if not day:
+            return
+        if on_tag:
+            date_str = f"{self.year}-{self.month:02d}-{day:02d}"
+            self.on_tag_click(day, self.month_tags[date_str]["color"])
+        else:
+            self.on_select(day)
+
+    def on_right_button(self, event):
+        day, on_tag = self.hit_test(event.x, event.y)
+        if day:
+            self.on_right_click(day)
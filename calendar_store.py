@@ -0,0 +1,298 @@
+# calendar_store.py
+# 数据访问层：标签、提醒、聊天记录和LLM配置的SQL集中在这里，日历界面和MCP服务共用。
+# SQL都是固定文本，在db_connection的长期连接上执行时sqlite3会复用已编译的语句（按SQL文本缓存），
+# 查询结果是不带实例字典的namedtuple记录，可以按字段名访问，也可以像原来的元组一样解包
+
+from collections import namedtuple
+
+import db_connection
+
+
+class Tag(namedtuple("Tag", ["id", "date", "tag", "color"])):
+    __slots__ = ()
+
+
+class Reminder(namedtuple("Reminder", ["id", "date", "time", "message", "is_active",
+                                       "repeat_type", "repeat_value"])):
+    __slots__ = ()
+
+
+class TagListRow(namedtuple("TagListRow", ["id", "date", "tag", "color", "reminder_time",
+                                           "repeat_type", "repeat_value"])):
+    """标签列表中的一行：标签及其关联的有效提醒（没有提醒时提醒字段为None）"""
+
+    __slots__ = ()
+
+
+class ChatSession(namedtuple("ChatSession", ["id", "title", "created_at", "updated_at"])):
+    __slots__ = ()
+
+
+class ChatMessage(namedtuple("ChatMessage", ["id", "session_id", "role", "content", "timestamp"])):
+    __slots__ = ()
+
+
+class LlmConfig(namedtuple("LlmConfig", ["id", "name", "base_uri", "model_name", "api_key",
+                                         "temperature", "is_default"])):
+    __slots__ = ()
+
+
+class _Repo:
+    """按需借用当前线程的数据库连接，每个方法结束时归还"""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+
+    def _fetch(self, record, sql, params=(), conn=None):
+        """执行查询，每行直接构造为record（不经过中间元组列表）"""
+        own = conn is None
+        if own:
+            conn = db_connection.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            make = record._make
+            cursor.row_factory = lambda cursor, row: make(row)
+            return cursor.execute(sql, params).fetchall()
+        finally:
+            if own:
+                conn.close()
+
+    def _fetch_one(self, record, sql, params=()):
+        rows = self._fetch(record, sql, params)
+        return rows[0] if rows else None
+
+    def _write(self, statements):
+        """
+        在一个事务中执行多条写语句
+
+        Args:
+            statements: [(sql, 参数), ...]，参数为列表时用executemany
+
+        Returns:
+            最后一条语句的lastrowid
+        """
+        conn = db_connection.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            for sql, params in statements:
+                if isinstance(params, list):
+                    cursor.executemany(sql, params)
+                else:
+                    cursor.execute(sql, params)
+            conn.commit()
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+
+class TagRepo(_Repo):
+    """标签"""
+
+    _SELECT = "SELECT id, date, tag, color FROM tags"
+
+    # 每个标签只关联一条有效提醒（id最小的），保证分页时每个标签只出现一次
+    _LIST_SELECT = """
+    SELECT t.id, t.date, t.tag, t.color, r.time, r.repeat_type, r.repeat_value
+    FROM tags t
+    LEFT JOIN reminders r ON r.id = (
+        SELECT id FROM reminders WHERE date = t.date AND is_active = 1 ORDER BY id LIMIT 1
+    )
+    """
+
+    def all(self, date=None):
+        """全部标签（按日期排序），或某一天的标签"""
+        if date:
+            return self._fetch(Tag, self._SELECT + " WHERE date = ?", (date,))
+        return self._fetch(Tag, self._SELECT + " ORDER BY date")
+
+    def for_date(self, date):
+        """某一天的标签，没有时返回None"""
+        return self._fetch_one(Tag, self._SELECT + " WHERE date = ? LIMIT 1", (date,))
+
+    def between(self, start, end):
+        """日期在 [start, end] 之间的标签（日期字符串比较）"""
+        return self._fetch(Tag, self._SELECT + " WHERE date BETWEEN ? AND ?", (start, end))
+
+    def page(self, filter_sql="", filter_params=(), after=None, descending=True, limit=200, conn=None):
+        """
+        标签列表的一页，按 (date, id) 排序
+
+        Args:
+            filter_sql: 额外的过滤条件（表别名为t）
+            after: 上一页最后一行的 (date, id)，为None时从第一页开始
+            conn: 调用方持有的连接（需要从其他线程中断查询时传入）
+
+        Returns:
+            [TagListRow, ...]
+        """
+        conditions = []
+        params = list(filter_params)
+        if filter_sql:
+            conditions.append(f"({filter_sql})")
+        if after is not None:
+            conditions.append("(t.date, t.id) < (?, ?)" if descending else "(t.date, t.id) > (?, ?)")
+            params.extend(after)
+
+        order = "DESC" if descending else "ASC"
+        sql = self._LIST_SELECT
+        if conditions:
+            sql += "WHERE " + " AND ".join(conditions) + "\n"
+        sql += f"ORDER BY t.date {order}, t.id {order} LIMIT ?"
+        params.append(limit)
+        return self._fetch(TagListRow, sql, params, conn)
+
+    def save(self, date, tag, color):
+        """保存某一天的标签：已有标签时更新，否则新建"""
+        conn = db_connection.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE tags SET tag = ?, color = ? WHERE date = ?", (tag, color, date))
+            if cursor.rowcount == 0:
+                cursor.execute("INSERT INTO tags (date, tag, color) VALUES (?, ?, ?)", (date, tag, color))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def delete_date(self, date):
+        """删除某一天的标签及该日期的提醒"""
+        self._write([
+            ("DELETE FROM tags WHERE date = ?", (date,)),
+            ("DELETE FROM reminders WHERE date = ?", (date,)),
+        ])
+
+
+class ReminderRepo(_Repo):
+    """提醒"""
+
+    _SELECT = "SELECT id, date, time, message, is_active, repeat_type, repeat_value FROM reminders"
+
+    def all(self, date=None):
+        """全部提醒（按日期和时间排序），或某一天的提醒"""
+        if date:
+            return self._fetch(Reminder, self._SELECT + " WHERE date = ?", (date,))
+        return self._fetch(Reminder, self._SELECT + " ORDER BY date, time")
+
+    def active(self):
+        """全部有效提醒"""
+        return self._fetch(Reminder, self._SELECT + " WHERE is_active = 1")
+
+    def active_for_date(self, date):
+        """某一天的有效提醒，没有时返回None"""
+        return self._fetch_one(Reminder, self._SELECT + " WHERE date = ? AND is_active = 1 LIMIT 1", (date,))
+
+    def deactivate(self, reminder_ids):
+        """把提醒标记为无效（一次性提醒弹出后调用）"""
+        reminder_ids = [(reminder_id,) for reminder_id in reminder_ids]
+        if reminder_ids:
+            self._write([("UPDATE reminders SET is_active = 0 WHERE id = ?", reminder_ids)])
+
+    def replace_for_date(self, date, time=None, message=None, repeat_type="none", repeat_value=None):
+        """删除某一天已有的提醒；time不为None时再添加一条新提醒"""
+        statements = [("DELETE FROM reminders WHERE date = ?", (date,))]
+        if time is not None:
+            statements.append((
+                "INSERT INTO reminders (date, time, message, is_active, repeat_type, repeat_value) "
+                "VALUES (?, ?, ?, 1, ?, ?)",
+                (date, time, message, repeat_type or "none", repeat_value)
+            ))
+        self._write(statements)
+
+
+class ChatRepo(_Repo):
+    """AI助手的聊天会话和消息"""
+
+    def sessions(self):
+        """全部会话，最近更新的在前"""
+        return self._fetch(
+            ChatSession, "SELECT id, title, created_at, updated_at FROM chat_sessions ORDER BY updated_at DESC"
+        )
+
+    def messages(self, session_id):
+        """会话中的全部消息，按时间排序"""
+        return self._fetch(
+            ChatMessage,
+            "SELECT id, session_id, role, content, timestamp FROM chat_messages "
+            "WHERE session_id = ? ORDER BY timestamp, id",
+            (session_id,)
+        )
+
+    def create_session(self, title):
+        """新建会话，返回会话id"""
+        return self._write([(
+            "INSERT INTO chat_sessions (title, created_at, updated_at) "
+            "VALUES (?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+            (title,)
+        )])
+
+    def add_message(self, session_id, role, content):
+        """保存一条消息并更新会话时间"""
+        self._write([
+            ("INSERT INTO chat_messages (session_id, role, content) VALUES (?, ?, ?)",
+             (session_id, role, content)),
+            ("UPDATE chat_sessions SET updated_at = CURRENT_TIMESTAMP WHERE id = ?", (session_id,)),
+        ])
+
+    def rename_session(self, session_id, title):
+        self._write([("UPDATE chat_sessions SET title = ? WHERE id = ?", (title, session_id))])
+
+    def delete_sessions(self, session_ids):
+        """删除会话及其消息（表上的外键级联在未开启foreign_keys时不生效）"""
+        session_ids = [(session_id,) for session_id in session_ids]
+        if session_ids:
+            self._write([
+                ("DELETE FROM chat_messages WHERE session_id = ?", session_ids),
+                ("DELETE FROM chat_sessions WHERE id = ?", session_ids),
+            ])
+
+    def clear(self):
+        """删除全部会话和消息"""
+        self._write([
+            ("DELETE FROM chat_messages", ()),
+            ("DELETE FROM chat_sessions", ()),
+        ])
+
+
+class LlmConfigRepo(_Repo):
+    """LLM模型配置"""
+
+    _SELECT = "SELECT id, name, base_uri, model_name, api_key, temperature, is_default FROM llm_configs"
+
+    def all(self):
+        """全部配置，默认配置在前"""
+        return self._fetch(LlmConfig, self._SELECT + " ORDER BY is_default DESC, name")
+
+    def get(self, name):
+        return self._fetch_one(LlmConfig, self._SELECT + " WHERE name = ?", (name,))
+
+    def default(self):
+        """默认配置，没有时返回None"""
+        return self._fetch_one(LlmConfig, self._SELECT + " WHERE is_default = 1 LIMIT 1")
+
+    def add(self, name, base_uri, model_name, api_key, temperature, is_default=False):
+        """新建配置，名称已存在时抛出sqlite3.IntegrityError"""
+        statements = [("UPDATE llm_configs SET is_default = 0", ())] if is_default else []
+        statements.append((
+            "INSERT INTO llm_configs (name, base_uri, model_name, api_key, temperature, is_default) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (name, base_uri, model_name, api_key, temperature, 1 if is_default else 0)
+        ))
+        self._write(statements)
+
+    def update(self, name, base_uri, model_name, api_key, temperature, is_default=False):
+        statements = [("UPDATE llm_configs SET is_default = 0", ())] if is_default else []
+        statements.append((
+            "UPDATE llm_configs SET base_uri = ?, model_name = ?, api_key = ?, temperature = ?, is_default = ? "
+            "WHERE name = ?",
+            (base_uri, model_name, api_key, temperature, 1 if is_default else 0, name)
+        ))
+        self._write(statements)
+
+    def delete(self, name):
+        self._write([("DELETE FROM llm_configs WHERE name = ?", (name,))])
+
+    def set_default(self, name):
+        """把某个配置设为唯一的默认配置"""
+        self._write([
+            ("UPDATE llm_configs SET is_default = 0", ()),
+            ("UPDATE llm_configs SET is_default = 1 WHERE name = ?", (name,)),
+        ])
@@ -0,0 +1,101 @@
+# db_connection.py
+# SQLite连接管理：每个线程对每个数据库文件只保留一个长期连接（界面线程一个，各后台线程各自一个），
+# 连接创建时统一开启WAL、synchronous=NORMAL、busy_timeout和较大的页缓存。
+# 界面和MCP服务进程同时读写时，WAL让读写互不阻塞，不再出现"database is locked"
+
+import sqlite3
+import threading
+
+# 等待其他进程释放写锁的时间（毫秒）
+BUSY_TIMEOUT_MS = 5000
+# 页缓存大小（负数表示KB）
+CACHE_SIZE_KB = 16384
+
+_local = threading.local()
+
+
+def configure_connection(conn):
+    """新连接的统一设置"""
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+
+
+class _ThreadConnection:
+    """某个线程中某个数据库的长期连接，以及当前借出的次数"""
+
+    __slots__ = ("conn", "depth")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.depth = 0
+
+
+class SharedConnection:
+    """
+    借出的连接：用法与sqlite3.Connection相同，close()只归还不关闭。
+    最外层归还时回滚未提交的事务、恢复row_factory，与关闭独立连接的效果一致
+    """
+
+    __slots__ = ("_holder", "_closed")
+
+    def __init__(self, holder):
+        object.__setattr__(self, "_holder", holder)
+        object.__setattr__(self, "_closed", False)
+        holder.depth += 1
+
+    def __getattr__(self, name):
+        return getattr(self._holder.conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._holder.conn, name, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._holder.conn.__exit__(exc_type, exc_value, traceback)
+
+    def __del__(self):
+        # 与独立连接被回收时一样：异常路径上没有调用close()时也会归还
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def close(self):
+        if self._closed:
+            return
+        object.__setattr__(self, "_closed", True)
+        holder = self._holder
+        holder.depth -= 1
+        if holder.depth == 0:
+            if holder.conn.in_transaction:
+                holder.conn.rollback()
+            holder.conn.row_factory = None
+
+
+def connect(db_path):
+    """获取当前线程中该数据库的连接（首次调用时创建）"""
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    holder = connections.get(db_path)
+    if holder is None:
+        conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_MS / 1000)
+        configure_connection(conn)
+        holder = connections[db_path] = _ThreadConnection(conn)
+    return SharedConnection(holder)
+
+
+def close_thread_connections():
+    """关闭当前线程中的全部长期连接（程序退出时在界面线程中调用）"""
+    connections = getattr(_local, "connections", None) or {}
+    for holder in connections.values():
+        try:
+            holder.conn.close()
+        except sqlite3.Error:
+            pass
+    connections.clear()
@@ -0,0 +1,212 @@
+# db_schema.py
+# 数据库结构的版本化迁移：当前版本记录在 PRAGMA user_version 中，启动时按顺序执行尚未执行的迁移，
+# 每个迁移连同版本号的更新在同一个事务中完成，中途失败时整体回滚，下次启动重新执行。
+# 以后修改表结构时在 MIGRATIONS 末尾追加新的迁移函数，不要修改已有的迁移
+
+import sqlite3
+
+
+def _create_tables(cursor):
+    """版本1：基础表（旧数据库中已存在的表保持不变）"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS tags (
+        id INTEGER PRIMARY KEY,
+        date TEXT,
+        tag TEXT,
+        color TEXT DEFAULT '#1E90FF'
+    )
+    ''')
+
+    # 提醒表，支持复杂的重复模式
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS reminders (
+        id INTEGER PRIMARY KEY,
+        date TEXT,
+        time TEXT,
+        message TEXT,
+        is_active INTEGER DEFAULT 1,
+        repeat_type TEXT DEFAULT 'none',
+        repeat_value TEXT DEFAULT NULL
+    )
+    ''')
+
+    # LLM配置表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS llm_configs (
+        id INTEGER PRIMARY KEY,
+        name TEXT UNIQUE,
+        base_uri TEXT,
+        model_name TEXT,
+        api_key TEXT,
+        temperature REAL DEFAULT 0.7,
+        is_default INTEGER DEFAULT 0
+    )
+    ''')
+
+    # 聊天历史表
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS chat_sessions (
+        id INTEGER PRIMARY KEY,
+        title TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS chat_messages (
+        id INTEGER PRIMARY KEY,
+        session_id INTEGER,
+        role TEXT,
+        content TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (session_id) REFERENCES chat_sessions (id) ON DELETE CASCADE
+    )
+    ''')
+
+    # 黄历详情缓存表（同一天的黄历数据固定不变）
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS almanac_cache (
+        date TEXT PRIMARY KEY,
+        payload TEXT NOT NULL
+    )
+    ''')
+
+
+def _add_reminder_repeat_columns(cursor):
+    """版本2：早期版本创建的reminders表没有重复规则列"""
+    cursor.execute("PRAGMA table_info(reminders)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if 'repeat_type' not in columns:
+        cursor.execute("ALTER TABLE reminders ADD COLUMN repeat_type TEXT DEFAULT 'none'")
+    if 'repeat_value' not in columns:
+        cursor.execute("ALTER TABLE reminders ADD COLUMN repeat_value TEXT DEFAULT NULL")
+
+
+def _add_lookup_indexes(cursor):
+    """版本3：常用查询的索引"""
+    # 月视图、分页列表、热力图按日期查找标签和提醒
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tags_date ON tags (date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_date ON reminders (date)")
+    # 每分钟的提醒检查只读取有效提醒
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reminders_active ON reminders (is_active, repeat_type, repeat_value)"
+    )
+    # 打开聊天会话时按时间读取该会话的消息
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_chat_messages_session ON chat_messages (session_id, timestamp)"
+    )
+
+
+def _add_full_text_search(cursor):
+    """
+    版本4：标签内容和聊天记录的FTS5全文索引（trigram分词，支持中文子串搜索），由触发器与原表保持同步。
+    SQLite未编译FTS5或不支持trigram时跳过，搜索退回LIKE
+    """
+    try:
+        cursor.execute(
+            "CREATE VIRTUAL TABLE tags_fts USING fts5(tag, content='tags', content_rowid='id', tokenize='trigram')"
+        )
+    except sqlite3.OperationalError as e:
+        print(f"SQLite不支持FTS5 trigram，标签和聊天记录搜索使用LIKE: {e}")
+        return
+    cursor.execute(
+        "CREATE VIRTUAL TABLE chat_messages_fts USING fts5("
+        "content, content='chat_messages', content_rowid='id', tokenize='trigram')"
+    )
+
+    for table, column in (("tags", "tag"), ("chat_messages", "content")):
+        fts = f"{table}_fts"
+        cursor.execute(f'''
+        CREATE TRIGGER {fts}_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts} (rowid, {column}) VALUES (new.id, new.{column});
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER {fts}_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+        END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER {fts}_update AFTER UPDATE ON {table} BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+            INSERT INTO {fts} (rowid, {column}) VALUES (new.id, new.{column});
+        END
+        ''')
+        # 为已有数据建立索引
+        cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def _add_zeri_index_tables(cursor):
+    """版本5：择日倒排索引（宜/忌事项 → 日期序号列表）及已建立索引的年份"""
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS zeri_index (
+        year INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        activity TEXT NOT NULL,
+        days BLOB NOT NULL,
+        PRIMARY KEY (year, kind, activity)
+    )
+    ''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS zeri_years (
+        year INTEGER PRIMARY KEY,
+        day_count INTEGER NOT NULL
+    )
+    ''')
+
+
+# 第i个迁移把数据库从版本i升级到版本i+1
+MIGRATIONS = [
+    _create_tables,
+    _add_reminder_repeat_columns,
+    _add_lookup_indexes,
+    _add_full_text_search,
+    _add_zeri_index_tables,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """
+    把数据库升级到SCHEMA_VERSION
+
+    多个进程同时启动时，写锁保证每个迁移只执行一次
+
+    Returns:
+        升级后的版本号
+    """
+    version = schema_version(conn)
+    while version < SCHEMA_VERSION:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # 取得写锁后重新读取版本，其他进程可能已经完成了迁移
+            version = schema_version(conn)
+            if version < SCHEMA_VERSION:
+                MIGRATIONS[version](cursor)
+                version += 1
+                cursor.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+    if version > SCHEMA_VERSION:
+        print(f"数据库版本({version})高于程序支持的版本({SCHEMA_VERSION})，可能由更新的版本创建")
+    return version
+
+
+def migrate_file(db_path):
+    """打开数据库文件并升级（MCP服务和独立脚本在日历应用之外使用数据库时调用）"""
+    import db_connection
+
+    conn = db_connection.connect(db_path)
+    try:
+        return migrate(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+农历后端差异测试工具
+逐日比较各农历后端（lunar-python、lunar.js、预计算数据表）在指定年份范围内的
+农历年月日、闰月、节气和节日，同时统计各后端每秒转换的天数，结果输出为JSON，便于多次运行之间对比
+
+用法:
+    python lunar_harness.py                                  # 1900-2100年，全部可用后端
+    python lunar_harness.py --start 2000 --end 2030 --backends table,node
+    python lunar_harness.py --output report.json --baseline last_report.json
+
+存在差异时返回码为1
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import datetime
+
+from lunar_provider import default_factories
+
+FIELDS = ["lunar_year", "lunar_month", "lunar_day", "is_leap", "jie_qi", "lunar_festivals", "solar_festivals"]
+
+
+def collect(provider, start_year, end_year, progress=True):
+    """
+    用一个后端转换整个范围
+
+    Returns:
+        (每天的记录 {date_str: {字段: 值}}, 统计信息)
+    """
+    records = {}
+    lunar_seconds = 0.0
+    cells_seconds = 0.0
+    for year in range(start_year, end_year + 1):
+        for month in range(1, 13):
+            begin = time.perf_counter()
+            lunar_days = provider.get_month_lunar_days(year, month)
+            lunar_seconds += time.perf_counter() - begin
+
+            begin = time.perf_counter()
+            cells = provider.get_month_cells(year, month)
+            cells_seconds += time.perf_counter() - begin
+
+            for lunar, cell in zip(lunar_days, cells):
+                records[f"{year}-{month:02d}-{cell['day']:02d}"] = {
+                    "lunar_year": lunar.year,
+                    "lunar_month": lunar.month,
+                    "lunar_day": lunar.day,
+                    "is_leap": lunar.is_leap,
+                    "jie_qi": cell["jie_qi"],
+                    "lunar_festivals": list(cell["lunar_festivals"]),
+                    "solar_festivals": list(cell["solar_festivals"]),
+                }
+        if progress and (year - start_year) % 10 == 9:
+            print(f"  {provider.name}: 已完成至{year}年", file=sys.stderr)
+
+    days = len(records)
+    total = lunar_seconds + cells_seconds
+    stats = {
+        "days": days,
+        "seconds": round(total, 3),
+        "days_per_second": round(days / total, 1) if total else None,
+        "lunar_days_per_second": round(days / lunar_seconds, 1) if lunar_seconds else None,
+        "month_cells_days_per_second": round(days / cells_seconds, 1) if cells_seconds else None,
+    }
+    return records, stats
+
+
+def compare(reference, reference_name, others, max_mismatches):
+    """与参考后端逐日逐字段比较"""
+    counts = {}
+    mismatches = []
+    total = 0
+    for name, records in others.items():
+        counts[name] = {field: 0 for field in FIELDS}
+        for date_str, expected in reference.items():
+            actual = records.get(date_str)
+            if actual is None:
+                continue
+            for field in FIELDS:
+                if actual[field] != expected[field]:
+                    counts[name][field] += 1
+                    total += 1
+                    if len(mismatches) < max_mismatches:
+                        mismatches.append({
+                            "date": date_str,
+                            "backend": name,
+                            "field": field,
+                            "expected": expected[field],
+                            "actual": actual[field],
+                            "reference": reference_name,
+                        })
+    return total, counts, mismatches
+
+
+def compare_with_baseline(report, baseline):
+    """与上一次的报告对比吞吐量和差异数"""
+    lines = []
+    for name, stats in report["backends"].items():
+        old = baseline.get("backends", {}).get(name)
+        if not old or not old.get("days_per_second") or not stats.get("days_per_second"):
+            continue
+        ratio = stats["days_per_second"] / old["days_per_second"]
+        lines.append(f"  {name}: {old['days_per_second']:.0f} → {stats['days_per_second']:.0f} 天/秒 ({ratio:.2f}x)")
+    old_total = baseline.get("mismatch_total")
+    if old_total is not None:
+        lines.append(f"  差异数: {old_total} → {report['mismatch_total']}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="农历后端差异与吞吐量测试")
+    parser.add_argument("--start", type=int, default=1900, help="起始年份（默认1900）")
+    parser.add_argument("--end", type=int, default=2100, help="结束年份（默认2100）")
+    parser.add_argument("--backends", default="table,python,node", help="参与测试的后端，逗号分隔")
+    parser.add_argument("--reference", default="node", help="作为基准的后端（默认node，即lunar.js）")
+    parser.add_argument("--max-mismatches", type=int, default=200, help="报告中最多列出的差异条数")
+    parser.add_argument("--output", help="JSON报告输出文件，默认输出到标准输出")
+    parser.add_argument("--baseline", help="上一次的JSON报告，用于对比")
+    args = parser.parse_args()
+
+    wanted = [name.strip() for name in args.backends.split(",") if name.strip()]
+    factories = {name: factory for name, factory in default_factories()}
+
+    report = {
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "range": [args.start, args.end],
+        "reference": None,
+        "backends": {},
+        "mismatch_total": 0,
+        "mismatch_counts": {},
+        "mismatches": [],
+    }
+
+    results = {}
+    for name in wanted:
+        if name not in factories:
+            report["backends"][name] = {"available": False, "error": "未知后端"}
+            continue
+        try:
+            provider = factories[name]()
+        except Exception as e:
+            report["backends"][name] = {"available": False, "error": str(e) or type(e).__name__}
+            continue
+
+        try:
+            if not all(provider.supports(year) for year in (args.start, args.end)):
+                raise ValueError(f"不支持{args.start}-{args.end}年")
+            print(f"正在测试{name}...", file=sys.stderr)
+            records, stats = collect(provider, args.start, args.end)
+            results[name] = records
+            report["backends"][name] = {"available": True, "error": "", **stats}
+        except Exception as e:
+            report["backends"][name] = {"available": False, "error": str(e) or type(e).__name__}
+        finally:
+            provider.close()
+
+    if results:
+        reference = args.reference if args.reference in results else next(iter(results))
+        report["reference"] = reference
+        others = {name: records for name, records in results.items() if name != reference}
+        total, counts, mismatches = compare(results[reference], reference, others, args.max_mismatches)
+        report["mismatch_total"] = total
+        report["mismatch_counts"] = counts
+        report["mismatches"] = mismatches
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"报告已写入: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    # 摘要
+    print(f"基准后端: {report['reference']}，差异数: {report['mismatch_total']}", file=sys.stderr)
+    for name, stats in report["backends"].items():
+        if stats.get("available"):
+            print(f"  {name}: {stats['days_per_second']:.0f} 天/秒", file=sys.stderr)
+        else:
+            print(f"  {name}: 不可用（{stats['error']}）", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("与基线对比:", file=sys.stderr)
+        for line in compare_with_baseline(report, baseline):
+            print(line, file=sys.stderr)
+
+    return 1 if report["mismatch_total"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+# lunar_index.py
+# 节气与节日索引：预先计算1900-2100年全部节气和农历、公历节日的日期，
+# 按日期排序后用二分查找完成区间查询和前后查找
+
+import bisect
+import datetime
+from collections import namedtuple
+
+import lunar_table_data as data
+from lunar_table import lunar_table, _days_in_month
+
+# 标记类型
+JIE_QI = "jie_qi"
+LUNAR_FESTIVAL = "lunar_festival"
+SOLAR_FESTIVAL = "solar_festival"
+
+# 索引中的一条记录，date为datetime.date
+Marker = namedtuple("Marker", ["date", "kind", "name"])
+
+
+class LunarIndex:
+    """按日期排序的节气和节日索引"""
+
+    def __init__(self, table=None):
+        self.table = table or lunar_table
+
+        # 同一天内的顺序：农历节日、除夕、公历节日、按星期计算的节日、节气，与逐日查询的结果保持一致
+        entries = []
+        entries.extend(self._lunar_festival_entries())
+        entries.extend(self._solar_festival_entries())
+        entries.extend(self._jie_qi_entries())
+        entries.sort()
+
+        self.ordinals = [entry[0] for entry in entries]
+        self.kinds = [entry[3] for entry in entries]
+        self.names = [entry[4] for entry in entries]
+
+    def _lunar_festival_entries(self):
+        table = self.table
+        entries = []
+        festivals = [(tuple(map(int, key.split("-"))), name) for key, name in data.LUNAR_FESTIVALS.items()]
+        for index, number in enumerate(table.month_numbers):
+            start = table.month_starts[index]
+            length = table.month_starts[index + 1] - start
+            for (month, day), name in festivals:
+                if month == number and day <= length:
+                    entries.append((start + day - 1, 0, 0, LUNAR_FESTIVAL, name))
+
+        # 除夕：每个农历年正月初一的前一天
+        for next_new_year in table.year_starts[1:]:
+            entries.append((next_new_year - 1, 0, 1, LUNAR_FESTIVAL, data.CHU_XI))
+        return [entry for entry in entries if table.start_ordinal <= entry[0] <= table.end_ordinal]
+
+    def _solar_festival_entries(self):
+        entries = []
+        fixed = [(tuple(map(int, key.split("-"))), name) for key, name in data.SOLAR_FESTIVALS.items()]
+        weekly = [(tuple(map(int, key.split("-"))), name) for key, name in data.SOLAR_WEEK_FESTIVALS.items()]
+
+        for year in range(self.table.start_year, self.table.end_year + 1):
+            for (month, day), name in fixed:
+                entries.append((datetime.date(year, month, day).toordinal(), 1, 0, SOLAR_FESTIVAL, name))
+
+            for (month, weeks, week), name in weekly:
+                first = datetime.date(year, month, 1)
+                days = _days_in_month(year, month)
+                # 当月第一个该星期几（星期日为0）
+                first_day = 1 + (week - (first.weekday() + 1) % 7) % 7
+                if weeks == 0:
+                    # 当月最后一个该星期几
+                    day = first_day + (days - first_day) // 7 * 7
+                    rank = 2
+                else:
+                    day = first_day + (weeks - 1) * 7
+                    rank = 1
+                if day <= days:
+                    entries.append((first.toordinal() + day - 1, 1, rank, SOLAR_FESTIVAL, name))
+        return entries
+
+    def _jie_qi_entries(self):
+        table = self.table
+        return [
+            (table.jie_qi_ordinal(index), 2, 0, JIE_QI, table.jie_qi_name(index))
+            for index in range(table.jie_qi_count())
+        ]
+
+    def _marker(self, position):
+        return Marker(datetime.date.fromordinal(self.ordinals[position]), self.kinds[position], self.names[position])
+
+    def between(self, start, end, kinds=None):
+        """
+        查询[start, end]区间（含两端）内的全部节气和节日
+
+        Args:
+            start: 起始日期（datetime.date）
+            end: 结束日期（datetime.date）
+            kinds: 只返回这些类型的记录，None表示全部
+        """
+        first = bisect.bisect_left(self.ordinals, start.toordinal())
+        last = bisect.bisect_right(self.ordinals, end.toordinal())
+        return [
+            self._marker(position) for position in range(first, last)
+            if kinds is None or self.kinds[position] in kinds
+        ]
+
+    def festivals_between(self, start, end):
+        """区间内的农历和公历节日"""
+        return self.between(start, end, (LUNAR_FESTIVAL, SOLAR_FESTIVAL))
+
+    def find_next(self, date, kinds=None, name=None, inclusive=False):
+        """查找指定日期之后（inclusive为True时包含当天）的第一条记录，找不到返回None"""
+        ordinal = date.toordinal()
+        if inclusive:
+            position = bisect.bisect_left(self.ordinals, ordinal)
+        else:
+            position = bisect.bisect_right(self.ordinals, ordinal)
+        for position in range(position, len(self.ordinals)):
+            if (kinds is None or self.kinds[position] in kinds) and (name is None or self.names[position] == name):
+                return self._marker(position)
+        return None
+
+    def find_previous(self, date, kinds=None, name=None, inclusive=False):
+        """查找指定日期之前（inclusive为True时包含当天）的最后一条记录，找不到返回None"""
+        ordinal = date.toordinal()
+        if inclusive:
+            position = bisect.bisect_right(self.ordinals, ordinal)
+        else:
+            position = bisect.bisect_left(self.ordinals, ordinal)
+        for position in range(position - 1, -1, -1):
+            if (kinds is None or self.kinds[position] in kinds) and (name is None or self.names[position] == name):
+                return self._marker(position)
+        return None
+
+    def next_jie_qi(self, date, name=None):
+        """指定日期之后的下一个节气"""
+        return self.find_next(date, (JIE_QI,), name)
+
+    def previous_festival(self, date, name=None):
+        """指定日期之前的上一个节日"""
+        return self.find_previous(date, (LUNAR_FESTIVAL, SOLAR_FESTIVAL), name)
+
+    def days_until(self, date, name):
+        """距离下一个名为name的节气或节日还有多少天（当天为0），找不到返回None"""
+        marker = self.find_next(date, name=name, inclusive=True)
+        if marker is None:
+            return None
+        return (marker.date - date).days
+
+    def month_markers(self, year, month):
+        """
+        一次切片取出整月的节气和节日
+
+        Returns:
+            {day: {"lunar_festivals": [...], "solar_festivals": [...], "jie_qi": str}}，只包含有标记的日期
+        """
+        first = datetime.date(year, month, 1).toordinal()
+        last = first + _days_in_month(year, month) - 1
+        markers = {}
+        for position in range(bisect.bisect_left(self.ordinals, first), bisect.bisect_right(self.ordinals, last)):
+            day = self.ordinals[position] - first + 1
+            cell = markers.setdefault(day, {"lunar_festivals": [], "solar_festivals": [], "jie_qi": ""})
+            kind = self.kinds[position]
+            if kind == JIE_QI:
+                cell["jie_qi"] = self.names[position]
+            elif kind == LUNAR_FESTIVAL:
+                cell["lunar_festivals"].append(self.names[position])
+            else:
+                cell["solar_festivals"].append(self.names[position])
+        return markers
+
+    def get_month_cells(self, year, month):
+        """获取整月每一天的农历和节日信息（格式与LunarTable.get_month_cells相同），节日部分来自索引切片"""
+        markers = self.month_markers(year, month)
+        first = datetime.date(year, month, 1).toordinal()
+        cells = []
+        for day in range(1, _days_in_month(year, month) + 1):
+            lunar = self.table.lunar_from_ordinal(first + day - 1)
+            marker = markers.get(day)
+            cells.append({
+                "day": day,
+                "lunar_month": self.table.month_in_chinese(lunar),
+                "lunar_day": self.table.day_in_chinese(lunar),
+                "lunar_festivals": marker["lunar_festivals"] if marker else [],
+                "solar_festivals": marker["solar_festivals"] if marker else [],
+                "jie_qi": marker["jie_qi"] if marker else ""
+            })
+        return cells
+
+
+_lunar_index = None
+
+
+def get_lunar_index():
+    """获取全局索引实例（首次调用时构建）"""
+    global _lunar_index
+    if _lunar_index is None:
+        _lunar_index = LunarIndex()
+    return _lunar_index
+
+
+if __name__ == "__main__":
+    today = datetime.date.today()
+    index = get_lunar_index()
+    print(f"下一个节气: {index.next_jie_qi(today)}")
+    print(f"上一个节日: {index.previous_festival(today)}")
+    print(f"距清明还有{index.days_until(today, '清明')}天")
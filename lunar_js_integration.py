@@ -1,4 +1,3 @@
-
 # lunar_js_integration.py
 # 此文件用于将lunar.js集成到Python中
 
@@ -6,17 +5,213 @@ import os
 import subprocess
 import json
 import datetime
+import threading
+import queue
+import atexit
+
+# 常驻Node.js工作进程脚本：只加载一次lunar.js，之后按行读取JSON请求并逐行返回JSON结果
+# 请求格式: {"id": 1, "code": "<JavaScript表达式>"}
+# 响应格式: {"id": 1, "ok": true, "result": ...} 或 {"id": 1, "ok": false, "error": "..."}
+WORKER_SCRIPT = """
+const lunar = require(%s);
+const readline = require('readline');
+const rl = readline.createInterface({input: process.stdin});
+rl.on('line', function(line) {
+  if (!line.trim()) {
+    return;
+  }
+  let req;
+  try {
+    req = JSON.parse(line);
+  } catch (e) {
+    return;
+  }
+  let resp;
+  try {
+    const fn = new Function('lunar', 'return (' + req.code + ');');
+    resp = {id: req.id, ok: true, result: fn(lunar)};
+  } catch (e) {
+    resp = {id: req.id, ok: false, error: String(e)};
+  }
+  process.stdout.write(JSON.stringify(resp) + '\\n');
+});
+rl.on('close', function() {
+  process.exit(0);
+});
+"""
+
+# 黄历详情（宜忌、星宿、彭祖百忌、方位、冲煞等）的字段提取函数，参数为lunar.js的Lunar对象
+ALMANAC_FUNCTION = """function(lunarObj) {
+  return {
+    lunar_info: lunarObj.toFullString(),
+    yi_ji: {
+      yi: lunarObj.getDayYi(),
+      ji: lunarObj.getDayJi()
+    },
+    animal: lunarObj.getAnimal(),
+    xiu: lunarObj.getXiu(),
+    zheng: lunarObj.getZheng(),
+    xiu_luck: lunarObj.getXiuLuck(),
+    peng_zu_gan: lunarObj.getPengZuGan(),
+    peng_zu_zhi: lunarObj.getPengZuZhi(),
+    day_position_xi: lunarObj.getDayPositionXi(),
+    day_position_xi_desc: lunarObj.getDayPositionXiDesc(),
+    day_position_yang_gui: lunarObj.getDayPositionYangGui(),
+    day_position_yang_gui_desc: lunarObj.getDayPositionYangGuiDesc(),
+    day_position_yin_gui: lunarObj.getDayPositionYinGui(),
+    day_position_yin_gui_desc: lunarObj.getDayPositionYinGuiDesc(),
+    day_position_fu: lunarObj.getDayPositionFu(),
+    day_position_fu_desc: lunarObj.getDayPositionFuDesc(),
+    day_position_cai: lunarObj.getDayPositionCai(),
+    day_position_cai_desc: lunarObj.getDayPositionCaiDesc(),
+    day_chong_desc: lunarObj.getDayChongDesc(),
+    day_sha: lunarObj.getDaySha(),
+    gong: lunarObj.getGong(),
+    shou: lunarObj.getShou()
+  };
+}"""
+
+
+class NodeLunarWorker:
+    """常驻的Node.js工作进程，lunar.js只解析一次，通过stdin/stdout的JSON行协议通信"""
+    
+    def __init__(self, js_path, timeout=10):
+        self.js_path = js_path
+        self.timeout = timeout
+        self.process = None
+        self.responses = None
+        self.reader_thread = None
+        self.next_id = 0
+        self.lock = threading.Lock()
+    
+    def is_alive(self):
+        """工作进程是否在运行"""
+        return self.process is not None and self.process.poll() is None
+    
+    def start(self):
+        """启动工作进程"""
+        script = WORKER_SCRIPT % json.dumps(self.js_path)
+        
+        # Windows下不弹出控制台窗口
+        creationflags = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        
+        self.process = subprocess.Popen(
+            ["node", "-e", script],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+            cwd=os.path.dirname(self.js_path),
+            creationflags=creationflags
+        )
+        
+        # 由后台线程读取输出，避免在readline上无限期阻塞
+        self.responses = queue.Queue()
+        self.reader_thread = threading.Thread(
+            target=self._read_responses, args=(self.process, self.responses), daemon=True
+        )
+        self.reader_thread.start()
+    
+    def _read_responses(self, process, responses):
+        """持续读取工作进程输出的响应行"""
+        try:
+            for line in process.stdout:
+                line = line.strip()
+                if line:
+                    responses.put(line)
+        except (OSError, ValueError):
+            pass
+        # 输出流结束说明进程已退出
+        responses.put(None)
+    
+    def stop(self):
+        """关闭工作进程"""
+        process = self.process
+        self.process = None
+        if process is None:
+            return
+        
+        try:
+            # 关闭stdin后工作进程会自行退出
+            process.stdin.close()
+        except OSError:
+            pass
+        
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    
+    def _send(self, js_code):
+        """发送一次请求并等待对应的响应"""
+        self.next_id += 1
+        request_id = self.next_id
+        self.process.stdin.write(json.dumps({"id": request_id, "code": js_code}) + "\n")
+        self.process.stdin.flush()
+        
+        while True:
+            line = self.responses.get(timeout=self.timeout)
+            if line is None:
+                raise RuntimeError("lunar.js工作进程意外退出")
+            
+            response = json.loads(line)
+            # 丢弃之前超时请求遗留的响应
+            if response.get("id") == request_id:
+                return response
+    
+    def execute(self, js_code):
+        """执行JavaScript表达式并返回结果，工作进程崩溃时自动重启并重试一次"""
+        with self.lock:
+            for attempt in range(2):
+                try:
+                    if not self.is_alive():
+                        self.start()
+                    response = self._send(js_code)
+                    break
+                except (OSError, RuntimeError, queue.Empty, json.JSONDecodeError) as e:
+                    print(f"lunar.js工作进程出错，正在重启: {e}")
+                    self.stop()
+                    if attempt == 1:
+                        raise
+        
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "未知错误"))
+        return response.get("result")
+
 
 class LunarJSBridge:
     """连接Python和lunar.js的桥接类"""
     
-    def __init__(self):
+    def __init__(self, persistent=True):
         self.js_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lunar.js")
         if not os.path.exists(self.js_path):
             raise FileNotFoundError(f"找不到lunar.js文件，请先运行download_lunar.py下载")
+        
+        # 常驻工作进程模式：lunar.js只加载一次，所有查询复用同一个node进程
+        self.worker = NodeLunarWorker(self.js_path) if persistent else None
+        if self.worker:
+            atexit.register(self.close)
+    
+    def close(self):
+        """关闭常驻的node工作进程"""
+        if self.worker:
+            self.worker.stop()
     
     def _execute_js(self, js_code):
         """执行JavaScript代码并返回结果"""
+        if self.worker:
+            try:
+                return self.worker.execute(js_code)
+            except Exception as e:
+                print(f"执行JavaScript代码时出错: {e}")
+                return None
+        
+        return self._execute_js_once(js_code)
+    
+    def _execute_js_once(self, js_code):
+        """启动一次性的node进程执行JavaScript代码并返回结果"""
         # 使用Node.js执行JavaScript代码
         try:
             # 创建临时JS文件
@@ -75,6 +270,79 @@ class LunarJSBridge:
         js_code = f"lunar.Lunar.fromYmd({year}, {month}, {day}).getJieQi()"
         return self._execute_js(js_code)
     
+    def get_month_cells(self, year, month):
+        """一次性获取整月每一天的农历月、农历日、农历节日、公历节日和节气"""
+        js_code = f"""(function() {{
+            var cells = [];
+            var days = lunar.SolarUtil.getDaysOfMonth({year}, {month});
+            for (var d = 1; d <= days; d++) {{
+                var solar = lunar.Solar.fromYmd({year}, {month}, d);
+                var lunarObj = solar.getLunar();
+                cells.push({{
+                    day: d,
+                    lunar_month: lunarObj.getMonthInChinese(),
+                    lunar_day: lunarObj.getDayInChinese(),
+                    lunar_festivals: lunarObj.getFestivals(),
+                    solar_festivals: solar.getFestivals(),
+                    jie_qi: lunarObj.getJieQi()
+                }});
+            }}
+            return cells;
+        }})()"""
+        return self._execute_js(js_code)
+    
+    def get_lunar_date(self, year, month, day):
+        """公历日期转换为农历，返回 {"year", "month"（闰月为负数）, "day", "month_in_chinese", "day_in_chinese"}"""
+        js_code = f"""(function() {{
+            var lunarObj = lunar.Solar.fromYmd({year}, {month}, {day}).getLunar();
+            return {{
+                year: lunarObj.getYear(),
+                month: lunarObj.getMonth(),
+                day: lunarObj.getDay(),
+                month_in_chinese: lunarObj.getMonthInChinese(),
+                day_in_chinese: lunarObj.getDayInChinese()
+            }};
+        }})()"""
+        return self._execute_js(js_code)
+    
+    def get_month_lunar_dates(self, year, month):
+        """一次性获取整月每一天的农历日期（字段同get_lunar_date）"""
+        js_code = f"""(function() {{
+            var items = [];
+            var days = lunar.SolarUtil.getDaysOfMonth({year}, {month});
+            for (var d = 1; d <= days; d++) {{
+                var lunarObj = lunar.Solar.fromYmd({year}, {month}, d).getLunar();
+                items.push({{
+                    year: lunarObj.getYear(),
+                    month: lunarObj.getMonth(),
+                    day: lunarObj.getDay(),
+                    month_in_chinese: lunarObj.getMonthInChinese(),
+                    day_in_chinese: lunarObj.getDayInChinese()
+                }});
+            }}
+            return items;
+        }})()"""
+        return self._execute_js(js_code)
+    
+    def get_almanac(self, year, month, day):
+        """获取指定公历日期的完整黄历信息（与右键详情弹窗使用的字段相同）"""
+        js_code = f"({ALMANAC_FUNCTION})(lunar.Solar.fromYmd({year}, {month}, {day}).getLunar())"
+        return self._execute_js(js_code)
+    
+    def get_almanac_month(self, year, month):
+        """一次性获取整月每一天的完整黄历信息，返回 [{"date": "YYYY-MM-DD", "data": {...}}, ...]"""
+        js_code = f"""(function() {{
+            var almanac = {ALMANAC_FUNCTION};
+            var items = [];
+            var days = lunar.SolarUtil.getDaysOfMonth({year}, {month});
+            for (var d = 1; d <= days; d++) {{
+                var solar = lunar.Solar.fromYmd({year}, {month}, d);
+                items.push({{date: solar.toYmd(), data: almanac(solar.getLunar())}});
+            }}
+            return items;
+        }})()"""
+        return self._execute_js(js_code)
+    
     def get_yi_ji(self, year, month, day):
         """获取宜忌"""
         js_code = f'{{"yi": lunar.Lunar.fromYmd({year}, {month}, {day}).getDayYi(), "ji": lunar.Lunar.fromYmd({year}, {month}, {day}).getDayJi()}}'
@@ -0,0 +1,283 @@
+# lunar_provider.py
+# 农历后端统一接口：预计算数据表、lunar-python、常驻Node.js（lunar.js）三种实现
+# 启动时先做正确性自检，再做一次微基准测试，自动选用最快的可用后端
+# 可通过环境变量 CALENDAR_LUNAR_BACKEND=table|python|node 强制指定
+
+import os
+import time
+import calendar
+from collections import namedtuple
+
+# 强制指定后端的环境变量
+BACKEND_ENV = "CALENDAR_LUNAR_BACKEND"
+
+# 农历日期：month为正数月份，is_leap表示是否闰月
+LunarDay = namedtuple("LunarDay", ["year", "month", "day", "is_leap", "month_in_chinese", "day_in_chinese"])
+
+# 自检用例（以lunar.js为准）：(公历年, 月, 日) → (农历年, 月, 日, 是否闰月, 农历节日, 节气)
+SELF_CHECK_CASES = [
+    ((1900, 1, 31), (1900, 1, 1, False, ["春节"], "")),
+    ((2023, 3, 22), (2023, 2, 1, True, [], "")),
+    ((2024, 2, 9), (2023, 12, 30, False, ["除夕"], "")),
+    ((2024, 2, 10), (2024, 1, 1, False, ["春节"], "")),
+    ((2026, 4, 5), (2026, 2, 18, False, [], "清明")),
+    ((2100, 12, 31), (2100, 12, 1, False, [], "")),
+]
+
+
+class LunarProvider:
+    """农历后端接口"""
+
+    name = ""
+    # 查询足够快，可以直接在界面线程中调用
+    fast = False
+
+    def supports(self, year):
+        """是否支持该公历年份"""
+        return True
+
+    def get_lunar_day(self, year, month, day):
+        """公历日期转换为农历，返回LunarDay"""
+        raise NotImplementedError
+
+    def get_month_lunar_days(self, year, month):
+        """获取整月每一天的LunarDay"""
+        return [self.get_lunar_day(year, month, day) for day in range(1, calendar.monthrange(year, month)[1] + 1)]
+
+    def get_month_cells(self, year, month):
+        """
+        获取整月每一天的农历信息
+        返回 [{"day", "lunar_month", "lunar_day", "lunar_festivals", "solar_festivals", "jie_qi"}, ...]
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class TableLunarProvider(LunarProvider):
+    """基于预计算数据表（lunar_table + lunar_index），1900-2100年"""
+
+    name = "table"
+    fast = True
+
+    def __init__(self):
+        from lunar_table import lunar_table
+        from lunar_index import get_lunar_index
+        self.table = lunar_table
+        self.index = get_lunar_index()
+
+    def supports(self, year):
+        return self.table.is_supported(year)
+
+    def get_lunar_day(self, year, month, day):
+        lunar = self.table.solar_to_lunar(year, month, day)
+        return LunarDay(lunar.year, lunar.month, lunar.day, lunar.is_leap,
+                        self.table.month_in_chinese(lunar), self.table.day_in_chinese(lunar))
+
+    def get_month_cells(self, year, month):
+        return self.index.get_month_cells(year, month)
+
+
+class PythonLunarProvider(LunarProvider):
+    """基于lunar-python"""
+
+    name = "python"
+
+    def __init__(self):
+        from lunar_python import Solar
+        self.Solar = Solar
+
+    def get_lunar_day(self, year, month, day):
+        lunar = self.Solar.fromYmd(year, month, day).getLunar()
+        lunar_month = lunar.getMonth()
+        return LunarDay(lunar.getYear(), abs(lunar_month), lunar.getDay(), lunar_month < 0,
+                        lunar.getMonthInChinese(), lunar.getDayInChinese())
+
+    def get_month_cells(self, year, month):
+        cells = []
+        for day in range(1, calendar.monthrange(year, month)[1] + 1):
+            solar = self.Solar.fromYmd(year, month, day)
+            lunar = solar.getLunar()
+            cells.append({
+                "day": day,
+                "lunar_month": lunar.getMonthInChinese(),
+                "lunar_day": lunar.getDayInChinese(),
+                "lunar_festivals": lunar.getFestivals(),
+                "solar_festivals": solar.getFestivals(),
+                "jie_qi": lunar.getJieQi()
+            })
+        return cells
+
+
+class NodeLunarProvider(LunarProvider):
+    """基于常驻Node.js进程中的lunar.js"""
+
+    name = "node"
+
+    def __init__(self, bridge_getter=None):
+        """
+        Args:
+            bridge_getter: 返回LunarJSBridge实例的函数，便于与应用共用同一个node进程
+        """
+        # 自己启动的node进程在close()时关闭，共用应用的进程时由应用负责关闭
+        self.own_bridge = None
+        if bridge_getter is None:
+            from lunar_js_integration import LunarJSBridge
+            bridge = LunarJSBridge()
+            self.own_bridge = bridge
+            bridge_getter = lambda: bridge
+        self.bridge_getter = bridge_getter
+
+    def get_lunar_day(self, year, month, day):
+        result = self.bridge_getter().get_lunar_date(year, month, day)
+        if result is None:
+            raise RuntimeError("lunar.js未返回结果")
+        return self._to_lunar_day(result)
+
+    def get_month_lunar_days(self, year, month):
+        results = self.bridge_getter().get_month_lunar_dates(year, month)
+        if results is None:
+            raise RuntimeError("lunar.js未返回结果")
+        return [self._to_lunar_day(result) for result in results]
+
+    @staticmethod
+    def _to_lunar_day(result):
+        return LunarDay(result["year"], abs(result["month"]), result["day"], result["month"] < 0,
+                        result["month_in_chinese"], result["day_in_chinese"])
+
+    def get_month_cells(self, year, month):
+        cells = self.bridge_getter().get_month_cells(year, month)
+        if cells is None:
+            raise RuntimeError("lunar.js未返回结果")
+        return cells
+
+    def close(self):
+        if self.own_bridge is not None:
+            self.own_bridge.close()
+            self.own_bridge = None
+
+
+def self_check(provider):
+    """正确性自检，不通过时抛出AssertionError"""
+    for (year, month, day), expected in SELF_CHECK_CASES:
+        if not provider.supports(year):
+            continue
+        lunar_year, lunar_month, lunar_day, is_leap, festivals, jie_qi = expected
+        lunar = provider.get_lunar_day(year, month, day)
+        actual = (lunar.year, lunar.month, lunar.day, lunar.is_leap)
+        if actual != (lunar_year, lunar_month, lunar_day, is_leap):
+            raise AssertionError(f"{year}-{month}-{day} 农历应为{expected[:4]}，实际为{actual}")
+
+        cell = provider.get_month_cells(year, month)[day - 1]
+        if cell["day"] != day or cell["lunar_festivals"] != festivals or cell["jie_qi"] != jie_qi:
+            raise AssertionError(f"{year}-{month}-{day} 节日/节气不一致: {cell}")
+
+
+def benchmark(provider, rounds=3):
+    """微基准测试，返回 (整月查询平均毫秒, 单日查询平均毫秒)"""
+    months = [(2024, 2), (2025, 6), (2026, 10)]
+    begin = time.perf_counter()
+    for _ in range(rounds):
+        for year, month in months:
+            provider.get_month_cells(year, month)
+    month_ms = (time.perf_counter() - begin) * 1000 / (rounds * len(months))
+
+    days = [(2024, 2, 10), (2025, 6, 1), (2026, 10, 17), (2023, 3, 22)]
+    begin = time.perf_counter()
+    for _ in range(rounds):
+        for year, month, day in days:
+            provider.get_lunar_day(year, month, day)
+    day_ms = (time.perf_counter() - begin) * 1000 / (rounds * len(days))
+    return month_ms, day_ms
+
+
+class LunarProviderManager:
+    """管理全部可用的农历后端，并选出默认后端"""
+
+    def __init__(self, factories=None, override=None):
+        """
+        Args:
+            factories: [(名称, 创建函数), ...]，默认为table、python、node三种
+            override: 强制使用的后端名称，默认读取环境变量CALENDAR_LUNAR_BACKEND
+        """
+        if factories is None:
+            factories = default_factories()
+        if override is None:
+            override = os.environ.get(BACKEND_ENV, "").strip().lower() or None
+
+        self.override = override
+        self.report = []
+        # 通过自检的后端，按速度从快到慢排列
+        self.providers = []
+
+        for name, factory in factories:
+            entry = {"name": name, "available": False, "passed": False,
+                     "check_ms": None, "month_ms": None, "day_ms": None, "error": ""}
+            self.report.append(entry)
+            # 强制指定时只初始化该后端
+            if override and name != override:
+                entry["error"] = "未选用"
+                continue
+            provider = None
+            try:
+                begin = time.perf_counter()
+                provider = factory()
+                entry["available"] = True
+                self_check(provider)
+                entry["check_ms"] = (time.perf_counter() - begin) * 1000
+                entry["passed"] = True
+                entry["month_ms"], entry["day_ms"] = benchmark(provider)
+                self.providers.append((entry["month_ms"], provider))
+            except Exception as e:
+                entry["error"] = str(e) or type(e).__name__
+                # 未选用的后端也要关闭，否则node后端启动的进程会一直运行
+                if provider is not None:
+                    try:
+                        provider.close()
+                    except Exception as close_error:
+                        print(f"关闭农历后端{name}出错: {close_error}")
+
+        self.providers = [provider for cost, provider in sorted(self.providers, key=lambda item: item[0])]
+        self.chosen = self.providers[0] if self.providers else None
+
+        if override and self.chosen is None:
+            print(f"警告: 指定的农历后端{override}不可用")
+
+    def for_year(self, year):
+        """返回支持该年份的最快后端，没有则返回None"""
+        for provider in self.providers:
+            if provider.supports(year):
+                return provider
+        return None
+
+    def summary(self):
+        """后端选择结果的文字报告"""
+        lines = [f"农历后端: {self.chosen.name if self.chosen else '无'}"
+                 + (f"（由{BACKEND_ENV}指定）" if self.override else "")]
+        for entry in self.report:
+            if entry["passed"]:
+                lines.append(f"  {entry['name']}: 整月{entry['month_ms']:.3f}毫秒/次，单日{entry['day_ms']:.3f}毫秒/次，"
+                             f"初始化及自检{entry['check_ms']:.1f}毫秒")
+            else:
+                lines.append(f"  {entry['name']}: 不可用（{entry['error']}）")
+        return "\n".join(lines)
+
+    def close(self):
+        for provider in self.providers:
+            provider.close()
+
+
+def default_factories(bridge_getter=None):
+    """默认的后端创建函数列表"""
+    return [
+        ("table", TableLunarProvider),
+        ("python", PythonLunarProvider),
+        ("node", lambda: NodeLunarProvider(bridge_getter)),
+    ]
+
+
+if __name__ == "__main__":
+    manager = LunarProviderManager()
+    print(manager.summary())
+    manager.close()
@@ -0,0 +1,114 @@
+# lunar_range.py
+# 批量日期区间农历转换：基于lunar_table的月份边界表，用NumPy一次性计算整段日期
+# 适合统计分析和导出，几十年的数据无需逐日调用lunar-python或lunar.js
+
+import datetime
+from collections import namedtuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    print("警告: numpy库未安装，日期区间批量转换功能将不可用。请使用 pip install numpy 安装。")
+
+import lunar_table_data as data
+from lunar_table import lunar_table, MINUTES_PER_DAY
+
+# 节气名称（按jie_qi数组中的序号）和六十甲子名称（按day_gan_zhi数组中的序号）
+JIE_QI_NAMES = data.JIE_QI_ORDER
+GAN_ZHI_NAMES = data.JIA_ZI
+
+# 区间转换结果，每个字段都是长度相同的NumPy数组
+# dates: datetime64[D]；ordinal: Python日期序号；is_leap: 是否闰月；
+# jie_qi: 节气序号（JIE_QI_NAMES下标，无节气为-1）；day_gan_zhi: 日干支序号（GAN_ZHI_NAMES下标）
+LunarRange = namedtuple("LunarRange", [
+    "dates", "ordinal", "lunar_year", "lunar_month", "lunar_day", "is_leap", "jie_qi", "day_gan_zhi"
+])
+
+# datetime64[D]的0点（1970-01-01）对应的日期序号
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+_arrays = None
+
+
+def _to_ordinal(value):
+    if isinstance(value, datetime.date):
+        return value.toordinal()
+    return int(value)
+
+
+def _load_arrays():
+    """把lunar_table的月份边界和节气时刻转换为NumPy数组（只做一次）"""
+    global _arrays
+    if _arrays is None:
+        jie_qi_days = np.asarray(lunar_table.jie_qi_minutes(), dtype=np.int64) // MINUTES_PER_DAY
+        _arrays = {
+            "month_starts": np.asarray(lunar_table.month_starts, dtype=np.int64),
+            "month_years": np.asarray(lunar_table.month_years, dtype=np.int32),
+            "month_numbers": np.asarray(lunar_table.month_numbers, dtype=np.int32),
+            "jie_qi_ordinals": lunar_table.start_ordinal + jie_qi_days,
+        }
+    return _arrays
+
+
+def convert_range(start, end):
+    """
+    将公历日期区间[start, end]（含两端）批量转换为农历
+
+    Args:
+        start: 起始日期（datetime.date或日期序号）
+        end: 结束日期（datetime.date或日期序号）
+
+    Returns:
+        LunarRange，每天一个元素
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy未安装，无法进行区间批量转换")
+
+    start_ordinal = _to_ordinal(start)
+    end_ordinal = _to_ordinal(end)
+    if start_ordinal > end_ordinal:
+        raise ValueError("起始日期不能晚于结束日期")
+    lunar_table._check_ordinal(start_ordinal)
+    lunar_table._check_ordinal(end_ordinal)
+
+    arrays = _load_arrays()
+    ordinals = np.arange(start_ordinal, end_ordinal + 1, dtype=np.int64)
+
+    # 每天所在农历月的下标
+    index = np.searchsorted(arrays["month_starts"], ordinals, side="right") - 1
+    numbers = arrays["month_numbers"][index]
+
+    # 节气：把区间内的交节日期散布到对应位置
+    jie_qi = np.full(len(ordinals), -1, dtype=np.int8)
+    jie_qi_ordinals = arrays["jie_qi_ordinals"]
+    first = np.searchsorted(jie_qi_ordinals, start_ordinal, side="left")
+    last = np.searchsorted(jie_qi_ordinals, end_ordinal, side="right")
+    terms = np.arange(first, last)
+    jie_qi[jie_qi_ordinals[first:last] - start_ordinal] = terms % 24
+
+    return LunarRange(
+        dates=(ordinals - EPOCH_ORDINAL).astype("datetime64[D]"),
+        ordinal=ordinals,
+        lunar_year=arrays["month_years"][index],
+        lunar_month=np.abs(numbers),
+        lunar_day=(ordinals - arrays["month_starts"][index] + 1).astype(np.int8),
+        is_leap=numbers < 0,
+        jie_qi=jie_qi,
+        day_gan_zhi=((ordinals - lunar_table.start_ordinal + data.FIRST_DAY_GAN_ZHI) % 60).astype(np.int8),
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    begin = time.perf_counter()
+    result = convert_range(datetime.date(data.START_YEAR, 1, 1), datetime.date(data.END_YEAR, 12, 31))
+    elapsed = (time.perf_counter() - begin) * 1000
+    print(f"{data.START_YEAR}-{data.END_YEAR}年共{len(result.ordinal)}天，转换耗时{elapsed:.1f}毫秒")
+
+    today = datetime.date.today()
+    i = today.toordinal() - int(result.ordinal[0])
+    print(f"今日农历: {result.lunar_year[i]}年{'闰' if result.is_leap[i] else ''}{result.lunar_month[i]}月{result.lunar_day[i]}日 "
+          f"{GAN_ZHI_NAMES[result.day_gan_zhi[i]]}日")
@@ -0,0 +1,14 @@
+# lunar_service.py
+# 异步农历服务：在后台线程中执行农历/黄历查询（可能需要等待node），界面不会因查询而卡住
+
+from background_service import BackgroundService
+
+
+class LunarService(BackgroundService):
+    """后台执行农历查询，并在Tk主线程中回调结果"""
+
+    error_message = "农历查询出错"
+
+    def __init__(self, root, thread_name_prefix="lunar-service"):
+        # 单个工作线程：lunar.js工作进程本身是串行的，多线程并不会更快
+        super().__init__(root, thread_name_prefix)
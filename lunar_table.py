@@ -0,0 +1,244 @@
+# lunar_table.py
+# 基于预计算数据表的农历转换模块，不依赖lunar-python和Node.js
+# 数据表由build_lunar_table.py根据lunar.js生成（lunar_table_data.py）
+
+import base64
+import struct
+import datetime
+from collections import namedtuple
+
+import lunar_table_data as data
+
+# 农历日期：month为正数月份，is_leap表示是否闰月
+LunarDate = namedtuple("LunarDate", ["year", "month", "day", "is_leap"])
+
+# 朔望月平均长度，用于直接估算月份下标
+SYNODIC_MONTH = 29.530588853
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _unpack(fmt, text):
+    """解码base64文本并按小端序解包"""
+    raw = base64.b64decode(text)
+    size = struct.calcsize(f"<{fmt}")
+    return struct.unpack(f"<{len(raw) // size}{fmt}", raw)
+
+
+class LunarTable:
+    """基于压缩数据表的公历→农历转换器，支持1900-2100年"""
+
+    def __init__(self):
+        self.start_year = data.START_YEAR
+        self.end_year = data.END_YEAR
+        self.start_ordinal = datetime.date(self.start_year, 1, 1).toordinal()
+        self.end_ordinal = datetime.date(self.end_year, 12, 31).toordinal()
+
+        # 展开所有农历月：起始日期序号、所属农历年、月份（闰月为负数）
+        self.month_starts = []
+        self.month_years = []
+        self.month_numbers = []
+        # 每个农历年正月初一的日期序号
+        self.year_starts = []
+
+        ordinal = data.FIRST_NEW_YEAR_ORDINAL
+        for offset, info in enumerate(_unpack("I", data.YEAR_INFO)):
+            year = data.FIRST_LUNAR_YEAR + offset
+            leap = (info >> 13) & 0xF
+            month_count = 13 if leap else 12
+            self.year_starts.append(ordinal)
+
+            month = 0
+            for i in range(month_count):
+                # 闰月紧跟在同名月份之后
+                if leap and month == leap and self.month_numbers[-1] == leap:
+                    number = -leap
+                else:
+                    month += 1
+                    number = month
+                self.month_starts.append(ordinal)
+                self.month_years.append(year)
+                self.month_numbers.append(number)
+                ordinal += 30 if info & (1 << i) else 29
+
+        # 最后一个月的结束位置，便于计算月份天数
+        self.month_starts.append(ordinal)
+        self.year_starts.append(ordinal)
+
+        # 节气数据在首次查询时再解码
+        self._jie_qi_residuals = None
+
+    def is_supported(self, year):
+        """是否在数据表覆盖的年份范围内"""
+        return self.start_year <= year <= self.end_year
+
+    def _check_ordinal(self, ordinal):
+        if not self.start_ordinal <= ordinal <= self.end_ordinal:
+            raise ValueError(f"日期超出农历数据表范围({self.start_year}-{self.end_year})")
+
+    def _month_index(self, ordinal):
+        """根据日期序号定位所在农历月的下标（估算后最多调整一两步）"""
+        index = int((ordinal - self.month_starts[0]) / SYNODIC_MONTH)
+        if index >= len(self.month_numbers):
+            index = len(self.month_numbers) - 1
+        while ordinal < self.month_starts[index]:
+            index -= 1
+        while ordinal >= self.month_starts[index + 1]:
+            index += 1
+        return index
+
+    def lunar_from_ordinal(self, ordinal):
+        """日期序号转换为农历日期"""
+        self._check_ordinal(ordinal)
+        index = self._month_index(ordinal)
+        number = self.month_numbers[index]
+        return LunarDate(
+            self.month_years[index],
+            abs(number),
+            ordinal - self.month_starts[index] + 1,
+            number < 0
+        )
+
+    def solar_to_lunar(self, year, month, day):
+        """公历日期转换为农历日期"""
+        return self.lunar_from_ordinal(datetime.date(year, month, day).toordinal())
+
+    def get_lunar_month_number(self, year, month, day):
+        """获取农历月份数字（闰月为负数，与lunar-python的getMonth一致）"""
+        lunar = self.solar_to_lunar(year, month, day)
+        return -lunar.month if lunar.is_leap else lunar.month
+
+    def month_in_chinese(self, lunar):
+        """农历月份的中文名称"""
+        return ("闰" if lunar.is_leap else "") + data.MONTH_NAMES[lunar.month]
+
+    def day_in_chinese(self, lunar):
+        """农历日期的中文名称"""
+        return data.DAY_NAMES[lunar.day]
+
+    def get_lunar_month(self, year, month, day):
+        """获取农历月份"""
+        return self.month_in_chinese(self.solar_to_lunar(year, month, day))
+
+    def get_lunar_day(self, year, month, day):
+        """获取农历日期"""
+        return self.day_in_chinese(self.solar_to_lunar(year, month, day))
+
+    def _lunar_festivals(self, ordinal, lunar):
+        festivals = []
+        month_key = -lunar.month if lunar.is_leap else lunar.month
+        festival = data.LUNAR_FESTIVALS.get(f"{month_key}-{lunar.day}")
+        if festival:
+            festivals.append(festival)
+        # 除夕：农历年的最后一天
+        next_new_year = self.year_starts[lunar.year - data.FIRST_LUNAR_YEAR + 1]
+        if lunar.month == 12 and lunar.day >= 29 and ordinal + 1 == next_new_year:
+            festivals.append(data.CHU_XI)
+        return festivals
+
+    def get_lunar_festivals(self, year, month, day):
+        """获取农历节日"""
+        ordinal = datetime.date(year, month, day).toordinal()
+        return self._lunar_festivals(ordinal, self.lunar_from_ordinal(ordinal))
+
+    def get_solar_festivals(self, year, month, day):
+        """获取公历节日"""
+        festivals = []
+        festival = data.SOLAR_FESTIVALS.get(f"{month}-{day}")
+        if festival:
+            festivals.append(festival)
+
+        # 按“某月第几个星期几”计算的节日，星期日为0
+        week = (datetime.date(year, month, day).weekday() + 1) % 7
+        weeks = (day + 6) // 7
+        festival = data.SOLAR_WEEK_FESTIVALS.get(f"{month}-{weeks}-{week}")
+        if festival:
+            festivals.append(festival)
+
+        # 当月最后一个星期几
+        if day + 7 > _days_in_month(year, month):
+            festival = data.SOLAR_WEEK_FESTIVALS.get(f"{month}-0-{week}")
+            if festival:
+                festivals.append(festival)
+        return festivals
+
+    def _load_jie_qi(self):
+        if self._jie_qi_residuals is None:
+            self._jie_qi_residuals = _unpack("h", data.JIE_QI_RESIDUALS)
+        return self._jie_qi_residuals
+
+    def jie_qi_minutes(self):
+        """全部节气距1900-01-01 0点（北京时间）的分钟数列表"""
+        residuals = self._load_jie_qi()
+        return [data.JIE_QI_FIRST_MINUTE + round(i * data.JIE_QI_STEP) + r for i, r in enumerate(residuals)]
+
+    def jie_qi_count(self):
+        """数据表中的节气总数"""
+        return len(self._load_jie_qi())
+
+    def jie_qi_minute(self, index):
+        """第index个节气距1900-01-01 0点（北京时间）的分钟数"""
+        residuals = self._load_jie_qi()
+        return data.JIE_QI_FIRST_MINUTE + round(index * data.JIE_QI_STEP) + residuals[index]
+
+    def jie_qi_name(self, index):
+        """第index个节气的名称"""
+        return data.JIE_QI_ORDER[index % 24]
+
+    def jie_qi_ordinal(self, index):
+        """第index个节气所在日期的序号"""
+        return self.start_ordinal + self.jie_qi_minute(index) // MINUTES_PER_DAY
+
+    def jie_qi_time(self, index):
+        """第index个节气的交节时刻（北京时间）"""
+        return datetime.datetime(self.start_year, 1, 1) + datetime.timedelta(minutes=self.jie_qi_minute(index))
+
+    def _jie_qi_on(self, ordinal):
+        """返回该日的节气名称，没有则返回空字符串"""
+        count = self.jie_qi_count()
+        minute = (ordinal - self.start_ordinal) * MINUTES_PER_DAY
+        estimate = int((minute - data.JIE_QI_FIRST_MINUTE) / data.JIE_QI_STEP)
+        for index in range(estimate - 1, estimate + 2):
+            if 0 <= index < count and self.jie_qi_ordinal(index) == ordinal:
+                return self.jie_qi_name(index)
+        return ""
+
+    def get_jie_qi(self, year, month, day):
+        """获取节气"""
+        ordinal = datetime.date(year, month, day).toordinal()
+        self._check_ordinal(ordinal)
+        return self._jie_qi_on(ordinal)
+
+    def get_month_cells(self, year, month):
+        """获取整月每一天的农历月、农历日、农历节日、公历节日和节气（格式与LunarJSBridge相同）"""
+        cells = []
+        first = datetime.date(year, month, 1).toordinal()
+        for day in range(1, _days_in_month(year, month) + 1):
+            ordinal = first + day - 1
+            lunar = self.lunar_from_ordinal(ordinal)
+            cells.append({
+                "day": day,
+                "lunar_month": self.month_in_chinese(lunar),
+                "lunar_day": self.day_in_chinese(lunar),
+                "lunar_festivals": self._lunar_festivals(ordinal, lunar),
+                "solar_festivals": self.get_solar_festivals(year, month, day),
+                "jie_qi": self._jie_qi_on(ordinal)
+            })
+        return cells
+
+
+def _days_in_month(year, month):
+    if month == 12:
+        return 31
+    return (datetime.date(year, month + 1, 1) - datetime.date(year, month, 1)).days
+
+
+# 全局农历数据表实例
+lunar_table = LunarTable()
+
+
+if __name__ == "__main__":
+    today = datetime.date.today()
+    lunar = lunar_table.solar_to_lunar(today.year, today.month, today.day)
+    print(f"今日农历: {lunar.year}年{lunar_table.month_in_chinese(lunar)}月{lunar_table.day_in_chinese(lunar)}")
+    print(f"节气: {lunar_table.get_jie_qi(today.year, today.month, today.day) or '无'}")
@@ -0,0 +1,217 @@
+# lunar_table_data.py
+# 此文件由build_lunar_table.py根据lunar.js自动生成，请勿手动修改
+
+START_YEAR = 1900
+END_YEAR = 2100
+
+# 第一个农历年（含1900-01-01）正月初一的日期序号
+FIRST_LUNAR_YEAR = 1899
+FIRST_NEW_YEAR_ORDINAL = 693271
+
+# 每个农历年的月份大小和闰月（小端序uint32）
+YEAR_INFO = '''
+1QoAANIWAQBSBwAApQ4AAEq2AABLBgAAmwoAAFaVAABqBQAAWQsAAFJXAABSBwAAJdsAACULAABL
+CgAAq7QAAK0CAABrBQAAaUsAAKkNAACS/QAAkg4AACUNAABNugAAVgoAALYCAAC1lQAA1AYAAKkO
+AACSXgAAkg4AACbNAAArBQAAVwoAALayAABaCwAA1AYAAMluAABJBwAAk/YAAJMKAAArBQAAW8oA
+AK0KAABqBQAAVZsAAKQLAABJCwAAk1oAAJUKAAAt9QAANgUAAK0KAACqtQAAsgUAAKUNAABKfQAA
+Sg0AAJUKAQCXCgAAVgUAALXKAADVCgAA0gYAAKWOAAClDgAASgYAAJdsAACbCgAAWvUAAGoFAABp
+CwAAUrcAAFILAAAlCwAAS5YAAEsKAACrFAEArQIAAG0FAABpywAAqQ0AAJINAAAlnQAAJQ0AAE1a
+AQBWCgAAtgIAALXFAADVBgAAqQ4AAJK+AACSDgAAJg0AAFZqAABXCgAA1hQBAFoDAADVBgAAybYA
+AEkHAACTBgAAK5UAACsFAABbCgAAWlUAAGoFAABV+wAApAsAAEkLAACTugAAlQoAAC0FAACtigAA
+tQoAAKo1AQDSBQAApQ0AAErdAABKDQAAlQwAAC6VAABWBQAAtQoAALJVAADSBgAApc4AACUHAABL
+BgAAl6wAAKsMAABaBQAA1moAAGkLAABSdwEAUgsAACULAABL2gAASwoAAKsEAABbpQAArQUAAGoL
+AABSWwAAkg0AACX9AAAlDQAAVQoAAK20AAC2BAAAtQUAAKptAADJDgAAkh4BAJIOAAAmDQAAVsoA
+AFcKAABWBQAA1YYAAFUHAABJBwAAk24AAJMGAAAr9QAAKwUAAFsKAABatQAAagUAAGULAABKlwAA
+SgsAAJUaAQCVCgAALQUAAK3KAAC1CgAAqgUAAKWLAAClDQAASg0AAJV8AACWDAAATvkAAFYFAAC1
+CgAAsrUAANIGAAClDgAASo4AAIsGAACXDAEAqwQAAFsFAADWygAAagsAAFIHAAAllwAARQsAAIsK
+AACbVAAAqwQAAA==
+'''
+
+# 节气时刻 = 基准分钟 + round(序号 * 平均间隔) + 残差（小端序int16）
+JIE_QI_FIRST_MINUTE = 7323
+JIE_QI_STEP = 21914.714285714286
+JIE_QI_RESIDUALS = '''
+AAA+/a/6jvjv9gL2xfVR9or3cfnQ+5L+cgFOBOEGCwmeCoMLqQsQC8YJ3weABdAC/f81/an6hPjr
+9vn1xPVK9oz3a/nV+43+dgFIBOQGBgmeCn4LqQsOC8gJ4AeEBdECAgA3/a/6hvjv9vn1w/VI9of3
+Z/nL+4j+aAFABNMG/wiNCngLmwsKC70J4QeABdcCAQBA/a/6jfjt9v71vvVJ9oH3ZvnF+4T+ZQE8
+BNMG+giQCnILngsFC8AJ2geBBc8CAQA3/a/6hPjt9vX1vvU/9oH3XPnF+37+ZwE6BNUG/AiSCnYL
+nwsIC74J2gd+Bc8C/v84/a36h/jt9vv1wfVH9oT3ZvnF+4T+YgE9BM0G+wiJCnILlQsDC7YJ1gd2
+BcwC9/82/aj6iPjr9v31wfVK9oT3ZvnH+4H+ZQE3BM8G8giLCmoLlwv9CroJ0gd7BckC/P8w/ar6
+f/jp9u/1u/U79nz3WPm++3X+WwEvBMYG7wiECmsLkgsAC7cJ2Ad4Bc4C+f81/aX6gfji9vH1s/U8
+9nT3Wfm4+3n+VwEzBMQG7wiACmgLjQv4CrAJzQdvBcIC8P8q/Z36efjc9un1r/U19nP3Uvm5+3L+
+WQErBMcG6QiBCmELjQvxCq0JxgdtBbsC7/8l/Z/6dfjf9ub1r/Uw9m/3S/mu+2j+SgEgBLUG4Ahw
+ClkLfgvtCqAJwwdiBboC5P8l/ZX6dPjU9uX1pPUs9mP3Rvmi+2L+QAEZBK4G2AhuClMLfgvnCqEJ
+ugdgBa8C3v8W/Yv6YvjI9tP1m/Uc9l33OPmf+1X+PwERBK4G1AhtClALfAvmCp8JugdeBa0C2/8S
+/Yf6XvjD9s71lfUZ9lb3N/mY+1X+NAEOBJ8GzQhdCkgLbAvdCpEJtAdTBaoC0/8R/YH6Xvi99s31
+jvUX9k/3MvmR+07+LwEEBJwGwQhaCjwLagvSCpIJrAdWBaUC2P8M/YP6V/i99sH1ifUF9kT3HfmF
++zv+IgH3A5EGuQhRCjkLYwvRCosJrAdPBaQC0v8N/X76WPi59sP1g/UI9j73H/l9+z3+GwH4A4sG
+ughLCjcLXQvMCoIJowdFBZoCx/8E/XX6Ufiz9sH1gvUI9kH3H/mB+zr+HwHxA44GsghNCi8LXwvF
+CoMJnQdGBZQCyP/+/Hj6TPi29rz1hfUC9kH3Gfl7+zL+FAHoA30GqQg8CicLUAvBCngJnQc/BZcC
+wv8B/XH6Tvit9r31e/UC9jj3Gvl0+zL+DwHoA3sGpwg7CiQLTwu9CngJlwc9BZACvv/3/Gv6Qvim
+9rD1dPX29TP3D/l1+yv+FAHlA4IGpghBCiQLUgu7CngJlAc8BYwCvv/0/Gz6QPin9q31dfX29TP3
+Eflz+y7+DgHoA3oGpwg3CiILRgu3CmwJkAcwBYoCtP/0/GT6RPii9rL1cvX59S73Eflv+yz+DAHk
+A3sGowg6Ch8LTAu0CnMJjgc2BYUCuf/u/GX6Ovig9qX1a/Xp9Sf3//hm+xv+BAHXA3UGnQg4CiAL
+TQu5CnQJkwc3BYkCt//v/GH6OPib9qT1ZvXp9SH3Aflf+x/+/gDbA3AGoAgzCiELSQu6CnAJkwcy
+BYgCsf/u/Fv6NviV9qP1YvXo9SD3APlh+xz+AAHVA3EGmQg1ChkLSwu0CnQJjgc5BYYCuf/t/GT6
+Nfib9p/1ZfXg9R739fhZ+w7+9ADIA2EGjAgjCg8LOguuCmgJjQcyBYoCtv/y/GP6PPiZ9qT1YPXi
+9RX39fhP+w7+6wDHA1sGigggCgwLOAupCmQJhgcsBYICsP/q/Fz6NPiT9pv1W/Xa9RL37fhP+wX+
+7ADAA14GhQgjCggLOQujCmQJgAcqBXoCrv/j/Fr6LviU9pj1X/Xb9Rb37vhP+wb+5gC+A1IGgAgT
+CgILKgudClUJewccBXUCof/g/FD6LviM9pr1V/Xd9Q/37/hK+wX+4QC4A00GeAgPCvgKJwuUClQJ
+dAcdBW8Cof/Y/Ez6IfiF9or1TfXK9QX33Pg/+/T92gCrA0gGbwgLCvIKIwuRClAJcQcaBWwCnf/U
+/Ej6HPh/9oT1RvXF9f722vg4+/X91ACuA0EGcggDCvEKGQuMCkMJaQcLBWQCjv/N/Dv6F/hz9oH1
+PfXC9ff21/g1+/D90wCpA0IGawgFCuoKGQuECkMJXwcLBVoCjv/D/Dz6D/h19nj1PfW39fL2yPgs
++9/9xgCZAzMGXQj3CeEKDQt/CjoJXQcCBVkCh//C/DT6DPhs9nT1M/W09ef2xfgf+9z9uQCWAyoG
+WwjyCeEKCwt+CjgJWwf9BFQCfv+5/Cf6Afhe9mf1JvWo9d72uvgb+9P9uQCOAy0GVQj0CdsKDwt6
+CjwJWAcCBU8Cgv+0/Cr6+/dg9mL1J/Wj9d/2t/ga+9D9swCJAyIGTwjmCdUKAAt1Ci8JVgf5BFEC
+ff+5/Cb6APhc9mf1IfWl9df2t/gQ+8/9rACHAxwGSgjiCc4K/gpvCi8JUwf7BFACf/+4/Cn6/fdc
+9l/1HfWY9dD2pvgI+779pgB5AxkGQwjjCcsKAAtuCjEJUQf+BE8Cgv+5/C36/vdf9mH1IfWa9dL2
+qvgI+8H9owB+AxQGRwjdCc4K+ApvCicJTgfxBEsCdf+0/CL6/vdZ9mX1HvWh9dH2sPgK+8X9pQB9
+AxUGQQjeCcgK+wpqCiwJSgf1BEgCe/+x/Cj6+/df9mH1JPWd9dX2qfgK+7v9nwBxAw0GNgjUCb8K
+8QpkCiYJSgfzBEoCev+z/Cb6/Pdb9mD1H/Wc9c/2qfgD+779mQB1AwgGOQjPCcEK7QpkCiAJSAfs
+BEYCcv+v/Bv69vdQ9ln1E/WV9cj2pPgC+7v9ngByAw8GOAjWCb4K8gpeCiIJQQfuBD4CdP+o/B/6
+7/dU9lX1GPWR9cz2ofgD+7j9mwBvAwkGNAjMCbgK5gpZChUJPAfhBDoCaP+m/Bb68PdO9lf1EvWT
+9cT2ofj5+rf9kgBuAwEGMgjICbYK5ApXChUJOQfhBDcCZf+g/BD65vdD9kr1B/WD9bj2kPjv+qP9
+igBeA/0FJwjJCbEK5wpVChkJNwfkBDMCZv+Z/A/63vdA9kH1A/V79bT2i/jr+qL9hQBeA/YFJwi/
+CbEK3QpUCg4JNQfXBDECWv+W/AL63Pc19j/1+PR79av2i/jk+qH9fwBaA/EFIAi8CagK2wpLCg4J
+MAfaBC0CXv+U/Ab62fc49jn1+PRw9ab2evjc+o79dABGA+UFDgitCZkKzgpACgUJKQfVBCoCXf+U
+/Ab62Pc29jb18vRs9Z72dfjQ+on9ZwBDA9oFDgilCZkKxgo/CvoIJQfJBCQCT/+N/Pj50fcq9jH1
+6PRn9Zb2cPjK+oT9ZQA9A9oFBwinCZIKyQo4CvwIHAfJBBoCTv+D/Pj5yfcs9iv17PRi9Zv2bPjN
++n79YgA1A9AF/QeZCYcKugovCu4IFQe9BBUCRP+A/PD5x/ck9iv15vRj9ZT2bvjE+n/9WgA0A8gF
++geRCYQKswosCusIFAe8BBUCQf98/Or5wPcZ9iD12PRU9YX2Xvi6+m/9UwAnA8YF7weSCXwKtQom
+Cu0IDQe8BA4CQ/92/Ov5ufca9hf12PRN9YT2Wfi5+m79UQApA8MF8geMCX4KqwojCuAICQevBAoC
+Nv9z/OD5ufcT9hr10vRS9YD2Xfi1+nL9TwArA8IF8geMCXwKrAogCuIIBgevBAUCN/9w/OL5t/cU
+9hb10vRK9X72Ufiw+mH9RwAZA7oF4weFCXEKqQoaCt8IAwewBAMCOP9t/OL5svcT9hL10PRH9Xr2
+T/iq+mH9QAAbA7QF6AeBCXcKpgogCt0IBwerBAUCLv9s/Nb5rvcG9g31w/RC9XH2Tfil+mH9QAAa
+A7UF5geGCXQKrAoeCuQIBQeyBAMCNf9q/Nz5q/cK9gr1yfQ/9Xf2Sfiq+lv9QQATA7EF3Qd9CWsK
+oAoXCtsIAQetBAQCNP9s/N75sPcM9g71yPRB9XH2Svii+lz9OQAUA6kF3Qd2CWsKmgoWCtYIAgeq
+BAcCM/9v/Nv5sfcH9gr1v/Q69Wb2P/iY+k/9MQAJA6gF1Qd5CWYKoAoRCtsI/QatBAACNv9q/N75
+rfcM9gf1xvQ49W32PPic+k79MwAJA6YF1gdzCWYKmAoQCtEI+QahBPoBKP9k/NP5qvcE9gn1wPQ+
+9Wr2RPia+lT9LwALA6EF1AduCWIKlQoMCs4I9wagBPgBKP9i/NH5pvcC9gT1vfQ29Wb2OfiT+kX9
+JwD5ApgFwgdmCVIKjQoACsoI7wafBPMBKP9d/NH5n/f/9fv0uPQs9WD2MfiN+kH9IQD4ApAFxAde
+CVQKhQoACr8I6waSBO4BGf9X/MH5mPft9fT0p/Ql9VH2LPiD+j79HAD3ApAFwQdfCU8KhAr5Cb4I
+4gaQBOQBFv9N/L/5kPft9e30qPQd9VH2I/iC+jP9GQDrAooFtAdWCUIKeQruCbMI2AaFBNsBDv9F
+/Ln5ivfo9ef0ovQY9Uj2Hvh2+i39CgDmAn0FsQdLCUEKcQrtCawI2AZ+BNoBBf9B/Kv5gvfX9dz0
+kPQL9Tb2Dfhl+h39/v/XAnYFpgdKCToKdQrpCbII1AaDBNQBCP86/K35evfY9dL0jvQB9Tb2Bfhl
++hf9/P/RAnEFoQdCCTUKawrkCacI0AZ5BNAB//43/KT5dvfP9dD0hvQB9S72Bvhc+hj99P/RAmgF
+ngc5CTAKZArgCaIIzwZ4BNIB//47/Kf5evfR9dH0hfT79Cj2/PdU+gj96/+/Al8FjAcyCSAKXgrT
+CZ8IxQZ5BM0BBP85/K35ePfV9c70iPT39Cn29vdS+gP95v+9AlkFjgctCSQKWArWCZcIxAZuBMoB
+9/40/KD5dffL9c70gPT59CL2+/dO+gj95P/BAloFjwcvCSQKWwrVCZoIwgZuBMcB+P4w/KH5c/fO
+9c30hvT79Cv2+/dW+gT95/+5AlkFhAcpCRgKUwrJCZQIugZrBMIB9/4s/KD5cPfP9cv0h/T69Cr2
++/dU+gf94/+9AlMFhwciCRsKTQrNCZAIvwZoBMUB8v4v/Jn5cPfD9cb0d/Tz9Bz28/dJ+gH93v+3
+AlMFhAcmCRkKVArKCZQIvAZsBMEB9v4r/J35avfH9cH0e/Tt9CD27/dN+v/85P+3AlgFhQcnCRcK
+UArHCY0ItgZjBLsB7P4l/Jb5Z/fD9cH0efTv9B328/dJ+gP93/+8AlMFigckCRsKTQrJCYoItgZg
+BLwB6f4n/JP5afe+9cH0c/Tr9BX26fc/+vP81f+rAkoFegcfCQ8KTArBCY0IsQZkBLcB7P4f/JT5
+YPe+9bf0cvTh9BL24Pc8+uz80f+nAkUFeAcbCREKSArFCYgIswZbBLUB4f4b/Ib5Wfeu9a/0Y/Tc
+9AX23vcy+u38yf+oAkAFeAcXCQ8KRgrCCYgIsgZdBLUB4/4a/IX5V/et9av0YfTW9AT21fcw+uL8
+xf+ZAjoFZgcNCf0JOwqxCX8IpQZYBKwB4/4W/Ij5VPew9af0YPTQ9P/1zfco+tr8uv+TAi4FYwcB
+CfsJMAqxCXQIpgZPBK4B2/4X/H/5Uvek9aP0UfTI9O31w/cU+s78q/+IAiUFWgf+CPQJMAqqCXQI
+ngZOBKQB1/4O/H35S/ek9Z30U/TB9PD1vPcX+sf8rP+AAiIFUgf4COoJKAqhCWoIkgZDBJkBzP4D
+/HX5Q/ee9Zr0UPTC9O/1wPcV+sr8pv+BAhgFUQftCOgJHQqfCWIIkgY8BJsBx/4E/G/5RPeW9Zj0
+RvS99OP1t/cJ+rz8mv9wAg0FPQfkCNcJFgqQCV8IhwY8BJIByf79+3D5O/eW9Yz0RfSy9OH1rfcI
++rX8mP9tAgwFPAfhCNcJEQqOCVYIgwYxBIwBvP71+2L5M/eJ9Yb0OfSt9Nb1q/f/+bj8k/9xAgkF
+QQfeCNgJDgqNCVMIgAYsBIgBt/7y+175MveG9YX0N/St9Nb1p/f/+bD8kv9lAgYFNAfaCMsJCgqA
+CU0IdAYoBH0Btv7q+175KveI9YD0OPSn9Nb1off6+av8jP9jAgAFNAfVCM4JBgqGCUoIegYkBIEB
+rv7q+1P5Jvd69Xn0KPSe9MX1mvfr+aX8gf9eAvkEMgfVCM8JCwqICVEIfAYrBIIBsv7p+1X5I/d5
+9XX0KfSZ9Mj1lvfw+aD8h/9aAv0ELQfWCMkJCAqCCU8IdwYqBH4Bsv7l+1b5Ifd79XP0KvSZ9Mf1
+l/fv+aP8g/9eAvgEMAfPCMsJAgqFCUoIfAYmBIcBs/7w+1j5K/d79Xn0JfSa9L71kvfj+Zn8dv9R
+Au4EIgfJCMAJ/wl7CUsIdgYqBIMBuf7u+1/5KveC9Xf0LPSX9MP1i/fm+ZP8d/9NAvAEIgfJCMEJ
+/wl8CUcIcwYjBHwBr/7n+1X5JPd69XT0JfSX9L/1j/fi+Zj8c/9RAusEJgfGCMQJ/Al+CUQIdQYg
+BH0Bq/7n+1D5JPd39Xb0JfSa9MD1kffj+ZX8c/9IAugEGAfACLMJ9glvCT8IaQYeBHQBq/7g+1P5
+Hfd59W/0JvSR9MD1iffh+Y/8cP9DAuEEFAe4CLEJ7QluCTcIaAYXBHQBov7d+0f5F/do9WX0E/SG
+9Kz1f/fP+Yf8Yv9AAtkEEwe0CK8J6glsCTYIZQYVBHABoP7Z+0X5E/dm9WH0EfSB9Kr1effQ+YD8
+Zf85AtsECgezCKUJ5glfCS4IVgYKBGEBl/7L+z/5CPdj9Vj0D/R79Kf1dPfL+X38XP82AtIECQeq
+CKYJ3QlfCSUIVgYBBGEBjv7M+zX5CfdZ9Vf0A/R39Jj1ave5+W/8Sv8mAsIE+QafCJkJ2AlWCSQI
+UAYCBFsBj/7E+zP5//ZV9Uz0/vNr9JX1Xfe3+WP8R/8bAsAE8QacCJQJ1QlSCSAISwb9A1MBhv66
++yj58vZJ9UD08vNi9Iv1Wfet+WP8P/8cArgE8waUCJMJzQlSCRkITQb4A1YBgv6++yT59vZF9UL0
+7fNh9IX1V/eo+Vz8Of8QAq8E4gaKCIAJxAlACRIIPQb1A0wBg/64+yn58vZK9T708fNZ9Ib1TPel
++VH8Nf8JAqoE3QaECH4JvAk/CQsIPAbuA0sBfP61+yH57/ZA9Tn05fNU9Hf1R/eW+Uz8KP8GAqEE
+3QaBCIAJvAlBCQoIPAbrA0oBeP6z+x757vY/9Tn05vNW9Hr1SPeb+Uv8LP8CAqUE1gaDCHgJuwk2
+CQgIMgbnAz4Bdf6o+xv55fY/9TP06vNU9ID1SPeg+U38Lf8EAqIE2AZ8CHoJtQk5CQMINwbkA0QB
+c/6v+xj56vY69Tb04PNT9HT1RfeT+Uj8IP/8AZcEzwZ0CHIJsQk0CQIINAbnA0MBdv6u+xr55vY6
+9TH04PNM9HT1PfeU+UH8Jf/4AZ0EzgZ5CG8JswkwCQEILgbjAzoBcP6l+xX53fY19Sn02/NG9HD1
+PPeR+UX8I///AZsE1gZ4CHcJsQk2Cf0HMQbeAz4Bav6o+xD54vYw9S702PNL9G31PfeM+UH8Hf/3
+AZUEywZyCGoJrAkqCfoHJgbcAzQBav6f+xH52/Yz9Sj02vND9G31NPeM+Tf8G//vAZIExQZwCGoJ
+qwktCfsHKgbbAzYBZ/6d+wr51PYn9R30zPM59F31LPd8+TH8DP/sAYcExQZqCG0JqQkwCfsHLgbb
+AzoBZf6f+wX51PYh9Rv0xvM29Fn1KPd7+S38Df/lAYgEuwZnCGAJpgkjCfcHIgbZAy8BZv6X+wf5
+zvYl9Rb0yPMx9Fz1Ivd7+Sn8C//hAYIEuAZfCF0JnAkiCe4HIwbTAzMBY/6d+wb50/Yi9Rn0wfMv
+9E31G/dn+R389v7UAXAErAZSCFIJkwkZCegHHQbQAy8BYP6b+wX50vYi9Rf0wPMq9E31FPdn+RT8
+9v7LAXAEpQZTCEsJkwkRCeUHEQbJAyEBWP6M+/z4w/Ya9Qz0vfMj9Ev1Evdl+RP88v7MAWoEpQZL
+CEwJiQkSCdwHEgbAAyEBTv6K+/P4xPYS9Q70tvMm9ET1FPdf+RL86v7EAV8ElgY+CDsJfQkBCdMH
+BAa6AxYBS/6C+/H4vPYQ9QT0tPMc9EP1Cfde+Qf86P66AV0EjgY6CDMJeQn6CM4H/wW1AxABRf56
+++j4sfYE9fbzpfMO9DL1/PZO+QD82/65AVQEkQY0CDcJcwn8CMgH/gWtAw4BPf55+9/4sPb89PXz
+nPMN9Cz1+/ZL+f772/60AVUEigY0CC0JcgnvCMIH7wWnA/8AN/5r+9z4pPb89O3znvMG9C/19PZL
++ff72v6vAVMEiAYxCCwJbgnxCL8H8QWjAwABMv5r+9b4o/b09OrzlPMA9CD17PY4+e37xv6lAUAE
+fwYlCCgJaAnxCL4H8wWkAwMBMf5s+9P4ofbu9ObzjvP68xz15vY3+eX7x/6dAUMEeQYpCCMJbAns
+CMIH7gWmA/sAMf5h+9H4lfbq9Nrzi/Pw8xn14PY2+eT7xv6fAUAEegYkCCYJZgnwCL0H8wWiAwMB
+MP5q+9H4nvbp9OHziPP28xT14/Yu+eP7vP6aATYEcQYZCBoJXQnjCLcH6wWhAwABM/5r+9b4ofbw
+9OLzjfP08xb12/Yv+dn7vP6QATYEagYZCBQJXQnfCLcH5wWgA/oAMv5l+9P4mvbt9Nvzh/Ps8w/1
+1PYm+dX7sv6PAS4EbQYUCBsJWwnmCLMH7AWbA/4ALP5p+8/4nvbq9OLzhvP08xD13fYo+dv7tf6P
+ATAEaAYUCBEJWQncCLAH4QWZA/MAKf5f+834lvbr9Nzzi/Pw8xf12vYv+dj7uv6MATAEZQYRCA4J
+VQnaCK0H4AWXA/UAKf5h+834lvbm9Nnzg/Pr8wz11fYg+dH7qv6HASEEYAYFCAoJSgnXCKcH4AWT
+A/YAJf5h+8n4l/bh9NjzffPo8wX10PYd+cz7q/6CASUEWgYKCAQJTQnPCKYH1AWOA+cAH/5S+8P4
+iPbc9MnzefPc8wP1x/Yd+cj7qv6CASQEXAYHCAcJSAnPCJ8H1AWGA+cAF/5R+7r4iPbW9Mzzc/Pf
+8/v0x/YR+cX7nP56ARUEUgb4B/sIPQnFCJYHywV/A94AEf5L+7X4gvbR9MXzbfPW8/f0vPYN+bj7
+mP5sARMERwb3B/MIPQm/CJYHxgV/A9cADv4/+634cfbF9LPzYPPE8+n0rfb/+K37jP5mAQcERQbv
+B/UINwnECJIHywV6A9sAB/5C+6b4cva89LLzVvPC89/0rfb4+K37h/5jAQEEPQboB+kIMAm2CIsH
+vQV1A9AABP46+6X4bPa89KzzV/O88+D0pPb4+KL7hv5ZAf8DNQbkB+EIKQmvCIYHuQVyA88ABf46
++6f4bPa79KrzUvO189P0mfbm+JX7cf5OAewDLAbVB9wIHgmtCH0HuAVqA88A/v07+6H4bva29Krz
+TPO18870mPbi+JH7bf5IAewDJgbXB9YIIAmkCH0HrQVnA8EA+P0r+5n4X/ay9J7zTPOt89H0kvbm
++I/7cP5HAesDJAbTB9UIHAmlCHkHrwVjA8IA9P0s+5X4YPau9KDzR/Ow88z0lPbe+I/7Zf5CAd4D
+HAbDB8oIDgmbCG0HqAVcA78A8P0r+5L4X/aq9J7zQ/Os88n0jvbb+Ij7Zv46Ad8DFAbFB8IIEAmU
+CG8HogVeA7gA8f0j+5L4VPan9JHzPPOc88H0gvbU+ID7YP45AdoDGAbDB8gIDQmaCGsHpAVYA7sA
+6v0m+4z4V/ag9JXzN/Oh87v0h/bQ+IT7Xv47AdkDFwbBB8MICAmSCGYHmwVSA7EA5f0d+4n4U/ah
+9JPzO/Og88D0hPbV+H/7Yv42Ad0DEgbEB8EIDAmRCGkHmgVUA7EA6P0c+4v4T/ag9IzzN/OY87f0
+e/bI+HX7UP4tAc0DDQa4B8EIBQmUCGYHogVTA7gA5f0h+4T4UvaZ9I3zL/OY87D0evbE+HX7T/4s
+Ac4DCga6B70ICQmQCGkHnAVVA68A5f0Y+4P4SPaX9IPzLfOP87L0c/bH+HD7U/4oAdADCAa5B7sI
+BgmPCGYHnQVVA7IA5/0c+4X4S/aZ9IfzLPOR8630c/a9+G77Rv4jAcEDAQapB7EI9giGCFgHlgVL
+A7EA4f0f+4T4UPaZ9IvzK/OR86r0b/a4+Gb7Qv4ZAb4D9wWqB6kI+Ah+CFoHjAVLA6YA3/0S+4H4
+Q/aT9H3zJvOD86X0Yvaz+Fv7PP4UAbgD9gWlB6sI8wiBCFUHjwVEA6YA1/0Q+3j4QvaM9H7zIPOH
+85/0aPav+GD7OP4VAbID8QWcB6MI6Qh3CEwHhAU6A5wAzv0H+3D4O/aG9HjzHvOD86D0ZPax+Fr7
+Of4NAbID6AWbB5kI5whtCEoHfQU6A5cAz/0C+3D4M/aD9GzzFvN085T0U/ai+Ez7KP4CAaID4AWL
+B5UI2ghrCD8HfQUxA5YAx/0D+2f4M/Z59GvzCvNy84j0UPaY+Er7Iv7/AKAD3QWLB5AI2ghjCDsH
+cQUqA4gAvv3z+l34I/Zx9F3zBPNm84X0RfaX+ED7I/74AKED2AWLB4sI2AhfCDcHbAUmA4IAuP3u
++ln4HvZu9FrzAfNi83/0QfaM+Dr7FP7wAI4D0AV6B4MIyQhZCCsHaAUdA4EAsP3u+lL4HvZl9Fnz
+9/Je83X0O/aD+DD7DP7lAIkDxQV4B3sIyghTCC8HYgUfA3kAsP3h+k34DvZc9EXz7fJK82v0KvZ7
++CP7Bv7cAIQDwAV0B3oIxwhVCC0HZgUdA34Ar/3l+kz4EfZa9Efz6fJN82b0LvZ2+Cf7AP7fAH0D
+vwVrB3QIvAhNCCMHYAUWA3oAq/3l+kr4FPZa9Erz6/JO82f0K/Z3+CL7Af7YAH8DtwVrB20IvQhF
+CCQHWQUZA3YAsf3k+lH4E/Zh9Efz7PJH82T0IPZv+Bb79f3NAHIDsgVhB20ItghICB4HXgUUA3oA
+rf3o+k74F/Ze9E3z6vJP82L0J/Zr+Bz78v3RAHIDtAVjB2sIuAhGCB4HWAURA3IApv3e+kf4DvZa
+9Efz6vJL82f0JvZ0+Bz7/P3QAHgDsQVnB2kIughECCEHVgUUA3EAqf3d+kn4DPZb9Ebz7fJL82j0
+J/Zx+Bv79f3OAGwDrQVYB2MIqgg/CBQHVAULA3IAo/3g+kX4EfZW9Enz5vJL82D0JvZr+Bn78v3L
+AGwDqAVaB18IrQg6CBYHTgULA2oAov3V+kH4BPZQ9Djz3/I781n0F/Zn+A778P3GAG4DqAVdB2EI
+rgg6CBUHTgUIA2kAnv3T+j34AvZN9Djz2/I881X0GfZi+BL76v3JAGcDqQVUB18IpQg2CAoHRwX8
+AmEAkv3O+jP4//VG9Dfz1fI781L0FvZf+Av76P3AAGYDoQVVB1gIqAgwCA0HQgUAA1wAlv3H+jT4
+9fVE9Crz0PIr80j0A/ZS+Pn62f2wAFcDlgVIB1IIoAgxCAkHRwX+AmAAkP3J+i348/U69CbzxPIm
+8zz0AfZG+Pf6zv2uAE4DkwVCB04ImggsCAQHPwX4AlkAif3B+iX46vUw9B3zvPId8zf0+PVF+O76
+z/2mAE8DigVBB0QIlwgjCAIHOQX5AlUAjf2++ir46fU19BrzvvIX8zP07/U7+OP6wP2aADwDfQUs
+BzkIgggYCPAGMQXpAlEAgv2/+iP47PUv9Bzzt/IY8yn07fUv+N36tP2SADMDdAUnBzEIgAgQCO4G
+KAXlAkYAff2y+hv43/Uo9A/zsfIL8yT03/Us+NH6sv2IADIDbQUlBywIfwgNCO0GJQXjAkEAef2s
++hb42fUk9AvzrfIL8yP04fUq+NT6rP2IACgDawUYBycIcAgGCNwGHwXVAjwAbf2p+g341/Uc9Azz
+qPIN8yD04/Un+NT6rP2EACgDZAUYBx0IcAj9B90GFwXYAjcAcf2k+hD40PUd9AHzpPL88hn00vUf
++MP6o/14AB4DXAUQBxkIagj8B9kGFwXUAjgAbP2l+gz40fUX9AHznvL98hL00/UX+Mb6nv19ABwD
+YgUPBxwIZgj7B9MGEgXLAjAAYv2d+gL4yvUP9P3ymvL68hD00fUa+MT6o/16ACIDXQUWBxkIbAj4
+B9gGDgXOAisAZf2X+gb4xvUU9PnynvL28hL0zPUX+L36mv1zABcDVwUJBxUIYQj1B88GDwXHAi4A
+YP2b+v/3yfUN9Pvyl/L48gr0zPUP+L36kv1xABIDVQUHBxQIZAj2B9QGEAXLAiwAYP2V+vv3v/UF
+9O7yjfLr8gP0wPUM+LP6lP1pABUDUQULBxMIaAj2B9gGEQXQAi4AZv2W+gD4vvUJ9O3yjvLp8gP0
+wPUL+Lb6kf1tAA8DUgUBBxAIXAjzB8sGDgXGAi4AXv2b+vz3xfUH9PXyjfLu8gD0w/UH+LX6jv1p
+AA0DTQUCBwoIXQjsB80GCAXJAioAY/2Y+gL4wvUK9O/yjvLk8v3ztPX/96L6hP1ZAAQDQgX7BgUI
+WAjrB8sGCAXHAikAYP2W+v/3wfUI9O/yjPLm8vnzt/X696b6fv1dAP4CRAX1BgYIUgjrB8QGBQW9
+AiQAVP2O+vL3uvX88+nyhPLk8vbzt/X796X6gP1YAP8CPQX2Bv0HUgjgB8QG/AS+AhwAVv2H+vP3
+s/X+8+HyhfLb8vXzrPX495r6d/1NAPICMAXkBvEHQQjXB7UG9wSzAhkATv2I+u33s/X38+DyevLZ
+8unzqfXq95f6a/1JAOgCLQXdBuwHOwjRB64G7wSrAhAARP18+uD3pfXp89Hya/LI8tzzmPXh94n6
+aP0+AOkCJQXfBuUHPAjKB60G5wSoAgYAQP1z+t73nPXo88rya/LB8tvzlPXe94b6Yv08AN8CIwXT
+BuEHLgjFB50G3wSYAgAA
+'''
+
+JIE_QI_ORDER = ["小寒", "大寒", "立春", "雨水", "惊蛰", "春分", "清明", "谷雨", "立夏", "小满", "芒种", "夏至", "小暑", "大暑", "立秋", "处暑", "白露", "秋分", "寒露", "霜降", "立冬", "小雪", "大雪", "冬至"]
+MONTH_NAMES = ["", "正", "二", "三", "四", "五", "六", "七", "八", "九", "十", "冬", "腊"]
+DAY_NAMES = ["", "初一", "初二", "初三", "初四", "初五", "初六", "初七", "初八", "初九", "初十", "十一", "十二", "十三", "十四", "十五", "十六", "十七", "十八", "十九", "二十", "廿一", "廿二", "廿三", "廿四", "廿五", "廿六", "廿七", "廿八", "廿九", "三十"]
+
+LUNAR_FESTIVALS = {"1-1": "春节", "1-15": "元宵节", "2-2": "龙头节", "5-5": "端午节", "7-7": "七夕节", "8-15": "中秋节", "9-9": "重阳节", "12-8": "腊八节"}
+SOLAR_FESTIVALS = {"1-1": "元旦节", "2-14": "情人节", "3-8": "妇女节", "3-12": "植树节", "3-15": "消费者权益日", "4-1": "愚人节", "5-1": "劳动节", "5-4": "青年节", "6-1": "儿童节", "7-1": "建党节", "8-1": "建军节", "9-10": "教师节", "10-1": "国庆节", "10-31": "万圣节前夜", "11-1": "万圣节", "12-24": "平安夜", "12-25": "圣诞节"}
+SOLAR_WEEK_FESTIVALS = {"3-0-1": "全国中小学生安全教育日", "5-2-0": "母亲节", "5-3-0": "全国助残日", "6-3-0": "父亲节", "9-3-6": "全民国防教育日", "10-1-1": "世界住房日", "11-4-4": "感恩节"}
+CHU_XI = "除夕"
+
+# 六十甲子及起始日的日干支序号
+JIA_ZI = ["甲子", "乙丑", "丙寅", "丁卯", "戊辰", "己巳", "庚午", "辛未", "壬申", "癸酉", "甲戌", "乙亥", "丙子", "丁丑", "戊寅", "己卯", "庚辰", "辛巳", "壬午", "癸未", "甲申", "乙酉", "丙戌", "丁亥", "戊子", "己丑", "庚寅", "辛卯", "壬辰", "癸巳", "甲午", "乙未", "丙申", "丁酉", "戊戌", "己亥", "庚子", "辛丑", "壬寅", "癸卯", "甲辰", "乙巳", "丙午", "丁未", "戊申", "己酉", "庚戌", "辛亥", "壬子", "癸丑", "甲寅", "乙卯", "丙辰", "丁巳", "戊午", "己未", "庚申", "辛酉", "壬戌", "癸亥"]
+FIRST_DAY_GAN_ZHI = 10
@@ -121,6 +121,20 @@ class MCPClientIntegration:
             tags = await self.call_tool("get_calendar_tags")
             reminders = await self.call_tool("get_calendar_reminders")
             return {"tags": tags, "reminders": reminders}
+    
+    async def search_auspicious_days(self, yi: List[str] = None, avoid_ji: List[str] = None,
+                                     start_date: str = None, end_date: str = None,
+                                     weekends_only: bool = False) -> List[Dict[str, Any]]:
+        """择日：按宜/忌事项检索日期"""
+        return await self.call_tool("search_auspicious_days", {
+            "yi": yi or [], "avoid_ji": avoid_ji or [],
+            "start_date": start_date, "end_date": end_date,
+            "weekends_only": weekends_only
+        })
+    
+    async def search_calendar_text(self, query: str, scope: str = "all", limit: int = 20) -> List[Dict[str, Any]]:
+        """全文搜索标签内容和聊天记录"""
+        return await self.call_tool("search_calendar_text", {"query": query, "scope": scope, "limit": limit})
 
 
 class MCPAsyncRunner:
@@ -226,23 +240,32 @@ class SimpleMCPWrapper:
             if not db_path.exists():
                 return {"error": "数据库不存在"}
             
-            import sqlite3
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+            from calendar_store import TagRepo, ReminderRepo
             
             # 获取标签和提醒
-            cursor.execute("SELECT * FROM tags ORDER BY date")
-            tags = [dict(row) for row in cursor.fetchall()]
-            
-            cursor.execute("SELECT * FROM reminders ORDER BY date, time")
-            reminders = [dict(row) for row in cursor.fetchall()]
-            
-            conn.close()
+            tags = [tag._asdict() for tag in TagRepo(db_path).all()]
+            reminders = [reminder._asdict() for reminder in ReminderRepo(db_path).all()]
             
             return {"tags": tags, "reminders": reminders}
         except Exception as e:
             return {"error": str(e)}
+    
+    def search_calendar_text(self, query: str, scope: str = "all", limit: int = 20) -> List[Dict[str, Any]]:
+        """全文搜索标签内容和聊天记录"""
+        try:
+            db_path = self.calendar_root / "calendar_data.db"
+            if not db_path.exists():
+                return [{"error": "数据库不存在"}]
+            
+            import db_connection
+            from text_search import search_all
+            conn = db_connection.connect(str(db_path))
+            try:
+                return search_all(conn, query, scope, limit)
+            finally:
+                conn.close()
+        except Exception as e:
+            return [{"error": str(e)}]
 
 
 class MCPManager:
@@ -338,6 +361,10 @@ class MCPManager:
         """获取日历数据"""
         return self.wrapper.get_calendar_data()
     
+    def search_calendar_text(self, query: str, scope: str = "all", limit: int = 20) -> List[Dict[str, Any]]:
+        """全文搜索标签内容和聊天记录"""
+        return self.wrapper.search_calendar_text(query, scope, limit)
+    
     def get_file_system_info(self) -> Dict[str, Any]:
         """获取文件系统信息"""
         return {"status": "MCP服务运行中（简化版）"}
@@ -15,6 +15,9 @@ from datetime import datetime
 from mcp.server.fastmcp import FastMCP
 from mcp.types import TextContent
 
+import db_connection
+from calendar_store import TagRepo, ReminderRepo
+
 # 创建MCP服务器实例
 mcp = FastMCP("CalendarApp Filesystem Server")
 
@@ -263,7 +266,7 @@ async def query_calendar_db(query: str) -> List[Dict[str, Any]]:
         if not DB_PATH.exists():
             return [{"error": "数据库文件不存在"}]
         
-        conn = sqlite3.connect(str(DB_PATH))
+        conn = db_connection.connect(str(DB_PATH))
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
@@ -299,20 +302,7 @@ async def get_calendar_tags(date: str = None) -> List[Dict[str, Any]]:
         if not DB_PATH.exists():
             return [{"error": "数据库文件不存在"}]
         
-        conn = sqlite3.connect(str(DB_PATH))
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        if date:
-            cursor.execute("SELECT * FROM tags WHERE date = ?", (date,))
-        else:
-            cursor.execute("SELECT * FROM tags ORDER BY date")
-        
-        rows = cursor.fetchall()
-        results = [dict(row) for row in rows]
-        
-        conn.close()
-        return results
+        return [tag._asdict() for tag in TagRepo(DB_PATH).all(date)]
     
     except Exception as e:
         return [{"error": str(e)}]
@@ -333,20 +323,104 @@ async def get_calendar_reminders(date: str = None) -> List[Dict[str, Any]]:
         if not DB_PATH.exists():
             return [{"error": "数据库文件不存在"}]
         
-        conn = sqlite3.connect(str(DB_PATH))
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        if date:
-            cursor.execute("SELECT * FROM reminders WHERE date = ?", (date,))
-        else:
-            cursor.execute("SELECT * FROM reminders ORDER BY date, time")
-        
-        rows = cursor.fetchall()
-        results = [dict(row) for row in rows]
-        
-        conn.close()
-        return results
+        return [reminder._asdict() for reminder in ReminderRepo(DB_PATH).all(date)]
+    
+    except Exception as e:
+        return [{"error": str(e)}]
+
+
+_zeri_index = None
+
+
+def get_zeri_index():
+    """获取择日索引（首次使用时创建，缺少索引的年份会通过lunar.js批量构建）"""
+    global _zeri_index
+    if _zeri_index is None:
+        from almanac_cache import AlmanacCache, PrecomputedAlmanac
+        from db_schema import migrate_file
+        from lunar_js_integration import LunarJSBridge
+        from zeri_index import ZeRiIndex
+
+        bridges = []
+
+        def get_bridge():
+            # 只有预计算文件未覆盖的年份才需要启动node
+            if not bridges:
+                bridges.append(LunarJSBridge())
+            return bridges[0]
+
+        # 日历应用尚未升级数据库时由这里创建黄历缓存和择日索引表
+        migrate_file(str(DB_PATH))
+        almanac_cache = AlmanacCache(str(DB_PATH), get_bridge, precomputed=PrecomputedAlmanac.open_default())
+        _zeri_index = ZeRiIndex(str(DB_PATH), almanac_cache)
+    return _zeri_index
+
+
+@mcp.tool()
+async def search_auspicious_days(yi: List[str] = None, avoid_ji: List[str] = None,
+                                 start_date: str = None, end_date: str = None,
+                                 weekends_only: bool = False, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    择日：按黄历宜/忌事项检索日期
+    
+    Args:
+        yi: 宜中必须全部包含的事项，例如 ["嫁娶"]
+        avoid_ji: 忌中不能包含的事项，例如 ["动土"]
+        start_date: 起始日期（格式：YYYY-MM-DD），默认今天
+        end_date: 结束日期（格式：YYYY-MM-DD），默认起始日期后183天
+        weekends_only: 是否只返回周六、周日
+        limit: 最多返回的天数
+    
+    Returns:
+        满足条件的日期列表
+    """
+    try:
+        from datetime import date, timedelta
+        from zeri_index import WEEKEND
+
+        start = date.fromisoformat(start_date) if start_date else date.today()
+        end = date.fromisoformat(end_date) if end_date else start + timedelta(days=183)
+        index = get_zeri_index()
+        days = await asyncio.to_thread(
+            index.search, start, end, yi=yi or [], avoid_ji=avoid_ji or [],
+            weekdays=WEEKEND if weekends_only else None, limit=limit
+        )
+        weekday_names = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
+        return [{"date": day.isoformat(), "weekday": weekday_names[day.weekday()]} for day in days]
+    
+    except Exception as e:
+        return [{"error": str(e)}]
+
+
+@mcp.tool()
+async def search_calendar_text(query: str, scope: str = "all", limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    全文搜索标签内容和AI聊天记录（支持中文任意子串，结果按相关度排序，匹配处用【】标出）
+    
+    Args:
+        query: 搜索关键词
+        scope: 搜索范围："tags"（标签）、"chat"（聊天记录）或 "all"（两者）
+        limit: 每个范围最多返回的条数
+    
+    Returns:
+        匹配结果列表
+    """
+    try:
+        if not DB_PATH.exists():
+            return [{"error": "数据库文件不存在"}]
+        if not query.strip():
+            return [{"error": "请提供搜索关键词"}]
+        
+        def run():
+            from text_search import search_all
+            
+            conn = db_connection.connect(str(DB_PATH))
+            try:
+                return search_all(conn, query, scope, limit)
+            finally:
+                conn.close()
+        
+        return await asyncio.to_thread(run)
     
     except Exception as e:
         return [{"error": str(e)}]
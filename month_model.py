@@ -0,0 +1,128 @@
+# month_model.py
+# 月视图数据模型：一个月的格子排列、农历、节日节气和标签标记打包成不可变的MonthModel，
+# 按 (年, 月, 数据版本) 缓存；标签等数据写入后版本号加一，旧版本的模型自然失效
+
+import calendar
+from collections import namedtuple, OrderedDict
+
+# 单日数据：lunar为"X月Y"，festivals为农历节日、公历节日、节气组成的元组，tag_color为None表示没有标签
+DayCell = namedtuple("DayCell", ["day", "lunar", "festivals", "tag", "tag_color"])
+
+
+class MonthModel(namedtuple("MonthModel", ["year", "month", "version", "grid", "cells", "lunar_ready"])):
+    """
+    一个月的显示数据（不可变）
+
+    grid: 42个格子对应的日期（0表示该格子不属于本月）
+    cells: 按日期排列的DayCell元组，cells[day - 1]
+    lunar_ready: 农历是否已填入（非快速后端在后台查询完成前为False）
+    """
+
+    __slots__ = ()
+
+    @property
+    def rows(self):
+        """本月实际占用的行数"""
+        return (self.grid.index(len(self.cells)) // 7) + 1
+
+    def cell(self, day):
+        return self.cells[day - 1]
+
+    def lunar_text(self, day):
+        """格子中显示的农历文字："X月Y 节日,节气\""""
+        cell = self.cells[day - 1]
+        if not cell.lunar:
+            return ""
+        if cell.festivals:
+            return cell.lunar + " " + ",".join(cell.festivals)
+        return cell.lunar
+
+    def lunar_texts(self):
+        """{day: 农历文字}"""
+        return {cell.day: self.lunar_text(cell.day) for cell in self.cells if cell.lunar}
+
+    def tags(self):
+        """{"YYYY-MM-DD": {"tag", "color"}}"""
+        return {f"{self.year}-{self.month:02d}-{cell.day:02d}": {"tag": cell.tag, "color": cell.tag_color}
+                for cell in self.cells if cell.tag_color}
+
+    def with_lunar(self, lunar_cells):
+        """返回填入农历后的新模型"""
+        return build_month_model(self.year, self.month, self.version, lunar_cells, self.tags())
+
+    def with_version(self, version, tags):
+        """数据版本变化后，保留农历、换上新标签的新模型"""
+        lunar_cells = self.lunar_cells() if self.lunar_ready else None
+        return build_month_model(self.year, self.month, version, lunar_cells, tags)
+
+    def lunar_cells(self):
+        """{day: (农历, 节日节气元组)}，用于在新版本中复用农历数据"""
+        return {cell.day: (cell.lunar, cell.festivals) for cell in self.cells}
+
+
+def lunar_cells_from_provider(month_cells):
+    """把LunarProvider.get_month_cells的结果转换为 {day: (农历, 节日节气元组)}"""
+    result = {}
+    for cell in month_cells:
+        festivals = []
+        if cell.get("lunar_festivals"):
+            festivals.extend(cell["lunar_festivals"])
+        if cell.get("solar_festivals"):
+            festivals.extend(cell["solar_festivals"])
+        if cell.get("jie_qi"):
+            festivals.append(cell["jie_qi"])
+        result[cell["day"]] = (f"{cell['lunar_month']}月{cell['lunar_day']}", tuple(festivals))
+    return result
+
+
+def build_month_model(year, month, version, lunar_cells, tags):
+    """
+    构建MonthModel
+
+    Args:
+        lunar_cells: {day: (农历, 节日节气元组)}，为None表示农历尚未查询
+        tags: {"YYYY-MM-DD": {"tag", "color"}}
+    """
+    grid = [day for week in calendar.monthcalendar(year, month) for day in week]
+    grid += [0] * (42 - len(grid))
+
+    cells = []
+    for day in range(1, calendar.monthrange(year, month)[1] + 1):
+        lunar, festivals = (lunar_cells or {}).get(day, ("", ()))
+        tag = tags.get(f"{year}-{month:02d}-{day:02d}")
+        cells.append(DayCell(day, lunar, festivals,
+                             tag["tag"] if tag else None, tag["color"] if tag else None))
+    return MonthModel(year, month, version, tuple(grid), tuple(cells), lunar_cells is not None)
+
+
+class MonthModelCache:
+    """按 (年, 月, 数据版本) 缓存MonthModel，按最近使用淘汰"""
+
+    def __init__(self, max_size=24):
+        self.max_size = max_size
+        self.models = OrderedDict()
+
+    def get(self, year, month, version):
+        key = (year, month, version)
+        model = self.models.get(key)
+        if model is not None:
+            self.models.move_to_end(key)
+        return model
+
+    def put(self, model):
+        key = (model.year, model.month, model.version)
+        self.models[key] = model
+        self.models.move_to_end(key)
+        while len(self.models) > self.max_size:
+            self.models.popitem(last=False)
+
+    def latest(self, year, month):
+        """该月份任意版本中最新的模型（用于在数据版本变化后复用农历）"""
+        found = None
+        for (model_year, model_month, version), model in self.models.items():
+            if (model_year, model_month) == (year, month) and (found is None or version > found.version):
+                found = model
+        return found
+
+    def clear(self):
+        self.models.clear()
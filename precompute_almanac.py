@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+黄历预计算工具
+用多进程批量计算指定年份范围内每天的完整黄历（宜忌、星宿、彭祖百忌、方位、冲煞、宫、兽等，
+与右键详情弹窗的字段相同），按月列存储压缩后写入almanac.db，随程序一起发布
+
+用法:
+    python precompute_almanac.py                     # 计算1900-2100年
+    python precompute_almanac.py --start 2020 --end 2030 --workers 4
+    python precompute_almanac.py --engine python     # 使用lunar-python代替Node.js
+
+中断后重新运行会跳过已完成的月份
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import subprocess
+import multiprocessing
+
+from almanac_cache import PRECOMPUTED_PATH, PRECOMPUTED_FORMAT, encode_month
+
+# lunar-python中与lunar_js_integration.ALMANAC_FUNCTION对应的方法
+PYTHON_FIELDS = {
+    "animal": "getAnimal",
+    "xiu": "getXiu",
+    "zheng": "getZheng",
+    "xiu_luck": "getXiuLuck",
+    "peng_zu_gan": "getPengZuGan",
+    "peng_zu_zhi": "getPengZuZhi",
+    "day_position_xi": "getDayPositionXi",
+    "day_position_xi_desc": "getDayPositionXiDesc",
+    "day_position_yang_gui": "getDayPositionYangGui",
+    "day_position_yang_gui_desc": "getDayPositionYangGuiDesc",
+    "day_position_yin_gui": "getDayPositionYinGui",
+    "day_position_yin_gui_desc": "getDayPositionYinGuiDesc",
+    "day_position_fu": "getDayPositionFu",
+    "day_position_fu_desc": "getDayPositionFuDesc",
+    "day_position_cai": "getDayPositionCai",
+    "day_position_cai_desc": "getDayPositionCaiDesc",
+    "day_chong_desc": "getDayChongDesc",
+    "day_sha": "getDaySha",
+    "gong": "getGong",
+    "shou": "getShou",
+}
+
+# 每个工作进程中的计算后端
+_engine = None
+_bridge = None
+
+
+def _init_worker(engine):
+    """工作进程初始化：node引擎启动一个常驻lunar.js进程，之后所有月份复用"""
+    global _engine, _bridge
+    _engine = engine
+    if engine == "node":
+        from lunar_js_integration import LunarJSBridge
+        _bridge = LunarJSBridge()
+
+
+def _compute_month_python(year, month):
+    import calendar
+    from lunar_python import Solar
+
+    items = []
+    for day in range(1, calendar.monthrange(year, month)[1] + 1):
+        lunar = Solar.fromYmd(year, month, day).getLunar()
+        data = {
+            "lunar_info": lunar.toFullString(),
+            "yi_ji": {"yi": lunar.getDayYi(), "ji": lunar.getDayJi()},
+        }
+        for field, method in PYTHON_FIELDS.items():
+            data[field] = getattr(lunar, method)()
+        items.append((f"{year}-{month:02d}-{day:02d}", data))
+    return items
+
+
+def _compute_month(task):
+    """计算一个月的黄历，返回 (月份键, 天数, 压缩数据)"""
+    year, month = task
+    if _engine == "node":
+        result = _bridge.get_almanac_month(year, month)
+        if not result:
+            raise RuntimeError(f"lunar.js未返回{year}年{month}月的结果")
+        items = [(item["date"], item["data"]) for item in result]
+    else:
+        items = _compute_month_python(year, month)
+    return f"{year}-{month:02d}", len(items), encode_month(items)
+
+
+def open_output(path):
+    """打开（必要时创建）输出文件"""
+    conn = sqlite3.connect(path)
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS almanac_months (
+        month TEXT PRIMARY KEY,
+        day_count INTEGER NOT NULL,
+        payload BLOB NOT NULL
+    )
+    ''')
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS almanac_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    ''')
+    conn.execute("INSERT OR REPLACE INTO almanac_meta (key, value) VALUES ('format', ?)", (str(PRECOMPUTED_FORMAT),))
+    conn.commit()
+    return conn
+
+
+def default_engine():
+    """有Node.js和lunar.js时使用node，否则使用lunar-python"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    if os.path.exists(os.path.join(current_dir, "lunar.js")):
+        try:
+            subprocess.run(["node", "--version"], capture_output=True, check=True)
+            return "node"
+        except (OSError, subprocess.CalledProcessError):
+            pass
+    return "python"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量预计算黄历数据")
+    parser.add_argument("--start", type=int, default=1900, help="起始年份（默认1900）")
+    parser.add_argument("--end", type=int, default=2100, help="结束年份（默认2100）")
+    parser.add_argument("--output", default=PRECOMPUTED_PATH, help="输出文件（默认almanac.db）")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="工作进程数")
+    parser.add_argument("--engine", choices=["node", "python"], default=None, help="计算引擎（默认自动选择）")
+    args = parser.parse_args()
+
+    engine = args.engine or default_engine()
+    conn = open_output(args.output)
+    conn.execute("INSERT OR REPLACE INTO almanac_meta (key, value) VALUES ('range', ?)", (f"{args.start}-{args.end}",))
+    conn.commit()
+
+    # 断点续算：跳过已完成的月份
+    done = set(row[0] for row in conn.execute("SELECT month FROM almanac_months"))
+    tasks = [(year, month) for year in range(args.start, args.end + 1) for month in range(1, 13)
+             if f"{year}-{month:02d}" not in done]
+    total = len(tasks)
+    if not tasks:
+        print("所有月份均已计算完成")
+        conn.close()
+        return 0
+
+    print(f"使用{engine}引擎、{args.workers}个进程计算{total}个月（已完成{len(done)}个月）")
+
+    begin = time.perf_counter()
+    last_report = begin
+    finished = 0
+    days = 0
+    with multiprocessing.Pool(args.workers, initializer=_init_worker, initargs=(engine,)) as pool:
+        for key, day_count, payload in pool.imap_unordered(_compute_month, tasks):
+            conn.execute("INSERT OR REPLACE INTO almanac_months (month, day_count, payload) VALUES (?, ?, ?)",
+                         (key, day_count, payload))
+            conn.commit()
+            finished += 1
+            days += day_count
+
+            now = time.perf_counter()
+            if now - last_report >= 1 or finished == total:
+                last_report = now
+                elapsed = now - begin
+                rate = days / elapsed if elapsed > 0 else 0
+                remaining = (total - finished) * elapsed / finished
+                print(f"\r进度: {finished}/{total}个月 ({finished * 100 // total}%) | "
+                      f"{rate:.0f}天/秒 | 预计剩余{remaining:.0f}秒", end="", flush=True)
+
+    elapsed = time.perf_counter() - begin
+    print(f"\n完成: {days}天，耗时{elapsed:.1f}秒，平均{days / elapsed:.0f}天/秒")
+
+    conn.execute("VACUUM")
+    conn.close()
+    print(f"已生成: {args.output} ({os.path.getsize(args.output) / 1024 / 1024:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+# tag_heatmap.py
+# 标签/提醒热力图：按天统计的数量来自对tags和reminders各一次GROUP BY查询，结果常驻内存，
+# 保存或删除标签时只重新统计该日期；热力图按年份分行，每列一周（类似GitHub贡献图）
+
+import db_connection
+import datetime
+import threading
+import tkinter as tk
+
+# 每天数量（标签+提醒）对应的颜色：0、1、2-3、4-6、7个及以上
+HEAT_COLORS = ["#2b2b2b", "#0e4429", "#006d32", "#26a641", "#39d353"]
+HEAT_LEVELS = [0, 1, 2, 4, 7]
+
+BACKGROUND = "black"
+TEXT_COLOR = "white"
+MUTED_COLOR = "#808080"
+
+YEAR_LABEL_WIDTH = 48
+MONTH_LABEL_HEIGHT = 16
+YEAR_GAP = 12
+MAX_CELL_SIZE = 14
+
+
+def heat_color(count):
+    level = 0
+    for index, threshold in enumerate(HEAT_LEVELS):
+        if count >= threshold:
+            level = index
+    return HEAT_COLORS[level]
+
+
+class DailyCounts:
+    """每天的标签数和提醒数（首次使用时各一次分组查询，之后按日期增量更新）"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        # {"YYYY-MM-DD": 数量}，为None表示尚未加载
+        self.tags = None
+        self.reminders = None
+        # 尚未加载时修改过的日期：加载中的分组查询可能读到修改前的数据，存入统计后重新统计这些日期
+        self.dirty_dates = set()
+        # invalidate()时加1，加载期间发生过invalidate()的结果不存入统计
+        self.generation = 0
+
+    def load(self):
+        """
+        加载全部统计（已加载时直接返回）
+
+        Returns:
+            (标签统计, 提醒统计)，调用方应使用返回值而不是再次读取属性，期间invalidate()可能已把属性置为None
+        """
+        with self.lock:
+            if self.tags is not None:
+                return self.tags, self.reminders
+            generation = self.generation
+        conn = db_connection.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT date, COUNT(*) FROM tags GROUP BY date")
+            tags = dict(cursor.fetchall())
+            cursor.execute("SELECT date, COUNT(*) FROM reminders GROUP BY date")
+            reminders = dict(cursor.fetchall())
+        finally:
+            conn.close()
+        with self.lock:
+            if self.generation != generation:
+                # 加载期间统计被丢弃，本次结果只返回给调用方，下次使用时重新加载
+                return tags, reminders
+            if self.tags is not None:
+                # 其他线程已先完成加载
+                return self.tags, self.reminders
+            self.tags, self.reminders = tags, reminders
+            dirty_dates, self.dirty_dates = self.dirty_dates, set()
+        for date_str in dirty_dates:
+            self.refresh_date(date_str)
+        return tags, reminders
+
+    def refresh_date(self, date_str):
+        """某天的标签或提醒修改后重新统计该日期（尚未加载时只记下日期，加载完成后再统计）"""
+        with self.lock:
+            if self.tags is None:
+                self.dirty_dates.add(date_str)
+                return
+        conn = db_connection.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM tags WHERE date = ?", (date_str,))
+            tag_count = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM reminders WHERE date = ?", (date_str,))
+            reminder_count = cursor.fetchone()[0]
+        finally:
+            conn.close()
+        with self.lock:
+            if self.tags is None:
+                self.dirty_dates.add(date_str)
+                return
+            for counts, count in ((self.tags, tag_count), (self.reminders, reminder_count)):
+                if count:
+                    counts[date_str] = count
+                else:
+                    counts.pop(date_str, None)
+
+    def invalidate(self):
+        """无法确定修改了哪些日期时（如MCP工具写入）丢弃统计，下次使用时重新加载"""
+        with self.lock:
+            self.tags = None
+            self.reminders = None
+            self.generation += 1
+
+    def between(self, start, end):
+        """
+        [start, end]区间内每天的数量
+
+        Returns:
+            {"YYYY-MM-DD": (标签数, 提醒数)}
+        """
+        tags, reminders = self.load()
+        result = {}
+        # 加锁防止refresh_date同时修改字典
+        with self.lock:
+            # 按区间逐日查字典，与已统计的日期总数无关
+            for ordinal in range(start.toordinal(), end.toordinal() + 1):
+                date_str = datetime.date.fromordinal(ordinal).isoformat()
+                tag_count = tags.get(date_str, 0)
+                reminder_count = reminders.get(date_str, 0)
+                if tag_count or reminder_count:
+                    result[date_str] = (tag_count, reminder_count)
+        return result
+
+
+class HeatmapCanvas:
+    """多年热力图，每年一行，每列一周，每格一天"""
+
+    def __init__(self, parent, on_hover=None, on_open=None):
+        """
+        Args:
+            on_hover: 鼠标移到某天时调用 on_hover(date或None)
+            on_open: 双击某天时调用 on_open(date)
+        """
+        self.on_hover = on_hover
+        self.on_open = on_open
+        self.canvas = tk.Canvas(parent, bg=BACKGROUND, highlightthickness=0)
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Motion>", self.on_motion)
+        self.canvas.bind("<Double-1>", self.on_double_click)
+
+        self.years = []
+        self.counts = {}
+        self.hover_date = None
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def show(self, years, counts):
+        """
+        Args:
+            years: 要显示的年份列表
+            counts: {"YYYY-MM-DD": (标签数, 提醒数)}
+        """
+        self.years = list(years)
+        self.counts = counts
+        self.redraw()
+
+    def cell_size(self):
+        width = self.canvas.winfo_width() - YEAR_LABEL_WIDTH
+        return max(min(width / 54, MAX_CELL_SIZE), 4)
+
+    def year_top(self, position, cell):
+        return position * (MONTH_LABEL_HEIGHT + 7 * cell + YEAR_GAP) + MONTH_LABEL_HEIGHT
+
+    @staticmethod
+    def week_column(date):
+        """日期在该年中所在的列（以该年1月1日所在的周为第0列，周一为一周的开始）"""
+        first = datetime.date(date.year, 1, 1)
+        return (date.toordinal() - first.toordinal() + first.weekday()) // 7
+
+    def redraw(self):
+        canvas = self.canvas
+        canvas.delete("all")
+        cell = self.cell_size()
+        for position, year in enumerate(self.years):
+            top = self.year_top(position, cell)
+            canvas.create_text(YEAR_LABEL_WIDTH / 2, top + 3.5 * cell, text=str(year),
+                               fill=TEXT_COLOR, font=("SimSun", 10, "bold"))
+
+            date = datetime.date(year, 1, 1)
+            end = datetime.date(year, 12, 31)
+            one_day = datetime.timedelta(days=1)
+            while date <= end:
+                column = self.week_column(date)
+                x0 = YEAR_LABEL_WIDTH + column * cell
+                y0 = top + date.weekday() * cell
+                if date.day == 1:
+                    canvas.create_text(x0, top - MONTH_LABEL_HEIGHT / 2, text=f"{date.month}月",
+                                       anchor="w", fill=MUTED_COLOR, font=("SimSun", 8))
+                tags, reminders = self.counts.get(date.isoformat(), (0, 0))
+                canvas.create_rectangle(x0 + 1, y0 + 1, x0 + cell - 1, y0 + cell - 1, outline="",
+                                        fill=heat_color(tags + reminders))
+                date += one_day
+
+    def date_at(self, x, y):
+        """坐标对应的日期，不在格子上时返回None"""
+        cell = self.cell_size()
+        column = int((x - YEAR_LABEL_WIDTH) // cell)
+        if x < YEAR_LABEL_WIDTH or column > 53:
+            return None
+        for position, year in enumerate(self.years):
+            top = self.year_top(position, cell)
+            if top <= y < top + 7 * cell:
+                weekday = int((y - top) // cell)
+                first = datetime.date(year, 1, 1)
+                ordinal = first.toordinal() - first.weekday() + column * 7 + weekday
+                date = datetime.date.fromordinal(ordinal)
+                return date if date.year == year else None
+        return None
+
+    def on_motion(self, event):
+        date = self.date_at(event.x, event.y)
+        if date != self.hover_date:
+            self.hover_date = date
+            if self.on_hover:
+                self.on_hover(date)
+
+    def on_double_click(self, event):
+        date = self.date_at(event.x, event.y)
+        if date is not None and self.on_open:
+            self.on_open(date)
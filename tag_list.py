@@ -0,0 +1,108 @@
+# tag_list.py
+# "所有标签"列表的键集分页：按 (日期, id) 排序，每次从上一页最后一行之后取一页，
+# 过滤和排序都在SQL中完成，打开列表的耗时与标签总数无关
+
+import copy
+
+import db_connection
+from calendar_store import TagRepo
+from text_search import tag_content_filter
+
+PAGE_SIZE = 200
+
+
+def tag_filter(search_type, search_text, color_map, full_text=False):
+    """
+    把搜索条件转换为SQL条件
+
+    Args:
+        search_type: "内容"、"日期"或"颜色"
+        color_map: 颜色名称到十六进制代码的映射
+        full_text: 数据库中是否有全文索引，有则按内容搜索时使用索引
+
+    Returns:
+        (条件SQL, 参数)，没有条件时为 ("", ())
+    """
+    search_text = search_text.strip()
+    if not search_text:
+        return "", ()
+    if search_type == "内容":
+        return tag_content_filter(search_text, full_text)
+    if search_type == "日期":
+        return "t.date LIKE ?", (f"%{search_text}%",)
+    if search_type == "颜色":
+        # 先尝试查找颜色名称，不是颜色名称时直接使用输入的颜色代码
+        for name, code in color_map.items():
+            if search_text.lower() in name.lower():
+                return "t.color = ?", (code,)
+        return "t.color = ?", (search_text,)
+    return "t.color LIKE ?", (f"%{search_text}%",)
+
+
+class TagPager:
+    """标签列表的分页查询"""
+
+    def __init__(self, db_path, page_size=PAGE_SIZE):
+        self.db_path = db_path
+        self.repo = TagRepo(db_path)
+        self.page_size = page_size
+        self.filter_sql = ""
+        self.filter_params = ()
+        self.descending = True
+        # 上一页最后一行的 (date, id)
+        self.cursor = None
+        self.exhausted = False
+        # 正在执行查询的连接，用于从其他线程中断过期的查询
+        self.active_conn = None
+
+    def set_filter(self, filter_sql, filter_params):
+        self.filter_sql = filter_sql
+        self.filter_params = tuple(filter_params)
+        self.reset()
+
+    def set_order(self, descending):
+        self.descending = descending
+        self.reset()
+
+    def copy(self):
+        """相同条件和排序、从第一页开始的新分页器"""
+        pager = copy.copy(self)
+        pager.reset()
+        pager.active_conn = None
+        return pager
+
+    def interrupt(self):
+        """中断正在执行的查询（可以在其他线程中调用），被中断的next_page抛出sqlite3.OperationalError"""
+        conn = self.active_conn
+        if conn is not None:
+            conn.interrupt()
+
+    def reset(self):
+        """回到第一页"""
+        self.cursor = None
+        self.exhausted = False
+
+    def next_page(self):
+        """
+        取下一页
+
+        Returns:
+            [TagListRow, ...]，没有更多时为空列表
+        """
+        if self.exhausted:
+            return []
+
+        conn = db_connection.connect(self.db_path)
+        self.active_conn = conn
+        try:
+            rows = self.repo.page(self.filter_sql, self.filter_params, self.cursor, self.descending,
+                                  self.page_size, conn)
+        finally:
+            self.active_conn = None
+            conn.close()
+
+        if len(rows) < self.page_size:
+            self.exhausted = True
+        if rows:
+            self.cursor = (rows[-1].date, rows[-1].id)
+        return rows
@@ -0,0 +1,147 @@
+# text_search.py
+# 标签内容和聊天记录的全文搜索：FTS5 trigram索引（由db_schema创建、触发器同步）支持中文任意子串匹配，
+# 结果按相关度排序并带有高亮片段。trigram至少需要3个字符，更短的关键词以及不支持FTS5的SQLite退回LIKE扫描
+
+# 至少这么多个字符才能使用trigram索引
+FTS_MIN_CHARS = 3
+# 片段中匹配内容前后的标记
+HIGHLIGHT_START = "【"
+HIGHLIGHT_END = "】"
+# 片段长度（字符数）
+SNIPPET_CHARS = 24
+
+
+def fts_available(conn):
+    """数据库中是否已建立全文索引（SQLite不支持FTS5 trigram时迁移会跳过建表）"""
+    count = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('tags_fts', 'chat_messages_fts')"
+    ).fetchone()[0]
+    return count == 2
+
+
+def match_expression(text):
+    """
+    关键词对应的FTS5查询：整体作为一个短语，与 LIKE '%关键词%' 的匹配范围相同
+
+    Returns:
+        查询字符串，关键词太短无法使用trigram索引时返回None
+    """
+    text = text.strip()
+    if len(text) < FTS_MIN_CHARS:
+        return None
+    return '"' + text.replace('"', '""') + '"'
+
+
+def like_pattern(text):
+    """LIKE的匹配模式（%和_按普通字符处理，需配合 ESCAPE '\\' 使用）"""
+    escaped = text.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def make_snippet(content, text, width=SNIPPET_CHARS):
+    """在Python中截取关键词附近的片段并加上高亮标记（LIKE搜索时使用）"""
+    content = content or ""
+    text = text.strip()
+    position = content.lower().find(text.lower())
+    if position < 0:
+        return content[:width] + ("…" if len(content) > width else "")
+    start = max(position - (width - len(text)) // 2, 0)
+    end = min(start + max(width, len(text)), len(content))
+    return (("…" if start > 0 else "") + content[start:position] + HIGHLIGHT_START +
+            content[position:position + len(text)] + HIGHLIGHT_END +
+            content[position + len(text):end] + ("…" if end < len(content) else ""))
+
+
+def tag_content_filter(text, full_text=True):
+    """
+    标签列表按内容搜索的SQL条件（供TagPager使用，表别名为t）
+
+    Returns:
+        (条件SQL, 参数)
+    """
+    expression = match_expression(text) if full_text else None
+    if expression is not None:
+        return "t.id IN (SELECT rowid FROM tags_fts WHERE tags_fts MATCH ?)", (expression,)
+    return "t.tag LIKE ? ESCAPE '\\'", (like_pattern(text),)
+
+
+def search_tags(conn, text, limit=50, full_text=True):
+    """
+    按内容搜索标签，全文索引可用时按相关度排序，否则按日期从新到旧
+
+    Returns:
+        [(id, date, color, 片段), ...]
+    """
+    expression = match_expression(text) if full_text else None
+    if expression is not None:
+        return conn.execute(f"""
+            SELECT t.id, t.date, t.color,
+                   snippet(tags_fts, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', {SNIPPET_CHARS})
+            FROM tags_fts
+            JOIN tags t ON t.id = tags_fts.rowid
+            WHERE tags_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """, (expression, limit)).fetchall()
+
+    rows = conn.execute(
+        "SELECT id, date, color, tag FROM tags WHERE tag LIKE ? ESCAPE '\\' ORDER BY date DESC, id DESC LIMIT ?",
+        (like_pattern(text), limit)
+    ).fetchall()
+    return [(tag_id, date, color, make_snippet(tag, text)) for tag_id, date, color, tag in rows]
+
+
+def search_chat_messages(conn, text, limit=50, full_text=True):
+    """
+    搜索聊天记录，全文索引可用时按相关度排序，否则按时间从新到旧
+
+    Returns:
+        [(消息id, 会话id, 会话标题, role, timestamp, 片段), ...]
+    """
+    expression = match_expression(text) if full_text else None
+    if expression is not None:
+        return conn.execute(f"""
+            SELECT m.id, m.session_id, s.title, m.role, m.timestamp,
+                   snippet(chat_messages_fts, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', {SNIPPET_CHARS})
+            FROM chat_messages_fts
+            JOIN chat_messages m ON m.id = chat_messages_fts.rowid
+            LEFT JOIN chat_sessions s ON s.id = m.session_id
+            WHERE chat_messages_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """, (expression, limit)).fetchall()
+
+    rows = conn.execute("""
+        SELECT m.id, m.session_id, s.title, m.role, m.timestamp, m.content
+        FROM chat_messages m
+        LEFT JOIN chat_sessions s ON s.id = m.session_id
+        WHERE m.content LIKE ? ESCAPE '\\'
+        ORDER BY m.timestamp DESC, m.id DESC
+        LIMIT ?
+    """, (like_pattern(text), limit)).fetchall()
+    return [row[:5] + (make_snippet(row[5], text),) for row in rows]
+
+
+def search_all(conn, text, scope="all", limit=20):
+    """
+    搜索标签和/或聊天记录（MCP工具使用），全文索引不可用时自动退回LIKE
+
+    Args:
+        scope: "tags"（标签）、"chat"（聊天记录）或 "all"（两者）
+        limit: 每个范围最多返回的条数
+
+    Returns:
+        [{"type": "tag"或"chat", "id", "snippet", ...}, ...]，标签结果在前
+    """
+    full_text = fts_available(conn)
+    results = []
+    if scope in ("all", "tags"):
+        for tag_id, date, color, snippet in search_tags(conn, text, limit, full_text):
+            results.append({"type": "tag", "id": tag_id, "date": date, "color": color, "snippet": snippet})
+    if scope in ("all", "chat"):
+        for message_id, session_id, title, role, timestamp, snippet in search_chat_messages(
+                conn, text, limit, full_text):
+            results.append({"type": "chat", "id": message_id, "session_id": session_id,
+                            "session_title": title, "role": role, "timestamp": timestamp,
+                            "snippet": snippet})
+    return results
@@ -0,0 +1,185 @@
+# year_overview.py
+# 年视图：12个月的小日历画在一个Canvas上，按每天的标签数量着色，并标出节日节气
+# 数据只需一次按日期分组的SQL查询和一次整年的节日查询（预计算索引上的二分查找）
+
+import db_connection
+import calendar
+import datetime
+import tkinter as tk
+
+# 标签数量对应的颜色：0个、1个、2-3个、4个及以上
+DENSITY_COLORS = ["#2b2b2b", "#0e4429", "#006d32", "#26a641"]
+
+BACKGROUND = "black"
+TEXT_COLOR = "white"
+MUTED_COLOR = "#808080"
+WEEKEND_COLOR = "#FF6347"
+FESTIVAL_COLOR = "#FFA500"
+
+MONTH_COLUMNS = 4
+MONTH_ROWS = 3
+TITLE_HEIGHT = 20
+WEEKDAY_HEIGHT = 16
+
+
+def density_color(count):
+    """标签数量对应的背景色"""
+    if count <= 0:
+        return DENSITY_COLORS[0]
+    if count == 1:
+        return DENSITY_COLORS[1]
+    if count <= 3:
+        return DENSITY_COLORS[2]
+    return DENSITY_COLORS[3]
+
+
+def load_year_tag_counts(db_path, year):
+    """
+    一次查询全年每天的标签数量
+
+    Returns:
+        {"YYYY-MM-DD": 数量}
+    """
+    conn = db_connection.connect(db_path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT date, COUNT(*) FROM tags WHERE date BETWEEN ? AND ? GROUP BY date",
+            (f"{year}-01-01", f"{year}-12-31")
+        )
+        return dict(cursor.fetchall())
+    finally:
+        conn.close()
+
+
+def load_year_festivals(year, lunar_index=None, provider=None):
+    """
+    整年的节日和节气
+
+    Args:
+        lunar_index: LunarIndex实例，有则在预计算索引上一次查出全年
+        provider: 没有索引时使用的LunarProvider（逐月查询）
+
+    Returns:
+        {"YYYY-MM-DD": [名称, ...]}
+    """
+    festivals = {}
+    if lunar_index is not None and lunar_index.table.is_supported(year):
+        for marker in lunar_index.between(datetime.date(year, 1, 1), datetime.date(year, 12, 31)):
+            festivals.setdefault(marker.date.isoformat(), []).append(marker.name)
+        return festivals
+
+    if provider is None or not provider.supports(year):
+        return festivals
+    for month in range(1, 13):
+        for cell in provider.get_month_cells(year, month):
+            names = list(cell.get("lunar_festivals") or []) + list(cell.get("solar_festivals") or [])
+            if cell.get("jie_qi"):
+                names.append(cell["jie_qi"])
+            if names:
+                festivals[f"{year}-{month:02d}-{cell['day']:02d}"] = names
+    return festivals
+
+
+class YearOverviewCanvas:
+    """在单个Canvas上绘制一整年的12个月"""
+
+    def __init__(self, parent, on_hover=None, on_open=None):
+        """
+        Args:
+            on_hover: 鼠标移到某天时调用 on_hover(date或None)
+            on_open: 双击某天时调用 on_open(date)
+        """
+        self.on_hover = on_hover
+        self.on_open = on_open
+        self.canvas = tk.Canvas(parent, bg=BACKGROUND, highlightthickness=0)
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Motion>", self.on_motion)
+        self.canvas.bind("<Double-1>", self.on_double_click)
+
+        self.year = None
+        self.tag_counts = {}
+        self.festivals = {}
+        self.hover_date = None
+
+    def pack(self, **kwargs):
+        self.canvas.pack(**kwargs)
+
+    def show(self, year, tag_counts, festivals):
+        self.year = year
+        self.tag_counts = tag_counts
+        self.festivals = festivals
+        self.redraw()
+
+    def layout(self):
+        """返回 (每个月区域的宽度, 高度, 日期格子宽度, 高度)"""
+        month_width = max(self.canvas.winfo_width(), MONTH_COLUMNS) / MONTH_COLUMNS
+        month_height = max(self.canvas.winfo_height(), MONTH_ROWS) / MONTH_ROWS
+        cell_width = month_width / 7
+        cell_height = max((month_height - TITLE_HEIGHT - WEEKDAY_HEIGHT) / 6, 1)
+        return month_width, month_height, cell_width, cell_height
+
+    def redraw(self):
+        canvas = self.canvas
+        canvas.delete("all")
+        if self.year is None:
+            return
+        month_width, month_height, cell_width, cell_height = self.layout()
+        font_size = max(min(int(cell_height * 0.45), 10), 6)
+
+        for month in range(1, 13):
+            origin_x = ((month - 1) % MONTH_COLUMNS) * month_width
+            origin_y = ((month - 1) // MONTH_COLUMNS) * month_height
+            canvas.create_text(origin_x + month_width / 2, origin_y + TITLE_HEIGHT / 2,
+                               text=f"{month}月", fill=TEXT_COLOR, font=("SimSun", 10, "bold"))
+            for column, name in enumerate("一二三四五六日"):
+                canvas.create_text(origin_x + (column + 0.5) * cell_width,
+                                   origin_y + TITLE_HEIGHT + WEEKDAY_HEIGHT / 2, text=name,
+                                   fill=WEEKEND_COLOR if column >= 5 else MUTED_COLOR, font=("SimSun", 8))
+
+            top = origin_y + TITLE_HEIGHT + WEEKDAY_HEIGHT
+            for row, week in enumerate(calendar.monthcalendar(self.year, month)):
+                for column, day in enumerate(week):
+                    if not day:
+                        continue
+                    date_str = f"{self.year}-{month:02d}-{day:02d}"
+                    x0 = origin_x + column * cell_width + 1
+                    y0 = top + row * cell_height + 1
+                    canvas.create_rectangle(x0, y0, x0 + cell_width - 2, y0 + cell_height - 2, outline="",
+                                            fill=density_color(self.tag_counts.get(date_str, 0)))
+                    canvas.create_text(x0 + cell_width / 2 - 1, y0 + cell_height / 2 - 1, text=str(day),
+                                       fill=FESTIVAL_COLOR if date_str in self.festivals else TEXT_COLOR,
+                                       font=("SimSun", font_size))
+
+    def date_at(self, x, y):
+        """坐标对应的日期，不在日期格子上时返回None"""
+        if self.year is None:
+            return None
+        month_width, month_height, cell_width, cell_height = self.layout()
+        month_column = min(int(x // month_width), MONTH_COLUMNS - 1)
+        month_row = int(y // month_height)
+        if month_row >= MONTH_ROWS:
+            return None
+        month = month_row * MONTH_COLUMNS + month_column + 1
+
+        local_y = y - month_row * month_height - TITLE_HEIGHT - WEEKDAY_HEIGHT
+        if local_y < 0:
+            return None
+        row = int(local_y // cell_height)
+        column = min(int((x - month_column * month_width) // cell_width), 6)
+        weeks = calendar.monthcalendar(self.year, month)
+        if row >= len(weeks) or not weeks[row][column]:
+            return None
+        return datetime.date(self.year, month, weeks[row][column])
+
+    def on_motion(self, event):
+        date = self.date_at(event.x, event.y)
+        if date != self.hover_date:
+            self.hover_date = date
+            if self.on_hover:
+                self.on_hover(date)
+
+    def on_double_click(self, event):
+        date = self.date_at(event.x, event.y)
+        if date is not None and self.on_open:
+            self.on_open(date)
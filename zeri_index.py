@@ -0,0 +1,217 @@
+# zeri_index.py
+# 择日倒排索引：宜/忌事项 → 按日期排序的日期序号列表
+# 由批处理任务按年从预计算黄历文件或黄历缓存构建并保存到数据库，查询时只做集合运算
+
+import struct
+import db_connection
+import datetime
+import threading
+
+YI = "yi"
+JI = "ji"
+
+WEEKEND = (5, 6)
+
+
+def _pack_days(days):
+    return struct.pack(f"<{len(days)}i", *days)
+
+
+def _unpack_days(blob):
+    return list(struct.unpack(f"<{len(blob) // 4}i", blob))
+
+
+class ZeRiIndex:
+    """按宜/忌事项检索日期的倒排索引"""
+
+    def __init__(self, db_path, almanac_cache=None):
+        """
+        Args:
+            db_path: 数据库路径（需已由db_schema迁移，包含zeri_index和zeri_years表）
+            almanac_cache: AlmanacCache实例，用于为尚未建立索引的年份批量计算黄历；
+                           为None时只使用数据库中已有的索引
+        """
+        self.db_path = db_path
+        self.almanac_cache = almanac_cache
+        # {year: {(kind, activity): [日期序号, ...]}}
+        self.years = {}
+        self.lock = threading.Lock()
+
+    def built_years(self):
+        """数据库中已建立索引的年份"""
+        conn = db_connection.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT year FROM zeri_years ORDER BY year")
+            return [row[0] for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def build_year(self, year):
+        """
+        为一整年建立索引：从预计算黄历文件或黄历缓存中读出全年宜/忌并写入倒排表
+        （缓存中缺少的月份每月一次lunar.js调用）
+
+        Returns:
+            建立索引的天数
+        """
+        if self.almanac_cache is None:
+            return 0
+        rows = self.almanac_cache.year_items(year)
+        if not rows:
+            return 0
+
+        postings = {}
+        for date_str, data in rows:
+            ordinal = datetime.date.fromisoformat(date_str).toordinal()
+            yi_ji = data.get("yi_ji") or {}
+            for kind in (YI, JI):
+                for activity in yi_ji.get(kind) or []:
+                    postings.setdefault((kind, activity), []).append(ordinal)
+
+        conn = db_connection.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM zeri_index WHERE year = ?", (year,))
+            cursor.executemany(
+                "INSERT INTO zeri_index (year, kind, activity, days) VALUES (?, ?, ?, ?)",
+                [(year, kind, activity, _pack_days(days)) for (kind, activity), days in postings.items()]
+            )
+            cursor.execute("INSERT OR REPLACE INTO zeri_years (year, day_count) VALUES (?, ?)", (year, len(rows)))
+            conn.commit()
+        finally:
+            conn.close()
+
+        with self.lock:
+            self.years[year] = postings
+        return len(rows)
+
+    def build_range(self, start_year, end_year, rebuild=False, progress=None):
+        """
+        批量建立多个年份的索引
+
+        Args:
+            rebuild: 为True时重建已存在的年份
+            progress: 回调函数 progress(year, day_count)
+        """
+        built = set(self.built_years())
+        for year in range(start_year, end_year + 1):
+            if year in built and not rebuild:
+                continue
+            count = self.build_year(year)
+            if progress:
+                progress(year, count)
+
+    def _load_year(self, year):
+        """从数据库加载一年的倒排表，没有索引时按需构建"""
+        with self.lock:
+            if year in self.years:
+                return self.years[year]
+
+        conn = db_connection.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM zeri_years WHERE year = ?", (year,))
+            built = cursor.fetchone() is not None
+            cursor.execute("SELECT kind, activity, days FROM zeri_index WHERE year = ?", (year,))
+            postings = {(kind, activity): _unpack_days(days) for kind, activity, days in cursor.fetchall()}
+        finally:
+            conn.close()
+
+        if not built:
+            if self.almanac_cache is None:
+                return {}
+            self.build_year(year)
+            with self.lock:
+                return self.years.get(year, {})
+
+        with self.lock:
+            self.years[year] = postings
+        return postings
+
+    def activities(self, year, kind=YI):
+        """某年索引中出现过的宜或忌事项，按出现天数从多到少排列"""
+        postings = self._load_year(year)
+        items = [(len(days), activity) for (k, activity), days in postings.items() if k == kind]
+        return [activity for count, activity in sorted(items, key=lambda item: (-item[0], item[1]))]
+
+    def search(self, start, end, yi=(), ji=(), avoid_ji=(), weekdays=None, limit=None):
+        """
+        检索[start, end]区间内满足条件的日期
+
+        Args:
+            start: 起始日期（datetime.date）
+            end: 结束日期（datetime.date）
+            yi: 宜中必须全部包含的事项
+            ji: 忌中必须全部包含的事项
+            avoid_ji: 忌中不能包含的事项
+            weekdays: 允许的星期（0为星期一，6为星期日），None表示不限
+            limit: 最多返回的天数
+
+        Returns:
+            满足条件的datetime.date列表（按日期排序）
+        """
+        start_ordinal = start.toordinal()
+        end_ordinal = end.toordinal()
+        result = []
+        for year in range(start.year, end.year + 1):
+            postings = self._load_year(year)
+            if not postings:
+                continue
+
+            if yi or ji:
+                # 从最短的列表开始求交集
+                required = [postings.get((YI, activity), []) for activity in yi]
+                required += [postings.get((JI, activity), []) for activity in ji]
+                required.sort(key=len)
+                days = set(required[0])
+                for other in required[1:]:
+                    days.intersection_update(other)
+            else:
+                first = datetime.date(year, 1, 1).toordinal()
+                days = set(range(first, datetime.date(year, 12, 31).toordinal() + 1))
+
+            for activity in avoid_ji:
+                days.difference_update(postings.get((JI, activity), []))
+
+            for ordinal in sorted(days):
+                if not start_ordinal <= ordinal <= end_ordinal:
+                    continue
+                # 日期序号1为星期一
+                if weekdays is not None and (ordinal - 1) % 7 not in weekdays:
+                    continue
+                result.append(datetime.date.fromordinal(ordinal))
+                if limit is not None and len(result) >= limit:
+                    return result
+        return result
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import time
+    from almanac_cache import AlmanacCache
+    from db_schema import migrate_file
+    from lunar_js_integration import LunarJSBridge
+
+    # 用法: python zeri_index.py [起始年份] [结束年份]
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    db_path = os.path.join(current_dir, "calendar_data.db")
+    today = datetime.date.today()
+    start_year = int(sys.argv[1]) if len(sys.argv) > 1 else today.year
+    end_year = int(sys.argv[2]) if len(sys.argv) > 2 else start_year + 1
+
+    bridge = LunarJSBridge()
+    migrate_file(db_path)
+    cache = AlmanacCache(db_path, lambda: bridge)
+    index = ZeRiIndex(db_path, cache)
+
+    begin = time.perf_counter()
+    index.build_range(start_year, end_year, progress=lambda year, count: print(f"{year}年: 已索引{count}天"))
+    print(f"索引建立完成，耗时{time.perf_counter() - begin:.1f}秒")
+
+    begin = time.perf_counter()
+    days = index.search(today, today + datetime.timedelta(days=183), yi=["嫁娶"], avoid_ji=["动土"], weekdays=WEEKEND)
+    elapsed = (time.perf_counter() - begin) * 1000
+    print(f"未来半年宜嫁娶、不忌动土的周末共{len(days)}天（{elapsed:.1f}毫秒）:")
+    print(", ".join(day.isoformat() for day in days))